@@ -1,9 +1,9 @@
 from airflow import DAG
-from airflow.operators.python import PythonOperator
+from airflow.operators.python import PythonOperator, ShortCircuitOperator
 from airflow.providers.docker.operators.docker import DockerOperator
 from docker.types import Mount
 from datetime import datetime, timedelta
-from etl.src.update_fixtures import update_fixtures_main
+from etl.src.update_fixtures import update_fixtures_main, has_due_polls
 from etl.src.transform_fixtures import transform_fixtures
 from etl.src.load_updates import load_played_updates
 
@@ -22,14 +22,22 @@ default_args ={
 with DAG(
     dag_id="fixture_update_dag",
     default_args=default_args,
-    schedule_interval="@daily",
+    # Poll often; each run only fetches fixtures whose final whistle is due
+    schedule_interval="*/15 * * * *",
     catchup=False,
+    max_active_runs=1,
     tags=["fixture_update"]
 ) as dag:
     
+    polls_due_task = ShortCircuitOperator(
+        task_id="polls_due",
+        python_callable=has_due_polls,
+    )
+
     update_fixtures_task = PythonOperator(
         task_id="update_fixtures",
         python_callable=update_fixtures_main,
+        op_kwargs={"scheduled": True},
     )
 
     transform_fixtures_task = PythonOperator(
@@ -75,7 +83,7 @@ with DAG(
         command= ["dbt", "run", "--profiles-dir", "/root/.dbt"]
     )
 
-    update_fixtures_task >> transform_fixtures_task >> load_played_updates_task >> dbt_run
+    polls_due_task >> update_fixtures_task >> transform_fixtures_task >> load_played_updates_task >> dbt_run
 
 
 
@@ -3,7 +3,7 @@ from airflow.operators.python import PythonOperator
 from airflow.providers.docker.operators.docker import DockerOperator
 from docker.types import Mount
 from datetime import datetime, timedelta
-from etl.src.extract_fixtures import extract_fixtures
+from etl.src.extraction_planner import run_planned_extraction
 from etl.src.transform_fixtures import transform_fixtures
 from etl.src.load_fixtures import load_to_db
 
@@ -24,9 +24,13 @@ with DAG(
     tags=["fixtures_etl"]
 ) as dag:
     
+    # Spends only the remaining daily quota; leftover league-seasons are
+    # picked up by the next scheduled run instead of sleeping until midnight.
+    # Result updates are handled by fixture_update_dag.
     extraction_task = PythonOperator(
         task_id="extract_fixtures",
-        python_callable= extract_fixtures,
+        python_callable= run_planned_extraction,
+        op_kwargs={"include_updates": False},
 
     )
 
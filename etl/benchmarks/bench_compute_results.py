@@ -0,0 +1,85 @@
+"""
+Benchmark: the masked-assignment results code versus the vectorized engine.
+
+The reference path is what `compute_results` used to do: four None-filled
+object columns, `handle_special_results` (twelve masked `df.loc` writes) and
+`compute_game_results` (nested `np.where` over boolean-indexed copies). The
+vectorized path is today's `compute_results`: one goal-difference sign per
+half looked up into categorical codes.
+
+Run from the repository root:
+    python -m etl.benchmarks.bench_compute_results --rows 10000000
+    python -m etl.benchmarks.bench_compute_results --rows 1000000 --repeat 3
+
+Inputs use nullable Int64 goals (as produced by cast_numeric_columns) and a
+realistic status mix; both paths get their own copy, which is not timed.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from etl.src.transform_fixtures import RESULT_COLS, compute_game_results, compute_results, handle_special_results
+
+STATUSES = np.array(["FT", "NS", "WO", "AWD", "PST", "AET", "ABD"], dtype=object)
+STATUS_WEIGHTS = [0.8, 0.15, 0.005, 0.005, 0.02, 0.01, 0.01]
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    def goals():
+        values = pd.array(rng.integers(0, 6, rows), dtype="Int64")
+        values[rng.random(rows) < 0.05] = pd.NA
+        return values
+
+    return pd.DataFrame({
+        "fixture_status": STATUSES[rng.choice(len(STATUSES), rows, p=STATUS_WEIGHTS)],
+        "home_team_fulltime_goal": goals(),
+        "away_team_fulltime_goal": goals(),
+        "home_team_halftime_goal": goals(),
+        "away_team_halftime_goal": goals(),
+    })
+
+
+def reference_path(df: pd.DataFrame) -> pd.DataFrame:
+    for col in RESULT_COLS:
+        df[col] = None
+    return compute_game_results(handle_special_results(df))
+
+
+def best_of(run, df: pd.DataFrame, repeat: int):
+    """Return (best seconds, last result) over `repeat` runs on fresh copies."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        frame = df.copy()
+        start = time.perf_counter()
+        result = run(frame)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the reference and vectorized results engines.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000_000], help="Frame sizes.")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per path; the best is reported.")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12}  {'path':<11}{'seconds':>9}{'rows/s':>14}{'result MiB':>12}")
+    for rows in args.rows:
+        df = make_frame(rows)
+        ref_s, ref = best_of(reference_path, df, args.repeat)
+        vec_s, vec = best_of(compute_results, df, args.repeat)
+        # Same results on every row, comparing labels with missing as None
+        for col in RESULT_COLS:
+            assert ref[col].where(ref[col].notna(), None).tolist() == vec[col].astype(object).where(vec[col].notna(), None).tolist(), col
+        for label, seconds, frame in (("reference", ref_s, ref), ("vectorized", vec_s, vec)):
+            mib = frame[RESULT_COLS].memory_usage(deep=True, index=False).sum() / 2 ** 20
+            print(f"{rows:>12}  {label:<11}{seconds:>9.3f}{rows / seconds:>14,.0f}{mib:>12.1f}")
+        print(f"{'':>12}  speedup {ref_s / vec_s:.1f}x")
+        del df, ref, vec
+
+
+if __name__ == "__main__":
+    main()
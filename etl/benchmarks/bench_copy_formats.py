@@ -0,0 +1,99 @@
+"""
+Benchmark: CSV versus binary COPY for loading cleaned fixtures.
+
+Builds a cleaned fixtures table (mock API payloads run through the Arrow
+transform, repeated to the requested size), then times:
+- encoding alone: both CopyStreams drained into memory, no database;
+- with `--db`, a full COPY of the same batches into a temporary table on the
+  Postgres instance in DB_CONFIG (DB_HOST/DB_PORT/...), for each format,
+  checking both loads produce identical table contents.
+
+Run from the repository root:
+    python -m etl.benchmarks.bench_copy_formats --rows 100000 1000000
+    DB_HOST=localhost DB_PORT=5432 ... python -m etl.benchmarks.bench_copy_formats --rows 1000000 --db
+"""
+import argparse
+import time
+
+import psycopg2
+import pyarrow as pa
+
+import etl.src.config as config
+import etl.src.transform_arrow as ta
+from etl.benchmarks.mock_api import fixtures_per_season, make_fixture
+from etl.src.copy_stream import binary_copy_types, make_copy_stream
+from etl.src.extract_fixtures import extract_fixtures_field
+from etl.src.fixture_decoder import FIXTURE_SCHEMA
+
+TEMP_TABLE = "bench_copy_fixtures"
+BATCH_ROWS = 50_000
+
+
+def pg_type(arrow_type: pa.DataType) -> str:
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    if pa.types.is_timestamp(arrow_type):
+        return "timestamp with time zone"
+    if pa.types.is_integer(arrow_type):
+        return {1: "smallint", 2: "smallint", 4: "integer"}.get(arrow_type.bit_width // 8, "bigint")
+    return "boolean" if pa.types.is_boolean(arrow_type) else "text"
+
+
+def make_table(rows: int) -> pa.Table:
+    season = extract_fixtures_field([make_fixture(39, 2023, i) for i in range(fixtures_per_season())])
+    base = ta.clean_table(pa.Table.from_pylist(season, schema=FIXTURE_SCHEMA))
+    return pa.concat_tables([base] * (rows // base.num_rows + 1)).slice(0, rows).combine_chunks()
+
+
+def encode_only(table: pa.Table, column_types: dict, copy_format: str):
+    stream, _ = make_copy_stream(table.to_batches(BATCH_ROWS), table.schema, column_types, copy_format)
+    start = time.perf_counter()
+    with stream:
+        size = sum(len(chunk) for chunk in iter(lambda: stream.read(1 << 20), b""))
+    return time.perf_counter() - start, size
+
+
+def copy_into_db(cur, table: pa.Table, column_types: dict, copy_format: str):
+    cur.execute(f"TRUNCATE {TEMP_TABLE}")
+    stream, options = make_copy_stream(table.to_batches(BATCH_ROWS), table.schema, column_types, copy_format)
+    start = time.perf_counter()
+    with stream:
+        cur.copy_expert(f"COPY {TEMP_TABLE} ({', '.join(table.column_names)}) FROM STDIN WITH {options}", stream, size=1 << 20)
+    elapsed = time.perf_counter() - start
+    cur.execute(f"SELECT md5(string_agg(t::text, '|' ORDER BY api_fixture_id, t::text)) FROM {TEMP_TABLE} t")
+    return elapsed, cur.fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CSV and binary COPY throughput.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000], help="Table sizes.")
+    parser.add_argument("--db", action="store_true", help="Also COPY into Postgres (DB_CONFIG).")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**config.DB_CONFIG) if args.db else None
+    print(f"{'rows':>10}  {'format':<7}{'stage':<8}{'seconds':>9}{'rows/s':>13}{'MiB':>8}")
+    for rows in args.rows:
+        table = make_table(rows)
+        column_types = {field.name: pg_type(field.type) for field in table.schema}
+        assert binary_copy_types(table.schema, column_types) is not None
+        for copy_format in ("csv", "binary"):
+            seconds, size = encode_only(table, column_types, copy_format)
+            print(f"{rows:>10}  {copy_format:<7}{'encode':<8}{seconds:>9.3f}{rows / seconds:>13,.0f}{size / 2 ** 20:>8.1f}")
+        if conn is not None:
+            with conn.cursor() as cur:
+                columns = ", ".join(f"{name} {pg}" for name, pg in column_types.items())
+                cur.execute(f"DROP TABLE IF EXISTS {TEMP_TABLE}")
+                cur.execute(f"CREATE TEMP TABLE {TEMP_TABLE} ({columns})")
+                digests = {}
+                for copy_format in ("csv", "binary"):
+                    seconds, digests[copy_format] = copy_into_db(cur, table, column_types, copy_format)
+                    print(f"{rows:>10}  {copy_format:<7}{'COPY':<8}{seconds:>9.3f}{rows / seconds:>13,.0f}")
+                print(f"{'':>10}  loads identical: {digests['csv'] == digests['binary']}")
+            conn.rollback()
+        del table
+    if conn is not None:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
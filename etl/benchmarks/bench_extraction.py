@@ -0,0 +1,164 @@
+"""
+Benchmark: extraction throughput against the local mock API.
+
+Runs the real `extract_fixtures`, metadata `collect_metadata` and
+`update_by_ids` code paths against `etl.benchmarks.mock_api`, so rate-limiter
+and concurrency changes can be compared without spending the RapidAPI quota.
+Database writes are replaced by a no-op connection and fixture files go to a
+temporary directory; everything else is the production code.
+
+Run from the repository root:
+    python -m etl.benchmarks.bench_extraction --workers 1 4 --league-seasons 12
+    python -m etl.benchmarks.bench_extraction --per-minute 120 --error-rate 0.02
+
+Reported per scenario: wall time, requests/sec and fixtures/sec as served by
+the mock, 429s and 503s seen, and seconds the shared limiter spent sleeping.
+"""
+import argparse
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import etl.src.config as config
+import etl.src.extract_fixtures as extract_fixtures_mod
+import etl.src.http_client as http_client
+from etl.benchmarks.mock_api import fixtures_per_season, start_mock_api
+from etl.src.extract_metadata import collect_metadata
+from etl.src.update_fixtures import update_by_ids
+
+
+class NullCursor:
+    def execute(self, sql, params=None):
+        pass
+
+    def close(self):
+        pass
+
+
+class NullConnection:
+    """Stands in for Postgres so only API and file I/O are measured."""
+
+    def cursor(self):
+        return NullCursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def measure(label: str, server, run: Callable[[], int]) -> Dict[str, Any]:
+    """
+    Run one scenario and return its throughput figures.
+    `run` returns the number of fixtures (or teams) it produced.
+    """
+    before = server.state.snapshot()
+    slept_before = http_client.limiter.state()["slept_seconds"]
+    start = time.perf_counter()
+    items = run()
+    elapsed = time.perf_counter() - start
+    after = server.state.snapshot()
+    requests_made = after["requests"] - before["requests"]
+    return {
+        "scenario": label,
+        "seconds": elapsed,
+        "requests": requests_made,
+        "items": items,
+        "req_per_s": requests_made / elapsed if elapsed else 0.0,
+        "items_per_s": items / elapsed if elapsed else 0.0,
+        "rate_limited": after["rate_limited"] - before["rate_limited"],
+        "errors": after["errors"] - before["errors"],
+        "slept_s": http_client.limiter.state()["slept_seconds"] - slept_before,
+    }
+
+
+def fixture_rows(count: int) -> List[tuple]:
+    return [
+        ("Mockland", f"League {1000 + i}", 1000 + i, 2023, i + 1)
+        for i in range(count)
+    ]
+
+
+def run_fixtures(workers: int, league_seasons: int) -> int:
+    total, _ = extract_fixtures_mod.extract_fixtures(max_workers=workers, rows=fixture_rows(league_seasons))
+    return total
+
+
+def run_metadata(leagues: int) -> int:
+    metadata = {"countries": [{"country": "Mockland", "leagues": [{"name": f"Mock League {i}"} for i in range(leagues)]}]}
+    stage = collect_metadata(metadata, [])
+    return len(stage["teams"]) + len(stage["league_seasons"])
+
+
+def run_update_by_ids(workers: int, ids: int) -> int:
+    fixture_ids = [
+        str(league * 100_000 + 23 * 1000 + index)
+        for league in range(1000, 1000 + ids // fixtures_per_season() + 1)
+        for index in range(fixtures_per_season())
+    ][:ids]
+    return len(update_by_ids(fixture_ids, max_workers=workers))
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    header = f"{'scenario':<24}{'seconds':>9}{'requests':>10}{'items':>8}{'req/s':>9}{'items/s':>10}{'429s':>6}{'503s':>6}{'slept s':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['scenario']:<24}{r['seconds']:>9.2f}{r['requests']:>10}{r['items']:>8}"
+            f"{r['req_per_s']:>9.1f}{r['items_per_s']:>10.1f}{r['rate_limited']:>6}{r['errors']:>6}{r['slept_s']:>9.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure extraction throughput against the mock football API.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="Worker counts to compare.")
+    parser.add_argument("--league-seasons", type=int, default=8, help="League-seasons for the fixtures scenario.")
+    parser.add_argument("--leagues", type=int, default=4, help="Leagues for the metadata scenario.")
+    parser.add_argument("--ids", type=int, default=400, help="Fixture ids for the update_by_ids scenario.")
+    parser.add_argument("--per-minute", type=int, default=6000, help="Mock per-minute quota.")
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="Mock mean response latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of mock responses that are 503s.")
+    args = parser.parse_args()
+
+    server = start_mock_api(per_minute=args.per_minute, latency_ms=args.latency_ms, error_rate=args.error_rate)
+    workdir = tempfile.TemporaryDirectory()
+    # Point the production code at the mock and keep its side effects local
+    http_client.API_URL = f"http://127.0.0.1:{server.server_address[1]}/"
+    http_client.configure_response_cache(enabled=False)
+    config.FIXTURES_PATH = workdir.name
+    config.RUN_JOURNAL_DIR = workdir.name
+    config.BRONZE_PATH = workdir.name
+    extract_fixtures_mod.get_db_connection = NullConnection
+
+    results = []
+    try:
+        # Seeds the limiter from the mock's rate-limit headers before timing anything
+        http_client.rate_limited_get("status", {})
+        results.append(measure(f"metadata leagues={args.leagues}", server, lambda: run_metadata(args.leagues)))
+        for workers in args.workers:
+            results.append(measure(
+                f"fixtures workers={workers}", server,
+                lambda: run_fixtures(workers, args.league_seasons)
+            ))
+            results.append(measure(
+                f"update_by_ids workers={workers}", server,
+                lambda: run_update_by_ids(workers, args.ids)
+            ))
+    finally:
+        server.shutdown()
+        workdir.cleanup()
+
+    print(
+        f"mock: {args.per_minute}/min quota, {args.latency_ms:.0f} ms latency, "
+        f"{args.error_rate:.0%} errors; limiter {http_client.limiter.state()['rate_per_minute']}/min"
+    )
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: today's dict path versus the columnar fixture decoder.
+
+Today's path is `extract_fixtures_field` building one dict per fixture, the
+list being JSON-dumped to disk and `transform_fixtures` re-parsing it with
+`pd.read_json`. The columnar path is `decode_fixtures_table` followed by
+`Table.to_pandas()`. Both end with the same DataFrame.
+
+Extraction and updates still take the dict path; the columnar path is what
+the bronze archive replay uses and what an Arrow hand-off from extraction
+to the transform would gain.
+
+Run from the repository root:
+    python -m etl.benchmarks.bench_fixture_decoder --sizes 10000 1000000
+
+Inputs are built by repeating one synthetic league-season, so the raw payload
+itself costs little memory and peak figures reflect the decoding work.
+Peak memory is measured with tracemalloc (Python and numpy allocations) plus
+the Arrow memory pool's high-water mark.
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from io import StringIO
+
+import pandas as pd
+import pyarrow as pa
+
+from etl.benchmarks.mock_api import fixtures_per_season, make_fixture
+from etl.src.extract_fixtures import extract_fixtures_field
+from etl.src.fixture_decoder import decode_fixtures_table
+
+
+def dict_path(fixtures):
+    rows = extract_fixtures_field(fixtures)
+    return pd.read_json(StringIO(json.dumps(rows)))
+
+
+def columnar_path(fixtures):
+    return decode_fixtures_table(fixtures).to_pandas()
+
+
+def profile(run, fixtures):
+    """Return (seconds, peak MiB, result); time and memory come from separate runs."""
+    gc.collect()
+    start = time.perf_counter()
+    run(fixtures)
+    elapsed = time.perf_counter() - start
+
+    # tracemalloc slows allocation-heavy code, so it only runs for the memory pass
+    gc.collect()
+    pool = pa.default_memory_pool()
+    arrow_before = pool.bytes_allocated()
+    tracemalloc.start()
+    result = run(fixtures)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    arrow_peak = max(0, pool.max_memory() - arrow_before)
+    return elapsed, (python_peak + arrow_peak) / 2 ** 20, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the dict and columnar fixture decoding paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000], help="Fixture counts.")
+    args = parser.parse_args()
+
+    season = [make_fixture(39, 2023, i) for i in range(fixtures_per_season())]
+    print(f"{'fixtures':>10}  {'path':<9}{'seconds':>9}{'fixtures/s':>13}{'peak MiB':>10}")
+    for size in args.sizes:
+        fixtures = [season[i % len(season)] for i in range(size)]
+        # Columnar first: the Arrow pool's high-water mark only ever grows
+        col_s, col_mb, col_df = profile(columnar_path, fixtures)
+        dict_s, dict_mb, dict_df = profile(dict_path, fixtures)
+        assert len(col_df) == len(dict_df) == size
+        for label, seconds, peak in (("dict", dict_s, dict_mb), ("columnar", col_s, col_mb)):
+            print(f"{size:>10}  {label:<9}{seconds:>9.3f}{size / seconds:>13,.0f}{peak:>10.1f}")
+        print(f"{'':>10}  speedup {dict_s / col_s:.1f}x, peak memory {dict_mb / col_mb:.1f}x lower")
+        del fixtures, col_df, dict_df
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: pandas versus Arrow transform backends, stage by stage.
+
+Writes synthetic league-season fixture files (mock API payloads run through
+`extract_fixtures_field`, as the extractor saves them) to a temporary
+directory, then times each backend's load, clean (cast + results) and write
+stages, and checks both wrote the same cleaned dataset.
+
+Run from the repository root:
+    python -m etl.benchmarks.bench_transform_backends --league-seasons 100 500
+    python -m etl.benchmarks.bench_transform_backends --clean-rows 10000000
+
+`--clean-rows` additionally times the clean stage alone on one large
+in-memory frame/table, where file I/O does not dominate.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+import etl.src.transform_arrow as ta
+import etl.src.transform_fixtures as tf
+from etl.benchmarks.mock_api import fixtures_per_season, make_fixture
+from etl.src.cleaned_dataset import read_cleaned_dataset, write_cleaned_dataset, write_cleaned_table
+from etl.src.extract_fixtures import extract_fixtures_field
+
+
+def write_fixture_files(base: str, league_seasons: int) -> int:
+    """Write `league_seasons` fixtures.json files; returns the fixture count."""
+    total = 0
+    for n in range(league_seasons):
+        league, season = 1000 + n // 5, 2019 + n % 5
+        folder = os.path.join(base, f"Country {league % 20}", f"League {league}", str(season))
+        os.makedirs(folder)
+        rows = extract_fixtures_field([make_fixture(league, season, i) for i in range(fixtures_per_season())])
+        with open(os.path.join(folder, "fixtures.json"), "w") as f:
+            json.dump(rows, f, indent=4)
+        total += len(rows)
+    return total
+
+
+def timed(run):
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def run_pandas(base: str, out: str) -> dict:
+    load_s, df = timed(lambda: tf.load_full_fixtures(base))
+    clean_s, df = timed(lambda: tf.clean_fixtures(df))
+    write_s, _ = timed(lambda: write_cleaned_dataset(df, out))
+    return {"load": load_s, "clean": clean_s, "write": write_s}
+
+
+def run_arrow(base: str, out: str) -> dict:
+    load_s, table = timed(lambda: ta.load_fixtures(is_update=False, base_dir=base))
+    clean_s, table = timed(lambda: ta.clean_table(table))
+    write_s, _ = timed(lambda: write_cleaned_table(table, out))
+    return {"load": load_s, "clean": clean_s, "write": write_s}
+
+
+def same_output(pandas_out: str, arrow_out: str) -> bool:
+    expected = read_cleaned_dataset(pandas_out).sort_values("api_fixture_id").reset_index(drop=True)
+    actual = read_cleaned_dataset(arrow_out).sort_values("api_fixture_id").reset_index(drop=True)
+    try:
+        pd.testing.assert_frame_equal(actual, expected, check_categorical=False)
+        return True
+    except AssertionError:
+        return False
+
+
+def print_row(label, size, timings):
+    total = sum(timings.values())
+    print(
+        f"{label:<22}{size:>10}{timings.get('load', 0):>9.3f}{timings['clean']:>9.3f}"
+        f"{timings.get('write', 0):>9.3f}{total:>9.3f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the pandas and Arrow transform backends.")
+    parser.add_argument("--league-seasons", type=int, nargs="+", default=[100, 500], help="Fixture files to generate.")
+    parser.add_argument("--clean-rows", type=int, nargs="*", default=[], help="In-memory clean-stage sizes.")
+    args = parser.parse_args()
+
+    print(f"Arrow threads: {pa.cpu_count()}, transform worker processes: {tf.TRANSFORM_MAX_WORKERS}")
+    print(f"{'backend':<22}{'rows':>10}{'load s':>9}{'clean s':>9}{'write s':>9}{'total s':>9}")
+    for league_seasons in args.league_seasons:
+        with tempfile.TemporaryDirectory() as workdir:
+            base = os.path.join(workdir, "fixtures")
+            rows = write_fixture_files(base, league_seasons)
+            pandas_out, arrow_out = os.path.join(workdir, "pandas"), os.path.join(workdir, "arrow")
+            print_row(f"pandas files={league_seasons}", rows, run_pandas(base, pandas_out))
+            print_row(f"arrow files={league_seasons}", rows, run_arrow(base, arrow_out))
+            print(f"{'':<22}outputs identical: {same_output(pandas_out, arrow_out)}")
+
+    for rows in args.clean_rows:
+        season = extract_fixtures_field([make_fixture(39, 2023, i) for i in range(fixtures_per_season())])
+        base_table = pa.Table.from_pylist(season, schema=tf.FIXTURE_SCHEMA)
+        table = pa.concat_tables([base_table] * (rows // base_table.num_rows + 1)).slice(0, rows)
+        df = table.to_pandas()
+        pandas_s, _ = timed(lambda: tf.clean_fixtures(df))
+        arrow_s, _ = timed(lambda: ta.clean_table(table))
+        print_row("pandas clean only", rows, {"clean": pandas_s})
+        print_row("arrow clean only", rows, {"clean": arrow_s})
+        del df, table
+
+
+if __name__ == "__main__":
+    main()
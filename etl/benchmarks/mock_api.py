@@ -0,0 +1,249 @@
+"""
+Local stand-in for the API-Football endpoints used by the extractors.
+
+Serves synthetic but deterministic `leagues`, `teams`, `fixtures` and `status`
+payloads in the real response shape, and emulates the parts of the real
+service that matter for throughput:
+- `x-ratelimit-*` headers for a per-minute and a daily quota,
+- HTTP 429 with `Retry-After` once the per-minute window is full,
+- configurable latency and a rate of transient 503 errors.
+
+Run standalone and point API_URL at it:
+    python -m etl.benchmarks.mock_api --port 8089 --per-minute 300
+    API_URL=http://127.0.0.1:8089/ python -m etl.src.extract_fixtures
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+TEAMS_PER_LEAGUE = 20
+
+
+def stable_id(*parts: Any, modulo: int = 10_000) -> int:
+    """
+    Deterministic positive id derived from `parts`.
+    """
+    digest = hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()
+    return int(digest[:8], 16) % modulo + 1
+
+
+def make_teams(league_id: int, season: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "team": {
+                "id": league_id * 100 + i,
+                "name": f"Team {league_id}-{i}",
+                "code": f"T{i:02d}",
+                "country": "Mockland",
+            }
+        }
+        for i in range(1, TEAMS_PER_LEAGUE + 1)
+    ]
+
+
+def make_fixture(league_id: int, season: int, index: int) -> Dict[str, Any]:
+    """
+    One fixture of a double round robin; fixtures before "now" are finished.
+    """
+    teams = TEAMS_PER_LEAGUE
+    matchday, slot = divmod(index, teams // 2)
+    home = league_id * 100 + (slot + matchday) % teams + 1
+    away = league_id * 100 + (teams - 1 - slot + matchday) % teams + 1
+    kickoff = datetime(season, 8, 10, 15) + timedelta(days=7 * matchday, hours=slot % 3)
+    played = kickoff < datetime.utcnow()
+    home_goals, away_goals = (index % 4, (index * 7) % 3) if played else (None, None)
+    return {
+        "fixture": {
+            "id": league_id * 100_000 + season % 100 * 1000 + index,
+            "date": kickoff.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+            "status": {"short": "FT" if played else "NS"},
+        },
+        "league": {
+            "id": league_id,
+            "name": f"League {league_id}",
+            "country": "Mockland",
+            "season": season,
+            "round": f"Regular Season - {matchday + 1}",
+        },
+        "teams": {
+            "home": {"id": home, "name": f"Team {league_id}-{home % 100}"},
+            "away": {"id": away, "name": f"Team {league_id}-{away % 100}"},
+        },
+        "goals": {"home": home_goals, "away": away_goals},
+        "score": {
+            "halftime": {"home": None if home_goals is None else home_goals // 2, "away": None if away_goals is None else away_goals // 2},
+            "fulltime": {"home": home_goals, "away": away_goals},
+        },
+    }
+
+
+def fixtures_per_season() -> int:
+    return TEAMS_PER_LEAGUE * (TEAMS_PER_LEAGUE - 1)
+
+
+def fixture_from_id(fixture_id: int) -> Dict[str, Any]:
+    league_id, rest = divmod(fixture_id, 100_000)
+    season, index = divmod(rest, 1000)
+    return make_fixture(league_id, 2000 + season, index)
+
+
+class MockAPIState:
+    """
+    Quota bookkeeping and counters shared by all handler threads.
+    """
+
+    def __init__(self, per_minute: int, daily: int, latency_ms: float, error_rate: float, seed: int):
+        self.per_minute = per_minute
+        self.daily = daily
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.window = deque()
+        self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0, "daily_used": 0}
+
+    def admit(self) -> Dict[str, Any]:
+        """
+        Decide the fate of one request: ok, 429 (with retry_after) or 503.
+        """
+        now = time.monotonic()
+        with self.lock:
+            self.stats["requests"] += 1
+            while self.window and now - self.window[0] >= 60:
+                self.window.popleft()
+            if len(self.window) >= self.per_minute:
+                self.stats["rate_limited"] += 1
+                return {"status": 429, "retry_after": max(1, int(60 - (now - self.window[0])) + 1)}
+            self.window.append(now)
+            self.stats["daily_used"] += 1
+            if self.random.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return {"status": 503}
+            self.stats["ok"] += 1
+            return {"status": 200}
+
+    def headers(self) -> Dict[str, str]:
+        with self.lock:
+            return {
+                "x-ratelimit-limit": str(self.per_minute),
+                "x-ratelimit-remaining": str(max(0, self.per_minute - len(self.window))),
+                "x-ratelimit-requests-limit": str(self.daily),
+                "x-ratelimit-requests-remaining": str(max(0, self.daily - self.stats["daily_used"])),
+            }
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.stats)
+
+
+def build_response(endpoint: str, params: Dict[str, str], state: MockAPIState) -> Any:
+    if endpoint == "status":
+        return {"requests": {"current": state.snapshot()["daily_used"], "limit_day": state.daily}}
+    if endpoint == "leagues":
+        name = params.get("name", "League")
+        league_id = stable_id(params.get("country"), name)
+        return [{
+            "league": {"id": league_id, "name": name, "type": "League"},
+            "country": {"name": params.get("country")},
+            "seasons": [
+                {"year": year, "start": f"{year}-08-10", "end": f"{year + 1}-05-25", "current": year == 2024}
+                for year in range(2020, 2025)
+            ],
+        }]
+    if endpoint == "teams":
+        return make_teams(int(params["league"]), int(params["season"]))
+    if endpoint == "fixtures":
+        if "ids" in params:
+            return [fixture_from_id(int(fid)) for fid in params["ids"].split("-") if fid]
+        league_id, season = int(params["league"]), int(params["season"])
+        fixtures = [make_fixture(league_id, season, i) for i in range(fixtures_per_season())]
+        if "from" in params:
+            fixtures = [f for f in fixtures if params["from"] <= f["fixture"]["date"][:10] <= params.get("to", "9999")]
+        return fixtures
+    return []
+
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    state: MockAPIState = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        endpoint = url.path.strip("/").split("/")[-1]
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if self.state.latency_ms:
+            time.sleep(self.state.latency_ms / 1000 * (0.5 + self.state.random.random()))
+
+        verdict = self.state.admit()
+        if verdict["status"] == 200:
+            body = json.dumps({
+                "get": endpoint,
+                "parameters": params,
+                "errors": [],
+                "response": build_response(endpoint, params, self.state),
+            }).encode()
+        else:
+            body = json.dumps({"errors": {"requests": "mock rejection"}, "response": []}).encode()
+
+        self.send_response(verdict["status"])
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in self.state.headers().items():
+            self.send_header(name, value)
+        if "retry_after" in verdict:
+            self.send_header("Retry-After", str(verdict["retry_after"]))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_api(
+    port: int = 0,
+    per_minute: int = 300,
+    daily: int = 75_000,
+    latency_ms: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int = 0
+) -> ThreadingHTTPServer:
+    """
+    Start the mock API on a background thread and return the server.
+    Its `state` attribute holds the request counters; the base URL is
+    `http://127.0.0.1:<server.server_address[1]>/`.
+    """
+    handler = type("BoundMockAPIHandler", (MockAPIHandler,), {
+        "state": MockAPIState(per_minute, daily, latency_ms, error_rate, seed)
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.state = handler.state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local mock of the football API.")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--per-minute", type=int, default=300, help="Per-minute quota before 429s.")
+    parser.add_argument("--daily", type=int, default=75_000, help="Daily quota reported in headers.")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mean response latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503.")
+    args = parser.parse_args()
+
+    server = start_mock_api(args.port, args.per_minute, args.daily, args.latency_ms, args.error_rate)
+    print(f"Mock API listening on http://127.0.0.1:{server.server_address[1]}/ (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,197 @@
+"""
+Bronze layer: an append-only archive of every raw API response.
+- Records are written as compressed NDJSON, one line per response element,
+  wrapped with the endpoint params and fetch time.
+- Files are partitioned Hive-style by endpoint, league, season and fetch date:
+  BRONZE_PATH/endpoint=fixtures/league=39/season=2023/fetch_date=2024-05-19/part-*.ndjson.gz
+- Nothing is ever rewritten, so new fields (venue, referee, ...) can be pulled
+  out of historical seasons later without spending API quota again.
+- gzip by default; zstd when BRONZE_COMPRESSION=zstd and `zstandard` is installed.
+"""
+import gzip
+import io
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pyarrow as pa
+
+import etl.src.config as config
+from etl.src.fixture_decoder import decode_fixtures_table
+from etl.src.logger import get_logger
+
+try:
+    import zstandard
+except ImportError: # optional dependency
+    zstandard = None
+
+try:
+    from zoneinfo import ZoneInfo # Python 3.9+
+except ImportError:
+    from backports.zoneinfo import ZoneInfo # python < 3.9
+
+logger = get_logger(__name__, log_path=config.EXTRACT_FIXTURES_LOG)
+
+EXTENSIONS = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+
+
+def resolve_compression(compression: Optional[str] = None) -> str:
+    """
+    Return the codec to write with, falling back to gzip if zstd is unavailable.
+    """
+    compression = (compression or config.BRONZE_COMPRESSION).lower()
+    if compression == "zstd" and zstandard is None:
+        logger.warning("BRONZE_COMPRESSION=zstd but zstandard is not installed; using gzip")
+        return "gzip"
+    if compression not in EXTENSIONS:
+        logger.warning(f"Unknown BRONZE_COMPRESSION '{compression}'; using gzip")
+        return "gzip"
+    return compression
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _open_lines(path: Path) -> Iterator[str]:
+    if path.name.endswith(EXTENSIONS["zstd"]):
+        if zstandard is None:
+            raise RuntimeError(f"Reading {path} needs the zstandard package")
+        with open(path, "rb") as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f)
+            yield from io.TextIOWrapper(reader, encoding="utf-8")
+    else:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            yield from f
+
+
+def _partition_value(record: Dict[str, Any], params: Dict[str, Any], name: str) -> str:
+    """
+    League or season for a record: from the record's own league section when
+    present (e.g. `ids` requests span leagues), else from the request params.
+    """
+    league = record.get("league") if isinstance(record, dict) else None
+    key = "id" if name == "league" else "season"
+    value = league.get(key) if isinstance(league, dict) else None
+    if value is None:
+        value = params.get(name)
+    return "all" if value in (None, "") else str(value)
+
+
+def archive_response(
+    endpoint: str,
+    params: Dict[str, Any],
+    records: List[Any],
+    fetched_at: Optional[datetime] = None,
+    root: Optional[str] = None,
+    compression: Optional[str] = None
+) -> List[str]:
+    """
+    Append one API response to the archive.
+    Returns the paths of the files written (one per league/season partition).
+    """
+    if not records:
+        return []
+    fetched_at = fetched_at or datetime.now(ZoneInfo("UTC"))
+    root = Path(root or config.BRONZE_PATH)
+    compression = resolve_compression(compression)
+
+    partitions: Dict[tuple, List[str]] = {}
+    for record in records:
+        line = json.dumps(
+            {"fetched_at": fetched_at.isoformat(), "endpoint": endpoint, "params": params, "record": record},
+            separators=(",", ":"), default=str,
+        )
+        key = (_partition_value(record, params, "league"), _partition_value(record, params, "season"))
+        partitions.setdefault(key, []).append(line)
+
+    written = []
+    for (league, season), lines in partitions.items():
+        directory = (
+            root / f"endpoint={endpoint}" / f"league={league}" / f"season={season}"
+            / f"fetch_date={fetched_at.date().isoformat()}"
+        )
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"part-{fetched_at.strftime('%H%M%S%f')}-{uuid.uuid4().hex[:8]}{EXTENSIONS[compression]}"
+        tmp_path = str(path) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_compress(("\n".join(lines) + "\n").encode("utf-8"), compression))
+        os.replace(tmp_path, path)
+        written.append(str(path))
+    logger.debug(f"Archived {len(records)} {endpoint} records to {len(written)} bronze files")
+    return written
+
+
+def archive_files(
+    endpoint: str,
+    league: Optional[Any] = None,
+    season: Optional[Any] = None,
+    root: Optional[str] = None
+) -> List[Path]:
+    """
+    List archive files for `endpoint`, pruned to one league and/or season,
+    oldest fetch first.
+    """
+    base = Path(root or config.BRONZE_PATH) / f"endpoint={endpoint}"
+    league_glob = f"league={league}" if league is not None else "league=*"
+    season_glob = f"season={season}" if season is not None else "season=*"
+    files = [
+        path for extension in EXTENSIONS.values()
+        for path in base.glob(f"{league_glob}/{season_glob}/fetch_date=*/part-*{extension}")
+    ]
+    # fetch_date then the time-prefixed file name gives fetch order
+    return sorted(files, key=lambda p: (p.parent.name, p.name))
+
+
+def iter_archive(
+    endpoint: str,
+    league: Optional[Any] = None,
+    season: Optional[Any] = None,
+    root: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield archived entries ({fetched_at, endpoint, params, record}) in fetch order.
+    """
+    for path in archive_files(endpoint, league, season, root):
+        for line in _open_lines(path):
+            if line.strip():
+                yield json.loads(line)
+
+
+def latest_records(
+    endpoint: str,
+    key: Callable[[Dict[str, Any]], Any],
+    league: Optional[Any] = None,
+    season: Optional[Any] = None,
+    root: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Return the most recently fetched record for each `key(record)`.
+    """
+    latest: Dict[Any, Dict[str, Any]] = {}
+    for entry in iter_archive(endpoint, league, season, root):
+        record = entry["record"]
+        try:
+            latest[key(record)] = record
+        except (KeyError, TypeError):
+            continue
+    return list(latest.values())
+
+
+def load_archived_fixtures(
+    league: Optional[Any] = None,
+    season: Optional[Any] = None,
+    root: Optional[str] = None
+) -> pa.Table:
+    """
+    Rebuild the fixtures table from the archive with zero API calls, keeping
+    the latest fetch of every fixture.
+    """
+    records = latest_records("fixtures", lambda r: r["fixture"]["id"], league, season, root)
+    logger.info(f"Loaded {len(records)} fixtures from the bronze archive")
+    return decode_fixtures_table(records)
@@ -0,0 +1,240 @@
+"""
+Cleaned fixtures layer as a Hive-partitioned Parquet dataset.
+- Each transform run writes one dataset directory
+  (cleaned_fixtures_{mode}_{ts}/) instead of a single monolithic file.
+- Full runs are partitioned by country/league/season; update runs, which carry
+  no path columns, by season only:
+  cleaned_fixtures_full_<ts>/country=England/league=Premier%20League/season=2023/part-0.parquet
+- Rows in every file are sorted by api_fixture_id then kickoff_utc, and files
+  carry column statistics, a page index and a bloom filter on api_fixture_id,
+  so readers skip partitions and row groups that cannot match a filter.
+- CleanedDatasetWriter builds a dataset one table at a time (e.g. one
+  league-season per write) for bounded-memory streaming transforms.
+- kickoff_utc is a UTC timestamp column, so kickoff-range filters
+  (kickoff_filters) prune row groups by their min/max statistics.
+- Readers also accept the single-file outputs of earlier runs.
+"""
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import etl.src.config as config
+from etl.src.logger import get_logger
+
+logger = get_logger(__name__, log_path=config.TRANSFORM_FIXTURES_LOG)
+
+PARTITION_TYPES = {"country": pa.string(), "league": pa.string(), "season": pa.int64()}
+FULL_PARTITIONS = ["country", "league", "season"]
+SEASON_PARTITIONS = ["season"]
+SORT_KEYS = [("api_fixture_id", "ascending"), ("kickoff_utc", "ascending")]
+NULLABLE_INTS = {
+    pa.int8(): pd.Int8Dtype(),
+    pa.int16(): pd.Int16Dtype(),
+    pa.int32(): pd.Int32Dtype(),
+    pa.int64(): pd.Int64Dtype(),
+}
+# pyarrow's marker for a null partition value
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+# How COPY loaders serialize timestamps: a form Postgres reads as timestamptz
+COPY_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S%z"
+
+
+def partition_columns(columns: List[str]) -> List[str]:
+    """
+    Partition by country/league/season when the path columns are present,
+    otherwise by season alone.
+    """
+    return FULL_PARTITIONS if {"country", "league"} <= set(columns) else SEASON_PARTITIONS
+
+
+def _partition_dir(names: List[str], values: List[Any]) -> str:
+    parts = []
+    for name, value in zip(names, values):
+        text = NULL_PARTITION if value is None else quote(str(value), safe="")
+        parts.append(f"{name}={text}")
+    return os.path.join(*parts)
+
+
+class CleanedDatasetWriter:
+    """
+    Builds a cleaned dataset one table at a time, so memory is bounded by the
+    largest table written rather than the whole dataset. Each `write` sorts
+    its table and writes the partitions it covers; the dataset is built next
+    to `path` and renamed into place on `close`.
+    """
+
+    def __init__(self, path: str, row_group_size: Optional[int] = None):
+        self.path = str(path)
+        self.tmp_path = self.path + ".tmp"
+        self.row_group_size = row_group_size or config.CLEANED_ROW_GROUP_SIZE
+        self.names: Optional[List[str]] = None
+        self.rows = 0
+        self._parts: Dict[str, int] = {}
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+        os.makedirs(self.tmp_path)
+
+    @property
+    def files(self) -> int:
+        return sum(self._parts.values())
+
+    def write(self, table: pa.Table) -> None:
+        names = partition_columns(table.column_names)
+        if self.names is None:
+            self.names = names
+        elif names != self.names:
+            raise ValueError(f"Cannot mix {'/'.join(names)} and {'/'.join(self.names)} partitions in {self.path}")
+
+        # Dictionary columns cannot be sort keys, so sort on plain-typed copies;
+        # one sort makes every partition a contiguous slice
+        keys = pa.table({
+            **{name: table[name].cast(PARTITION_TYPES[name]) for name in names},
+            **{name: table[name] for name, _ in SORT_KEYS},
+        })
+        order = pc.sort_indices(keys, [(name, "ascending") for name in names] + SORT_KEYS)
+        table, keys = table.take(order), keys.take(order)
+        # Without threads, groups come out in first-appearance (sorted) order
+        groups = keys.select(names).group_by(names, use_threads=False).aggregate([([], "count_all")])
+
+        offset = 0
+        data = table.drop_columns(names)
+        for group in groups.to_pylist():
+            part = data.slice(offset, group["count_all"])
+            offset += group["count_all"]
+            partition = _partition_dir(names, [group[name] for name in names])
+            directory = os.path.join(self.tmp_path, partition)
+            os.makedirs(directory, exist_ok=True)
+            pq.write_table(
+                part,
+                os.path.join(directory, f"part-{self._parts.get(partition, 0)}.parquet"),
+                row_group_size=self.row_group_size,
+                write_statistics=True,
+                write_page_index=True,
+                sorting_columns=pq.SortingColumn.from_ordering(part.schema, SORT_KEYS),
+                bloom_filter_options={"api_fixture_id": {"ndv": max(part.num_rows, 1), "fpp": 0.01}},
+            )
+            self._parts[partition] = self._parts.get(partition, 0) + 1
+        self.rows += table.num_rows
+
+    def close(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self.tmp_path, self.path)
+        logger.info(
+            f"Wrote {self.rows} rows to {self.files} files under {self.path} "
+            f"(by {'/'.join(self.names or SEASON_PARTITIONS)})"
+        )
+
+    def abort(self) -> None:
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+    def __enter__(self) -> "CleanedDatasetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_cleaned_table(table: pa.Table, path: str, row_group_size: Optional[int] = None) -> int:
+    """
+    Write an Arrow table as a partitioned, sorted Parquet dataset at `path`.
+    Returns the number of files written.
+    """
+    with CleanedDatasetWriter(path, row_group_size) as writer:
+        writer.write(table)
+    return writer.files
+
+
+def write_cleaned_dataset(df: pd.DataFrame, path: str, row_group_size: Optional[int] = None) -> int:
+    """
+    Write a cleaned DataFrame as a partitioned, sorted Parquet dataset at `path`.
+    Returns the number of files written.
+    """
+    return write_cleaned_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size)
+
+
+def dataset_partitioning(path: str) -> ds.Partitioning:
+    """
+    Return the Hive partitioning a cleaned dataset directory was written with.
+    """
+    first_level = next((p.name for p in Path(path).iterdir() if p.is_dir()), "")
+    names = FULL_PARTITIONS if first_level.startswith("country=") else SEASON_PARTITIONS
+    return ds.partitioning(
+        pa.schema([(name, PARTITION_TYPES[name]) for name in names]),
+        flavor="hive",
+    )
+
+
+def kickoff_filters(start: Any = None, end: Any = None) -> List[Tuple[str, str, pd.Timestamp]]:
+    """
+    Return DNF filters selecting kickoffs in [start, end); either bound may be
+    omitted. Bounds are anything pd.Timestamp accepts; naive values are
+    taken as UTC.
+    """
+    filters = []
+    for op, bound in ((">=", start), ("<", end)):
+        if bound is not None:
+            ts = pd.Timestamp(bound)
+            filters.append(("kickoff_utc", op, ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")))
+    return filters
+
+
+def open_cleaned_dataset(path: str) -> ds.Dataset:
+    """
+    Open a cleaned dataset directory (or legacy Parquet file) for lazy,
+    batch-wise scanning.
+    """
+    if not os.path.isdir(path):
+        return ds.dataset(path, format="parquet")
+    return ds.dataset(path, format="parquet", partitioning=dataset_partitioning(path))
+
+
+def read_cleaned_dataset(
+    path: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Any]] = None
+) -> pd.DataFrame:
+    """
+    Read a cleaned dataset (or a legacy single Parquet file) into pandas.
+
+    Parameters
+    ----------
+    path : str
+        Dataset directory or Parquet file.
+    columns : list of str, optional
+        Columns to read; partition columns may be included.
+    filters : list, optional
+        pyarrow DNF filters, e.g. [("api_fixture_id", "in", ids)] or
+        kickoff_filters("2024-01-01"). Partitions and row groups whose
+        statistics rule them out are skipped.
+    """
+    if not os.path.isdir(path):
+        return pd.read_parquet(path, columns=columns, filters=filters)
+    expression = pq.filters_to_expression(filters) if filters else None
+    table = open_cleaned_dataset(path).to_table(columns=columns, filter=expression)
+    # Nullable ints whichever backend wrote the files (pandas metadata or not)
+    return table.to_pandas(types_mapper=NULLABLE_INTS.get)
+
+
+def find_latest_output(directory: str, mode: str) -> Path:
+    """
+    Return the most recent cleaned output (dataset directory or legacy file)
+    for `mode` ('full' or 'update') in `directory`.
+    """
+    candidates = [
+        p for p in Path(directory).glob(f"cleaned_fixtures_{mode}_*")
+        if not p.name.endswith(".tmp") and (p.is_dir() or p.suffix == ".parquet")
+    ]
+    if not candidates:
+        raise FileNotFoundError(f"No cleaned {mode} outputs in {directory}")
+    # Names embed a sortable timestamp; mtime breaks ties
+    return max(candidates, key=lambda p: (p.name.split(".")[0], p.stat().st_mtime))
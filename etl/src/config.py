@@ -24,6 +24,45 @@ API = {
 
 MIN_SEASON_TRACKER = int(os.getenv('MIN_SEASON_TRACKER', '2020'))
 
+# Default per-minute API quota used to pace requests until the
+# x-ratelimit-limit header seeds the shared token bucket
+API_RATE_LIMIT_PER_MINUTE = float(os.getenv('API_RATE_LIMIT_PER_MINUTE', '10'))
+# Requests allowed back-to-back before pacing kicks in
+API_RATE_LIMIT_BURST = int(os.getenv('API_RATE_LIMIT_BURST', '1'))
+
+# Daily API quota assumed when neither the headers nor the status endpoint report it
+API_DAILY_QUOTA = int(os.getenv('API_DAILY_QUOTA', '100'))
+
+# API league ids extracted first when the daily quota cannot cover everything,
+# in priority order (defaults to the big five European leagues)
+PRIORITY_LEAGUE_IDS = [
+    int(league_id) for league_id in os.getenv('PRIORITY_LEAGUE_IDS', '39,140,135,78,61').split(',') if league_id.strip()
+]
+
+# Number of league-seasons fetched concurrently during fixture extraction
+EXTRACT_MAX_WORKERS = int(os.getenv('EXTRACT_MAX_WORKERS', '4'))
+
+# Concurrent fixture-ID batches fetched when refreshing results
+UPDATE_MAX_WORKERS = int(os.getenv('UPDATE_MAX_WORKERS', str(EXTRACT_MAX_WORKERS)))
+
+# Extra API calls update_by_ids may spend splitting batches the API rejected
+UPDATE_RETRY_BUDGET = int(os.getenv('UPDATE_RETRY_BUDGET', '10'))
+
+# Attempts per id batch for 429s and transient errors, outside the split budget
+UPDATE_BATCH_ATTEMPTS = int(os.getenv('UPDATE_BATCH_ATTEMPTS', '3'))
+
+# Worker processes used to parse fixture files during the full transform
+TRANSFORM_MAX_WORKERS = int(os.getenv('TRANSFORM_MAX_WORKERS', str(os.cpu_count() or 1)))
+
+# Execution backend for transform_fixtures: "pandas" (reference) or "arrow"
+TRANSFORM_BACKEND = os.getenv("TRANSFORM_BACKEND", "pandas").lower()
+
+# Full transform one league-season file at a time, bounding memory by the largest file
+TRANSFORM_STREAMING = os.getenv("TRANSFORM_STREAMING", "false").lower() == "true"
+
+# Keep-alive connections kept open to the API host; defaults to one per worker
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', str(EXTRACT_MAX_WORKERS)))
+
 
 
 # File paths
@@ -56,6 +95,12 @@ EXTRACT_FIXTURES_LOG = os.getenv(
     os.path.join(LOGS_PATH, "extract_fixtures_logs.txt")
 )
 
+# Log file path for the shared API client and rate limiter
+HTTP_CLIENT_LOG = os.getenv(
+    "HTTP_CLIENT_LOG",
+    os.path.join(LOGS_PATH, "http_client_logs.txt")
+)
+
 TRANSFORM_FIXTURES_LOG = os.getenv(
     "TRANSFORM_FIXTURES_LOG",
     os.path.join(LOGS_PATH, "transforming_fixtures_logs.txt")
@@ -86,8 +131,85 @@ LOAD_UPDATES_LOG = os.getenv(
     os.path.join(LOGS_PATH, "load_updates_to_db_logs.txt")
 )
 
+# Cursor persisted by the extraction planner between scheduled runs
+PLANNER_CURSOR_FILE = os.getenv(
+    "PLANNER_CURSOR_FILE",
+    os.path.join(os.getcwd(), "data", "planner_cursor.json")
+)
+
+# Per-fixture poll schedule kept by the kickoff-window poll scheduler
+POLL_STATE_FILE = os.getenv(
+    "POLL_STATE_FILE",
+    os.path.join(os.getcwd(), "data", "poll_state.json")
+)
+
+# Minutes after kickoff a fixture is expected to be finished (90' + half time + stoppage)
+POLL_FINISH_AFTER_MINUTES = int(os.getenv('POLL_FINISH_AFTER_MINUTES', '110'))
+
+# First re-poll delay for fixtures that should be over but are not final yet; doubles per attempt
+POLL_RETRY_MINUTES = int(os.getenv('POLL_RETRY_MINUTES', '15'))
+
+# First re-poll delay for postponed/suspended fixtures; doubles per attempt
+POLL_DEFERRED_BACKOFF_HOURS = int(os.getenv('POLL_DEFERRED_BACKOFF_HOURS', '6'))
+
+# Longest gap between two polls of the same fixture
+POLL_MAX_BACKOFF_HOURS = int(os.getenv('POLL_MAX_BACKOFF_HOURS', '168'))
+
+# Journals of completed units used to resume bootstrap runs
+RUN_JOURNAL_DIR = os.getenv(
+    "RUN_JOURNAL_DIR",
+    os.path.join(os.getcwd(), "data", "journal")
+)
+
 # Metadata YAML file path
 METADATA_FILE = os.getenv(
     "METADATA_FILE",
     os.path.join(os.getcwd(), "data", "metadata.yaml")
-)
\ No newline at end of file
+)
+
+# Append-only archive of every raw API response (compressed NDJSON)
+BRONZE_PATH = os.getenv(
+    "BRONZE_PATH",
+    os.path.join(os.getcwd(), "data", "bronze")
+)
+BRONZE_ENABLED = os.getenv("BRONZE_ENABLED", "true").lower() == "true"
+# "gzip" or "zstd" (zstd needs the optional zstandard package)
+BRONZE_COMPRESSION = os.getenv("BRONZE_COMPRESSION", "gzip").lower()
+
+# Rows per Parquet row group in the cleaned fixtures dataset
+CLEANED_ROW_GROUP_SIZE = int(os.getenv('CLEANED_ROW_GROUP_SIZE', '10000'))
+# Also write a CSV copy of each cleaned output (for ad-hoc inspection)
+CLEANED_CSV_ENABLED = os.getenv("CLEANED_CSV_ENABLED", "false").lower() == "true"
+
+# Rows per record batch streamed from Parquet into COPY by load_to_db
+LOAD_BATCH_ROWS = int(os.getenv('LOAD_BATCH_ROWS', '50000'))
+# Encoded batches the COPY encoder thread may run ahead of the server
+LOAD_COPY_PREFETCH = int(os.getenv('LOAD_COPY_PREFETCH', '4'))
+# COPY wire format for both loaders: "csv" or "binary" (falls back to CSV
+# for columns without a binary encoding)
+LOAD_COPY_FORMAT = os.getenv("LOAD_COPY_FORMAT", "csv").lower()
+# Full loads: "truncate" (archive copy + TRUNCATE + COPY in place) or "swap"
+# (COPY into a staging table, then rename it over the target)
+LOAD_MODE = os.getenv("LOAD_MODE", "truncate").lower()
+# Longest the swap waits for readers' locks before failing, as a Postgres interval
+LOAD_SWAP_LOCK_TIMEOUT = os.getenv("LOAD_SWAP_LOCK_TIMEOUT", "10s")
+
+# Manifest of transformed source files and their cached cleaned partitions
+TRANSFORM_CACHE_DIR = os.getenv(
+    "TRANSFORM_CACHE_DIR",
+    os.path.join(os.getcwd(), "data", "transform_cache")
+)
+
+# On-disk API response cache (SQLite)
+RESPONSE_CACHE_PATH = os.getenv(
+    "RESPONSE_CACHE_PATH",
+    os.path.join(os.getcwd(), "data", "cache", "api_responses.sqlite")
+)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+
+# Per-endpoint cache TTLs in seconds; a negative value means never expire
+RESPONSE_CACHE_TTLS = {
+    "leagues": float(os.getenv("CACHE_TTL_LEAGUES", "86400")),
+    "teams": float(os.getenv("CACHE_TTL_TEAMS", "86400")),
+    "teams_past_season": float(os.getenv("CACHE_TTL_TEAMS_PAST_SEASON", "-1")),
+}
@@ -0,0 +1,322 @@
+"""
+File-like adapters that feed Arrow record batches to Postgres COPY FROM STDIN.
+- psycopg2's copy_expert pulls data with `read(size)`; a CopyStream answers
+  from a small buffer of encoded batches, so only a few batches are ever held
+  in memory however large the source dataset is.
+- Batches are read and encoded on a background thread, up to
+  LOAD_COPY_PREFETCH batches ahead, so Parquet decoding and encoding overlap
+  with sending data to the server.
+- CsvCopyStream writes COPY's CSV format without a header: NULL is an
+  unquoted empty field, strings are always quoted, and timestamps use
+  COPY_TIMESTAMP_FORMAT.
+- BinaryCopyStream writes PostgreSQL's binary COPY format, encoded with
+  numpy straight from the Arrow buffers. Binary fields must match the target
+  column types exactly, so it is driven by the table's information_schema
+  types (smallint, integer, bigint, text, varchar, timestamptz, boolean);
+  make_copy_stream falls back to CSV when a column cannot be encoded.
+- LOAD_COPY_FORMAT ("csv" or "binary") picks the format for both loaders.
+"""
+import queue
+import struct
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+import etl.src.config as config
+from etl.src.cleaned_dataset import COPY_TIMESTAMP_FORMAT
+from etl.src.logger import get_logger
+
+logger = get_logger(__name__, log_path=config.LOAD_TO_DB_LOG)
+
+# Marks the end of the batch stream on the queue
+_END = object()
+
+# Binary COPY framing: signature, flags and header-extension length; the
+# trailer is a field count of -1
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+PGCOPY_TRAILER = struct.pack(">h", -1)
+# Microseconds from the Unix epoch to the Postgres epoch (2000-01-01 UTC)
+PG_EPOCH_OFFSET_US = 946_684_800_000_000
+# information_schema data_type -> big-endian numpy type of its binary form
+PG_FIXED_TYPES = {
+    "smallint": ">i2",
+    "integer": ">i4",
+    "bigint": ">i8",
+    "boolean": "u1",
+    "timestamp with time zone": ">i8",
+}
+PG_TEXT_TYPES = {"text", "character varying"}
+
+
+def _copy_column(column: pa.Array) -> pa.Array:
+    """
+    Render timestamps in COPY_TIMESTAMP_FORMAT (at Postgres' microsecond
+    precision); other columns are written by the Arrow CSV writer as-is.
+    """
+    if pa.types.is_timestamp(column.type):
+        micros = column.cast(pa.timestamp("us", tz=column.type.tz), safe=False)
+        return pc.strftime(micros, format=COPY_TIMESTAMP_FORMAT)
+    return column
+
+
+def encode_csv_batch(batch: pa.RecordBatch) -> bytes:
+    """
+    Encode one record batch as COPY CSV rows (no header).
+    """
+    batch = pa.RecordBatch.from_arrays([_copy_column(col) for col in batch.columns], names=batch.schema.names)
+    sink = pa.BufferOutputStream()
+    pacsv.write_csv(batch, sink, pacsv.WriteOptions(include_header=False))
+    return sink.getvalue().to_pybytes()
+
+
+def _binary_compatible(arrow_type: pa.DataType, pg_type: str) -> bool:
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    if pg_type in ("smallint", "integer", "bigint"):
+        return pa.types.is_integer(arrow_type)
+    if pg_type == "boolean":
+        return pa.types.is_boolean(arrow_type)
+    if pg_type == "timestamp with time zone":
+        return pa.types.is_timestamp(arrow_type) and arrow_type.tz is not None
+    if pg_type in PG_TEXT_TYPES:
+        return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type) or pa.types.is_integer(arrow_type)
+    return False
+
+
+def binary_copy_types(schema: pa.Schema, column_types: Dict[str, str]) -> Optional[List[str]]:
+    """
+    Return the target type of each field in `schema` if every field can be
+    binary-encoded for its column, else None (with the reason logged).
+    """
+    pg_types = []
+    for field in schema:
+        pg_type = column_types.get(field.name)
+        if pg_type is None or not _binary_compatible(field.type, pg_type):
+            logger.info(f"Column {field.name} ({field.type} -> {pg_type}) has no binary COPY encoding")
+            return None
+        pg_types.append(pg_type)
+    return pg_types
+
+
+def _exclusive_cumsum(values: np.ndarray) -> np.ndarray:
+    starts = np.zeros(len(values), dtype=np.int64)
+    np.cumsum(values[:-1], out=starts[1:])
+    return starts
+
+
+def _scatter_fixed(out: np.ndarray, offsets: np.ndarray, values: np.ndarray) -> None:
+    # Row i's bytes go to out[offsets[i]:offsets[i] + itemsize]
+    width = values.dtype.itemsize
+    out[offsets[:, None] + np.arange(width)] = values.view(np.uint8).reshape(-1, width)
+
+
+def _binary_column(column: pa.Array, pg_type: str) -> Tuple[np.ndarray, Callable[[np.ndarray, np.ndarray], None]]:
+    """
+    Return each row's field body length (-1 for NULL) and a function that
+    writes every field, length word included, into `out` at the given
+    per-row offsets.
+    """
+    if pa.types.is_dictionary(column.type):
+        column = column.dictionary_decode()
+    valid = column.is_valid().to_numpy(zero_copy_only=False)
+
+    if pg_type in PG_TEXT_TYPES:
+        column = column.cast(pa.string())
+        offsets = np.frombuffer(column.buffers()[1], dtype=np.int32)[column.offset:column.offset + len(column) + 1]
+        data = np.frombuffer(column.buffers()[2], dtype=np.uint8) if column.buffers()[2] is not None else np.empty(0, np.uint8)
+        sizes = np.diff(offsets).astype(np.int64)
+        lengths = np.where(valid, sizes, -1)
+
+        def write_text(out: np.ndarray, positions: np.ndarray) -> None:
+            _scatter_fixed(out, positions, lengths.astype(">i4"))
+            sizes_valid = sizes[valid]
+            total = int(sizes_valid.sum())
+            # Map every copied byte to its source and destination index
+            within = np.arange(total, dtype=np.int64) - np.repeat(_exclusive_cumsum(sizes_valid), sizes_valid)
+            out[np.repeat(positions[valid] + 4, sizes_valid) + within] = data[np.repeat(offsets[:-1][valid], sizes_valid) + within]
+
+        return lengths, write_text
+
+    dtype = np.dtype(PG_FIXED_TYPES[pg_type])
+    if pg_type == "timestamp with time zone":
+        micros = column.cast(pa.timestamp("us", tz=column.type.tz), safe=False).cast(pa.int64())
+        values = pc.fill_null(micros, 0).to_numpy() - PG_EPOCH_OFFSET_US
+    elif pg_type == "boolean":
+        values = pc.fill_null(column, False).to_numpy(zero_copy_only=False)
+    else:
+        # A checked cast, so values too wide for the column raise
+        values = pc.fill_null(column.cast(pa.from_numpy_dtype(dtype.newbyteorder("="))), 0).to_numpy()
+    lengths = np.where(valid, dtype.itemsize, -1)
+    # Length word and value side by side, so each field is one scatter
+    fields = np.empty(int(valid.sum()), dtype=[("length", ">i4"), ("value", dtype)])
+    fields["length"] = dtype.itemsize
+    fields["value"] = values[valid]
+
+    def write_fixed(out: np.ndarray, positions: np.ndarray) -> None:
+        _scatter_fixed(out, positions[valid], fields)
+        if len(fields) < len(valid):
+            _scatter_fixed(out, positions[~valid], np.full(len(valid) - len(fields), -1, dtype=">i4"))
+
+    return lengths, write_fixed
+
+
+def encode_binary_batch(batch: pa.RecordBatch, pg_types: List[str]) -> bytes:
+    """
+    Encode one record batch as binary COPY tuples (no header or trailer);
+    `pg_types` gives each column's target type.
+    """
+    n = batch.num_rows
+    columns = [_binary_column(col, pg_type) for col, pg_type in zip(batch.columns, pg_types)]
+    # Each tuple: int16 field count, then per field an int32 length and body
+    row_sizes = np.full(n, 2, dtype=np.int64)
+    for lengths, _ in columns:
+        row_sizes += 4 + np.maximum(lengths, 0)
+    row_starts = _exclusive_cumsum(row_sizes)
+    out = np.empty(int(row_sizes.sum()), dtype=np.uint8)
+    _scatter_fixed(out, row_starts, np.full(n, len(columns), dtype=">i2"))
+    positions = row_starts + 2
+    for lengths, write in columns:
+        write(out, positions)
+        positions = positions + 4 + np.maximum(lengths, 0)
+    return out.tobytes()
+
+
+class CopyStream:
+    """
+    Read-only file object over an iterable of record batches, for
+    `cursor.copy_expert(sql, stream)`. Subclasses define `encode` and the
+    format's `header` and `trailer`. `rows` counts the rows read so far.
+    Call `close` (or use as a context manager) to stop the encoder thread if
+    the COPY ends early.
+    """
+
+    header = b""
+    trailer = b""
+
+    def __init__(self, batches: Iterable[pa.RecordBatch], prefetch: Optional[int] = None):
+        self.rows = 0
+        self._batches: Iterator[pa.RecordBatch] = iter(batches)
+        self._queue: queue.Queue = queue.Queue(maxsize=prefetch or config.LOAD_COPY_PREFETCH)
+        self._buffer = bytearray(self.header)
+        self._done = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._encode_all, name="copy-encoder", daemon=True)
+        self._thread.start()
+
+    def encode(self, batch: pa.RecordBatch) -> bytes:
+        raise NotImplementedError
+
+    def _put(self, item) -> bool:
+        # Time out periodically so close() can stop a blocked encoder
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _encode_all(self) -> None:
+        try:
+            for batch in self._batches:
+                if batch.num_rows and not self._put((batch.num_rows, self.encode(batch))):
+                    return
+            self._put(_END)
+        except Exception as e:
+            self._put(e)
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._done and (size < 0 or len(self._buffer) < size):
+            item = self._queue.get()
+            if item is _END:
+                self._done = True
+                self._buffer += self.trailer
+            elif isinstance(item, Exception):
+                self._done = True
+                raise item
+            else:
+                rows, data = item
+                self.rows += rows
+                self._buffer += data
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return data
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self) -> "CopyStream":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class CsvCopyStream(CopyStream):
+    """
+    COPY ... WITH CSV stream (no header row).
+    """
+
+    def encode(self, batch: pa.RecordBatch) -> bytes:
+        return encode_csv_batch(batch)
+
+
+class BinaryCopyStream(CopyStream):
+    """
+    COPY ... WITH (FORMAT binary) stream; `pg_types` are the target column
+    types in batch column order (see binary_copy_types).
+    """
+
+    header = PGCOPY_HEADER
+    trailer = PGCOPY_TRAILER
+
+    def __init__(self, batches: Iterable[pa.RecordBatch], pg_types: List[str], prefetch: Optional[int] = None):
+        self.pg_types = pg_types
+        super().__init__(batches, prefetch)
+
+    def encode(self, batch: pa.RecordBatch) -> bytes:
+        return encode_binary_batch(batch, self.pg_types)
+
+
+def table_column_types(cur, schema: str, table: str) -> Dict[str, str]:
+    """
+    Return {column: information_schema data_type} for a table, in column order.
+    """
+    cur.execute(
+        "SELECT column_name, data_type FROM information_schema.columns "
+        "WHERE table_schema = %s AND table_name = %s ORDER BY ordinal_position;",
+        (schema, table)
+    )
+    return {name: data_type for name, data_type in cur.fetchall()}
+
+
+def make_copy_stream(
+    batches: Iterable[pa.RecordBatch],
+    schema: pa.Schema,
+    column_types: Optional[Dict[str, str]] = None,
+    copy_format: Optional[str] = None
+) -> Tuple[CopyStream, str]:
+    """
+    Return a COPY stream for `batches` in `copy_format` (default
+    LOAD_COPY_FORMAT) and the matching COPY options: "CSV" or
+    "(FORMAT binary)". Binary needs the target `column_types`; without them,
+    or if a column cannot be binary-encoded, CSV is used.
+    """
+    copy_format = (copy_format or config.LOAD_COPY_FORMAT).lower()
+    if copy_format not in ("csv", "binary"):
+        raise ValueError(f"Unknown COPY format: {copy_format}")
+    if copy_format == "binary":
+        pg_types = binary_copy_types(schema, column_types or {})
+        if pg_types is not None:
+            return BinaryCopyStream(batches, pg_types), "(FORMAT binary)"
+        logger.warning("Falling back to CSV COPY: not every column has a binary encoding")
+    return CsvCopyStream(batches), "CSV"
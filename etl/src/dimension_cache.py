@@ -0,0 +1,138 @@
+"""
+In-memory natural-key -> surrogate-id maps for the dim tables.
+- Loaded once per metadata run with one SELECT per dimension.
+- Stores each row's tracked attributes alongside its id, so the upsert helpers
+  can tell an unchanged row apart and skip the INSERT ... ON CONFLICT and
+  SELECT round trips entirely.
+- Kept in sync by the upsert helpers whenever they do write a row.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import psycopg2.extensions
+
+import etl.src.config as config
+from etl.src.logger import get_logger
+
+logger = get_logger(__name__, log_path=config.EXTRACT_METADATA_LOG)
+
+PRELOAD_QUERIES = {
+    "countries": "SELECT country_name, country_id FROM dim.dim_countries",
+    "leagues": "SELECT api_league_id, league_id, league_name, country_id FROM dim.dim_leagues",
+    "league_seasons": (
+        "SELECT league_id, season, league_season_id, season_label, start_date, end_date "
+        "FROM dim.dim_league_seasons"
+    ),
+    "teams": "SELECT api_team_id, team_name, team_code, country_id FROM dim.dim_teams",
+}
+
+
+def _normalize(value: Any) -> Optional[str]:
+    """
+    Compare DB values (dates, ints) and API values (strings) on equal terms.
+    """
+    return None if value is None else str(value)
+
+
+class DimensionKeyCache:
+    """
+    Natural-key maps for countries, leagues, league-seasons and teams.
+    """
+
+    def __init__(self):
+        self.countries: Dict[str, int] = {}
+        self.leagues: Dict[int, Tuple[int, Optional[str], Optional[str]]] = {}
+        self.league_seasons: Dict[Tuple[int, int], Tuple[int, Optional[str], Optional[str], Optional[str]]] = {}
+        self.teams: Dict[int, Tuple[Optional[str], Optional[str], Optional[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, cur: psycopg2.extensions.cursor) -> "DimensionKeyCache":
+        """
+        Build a cache from the current contents of the dim tables.
+        """
+        keys = cls()
+        cur.execute(PRELOAD_QUERIES["countries"])
+        for country_name, country_id in cur.fetchall():
+            keys.remember_country(country_name, country_id)
+        cur.execute(PRELOAD_QUERIES["leagues"])
+        for api_league_id, league_id, league_name, country_id in cur.fetchall():
+            keys.remember_league(api_league_id, league_id, league_name, country_id)
+        cur.execute(PRELOAD_QUERIES["league_seasons"])
+        for league_id, season, league_season_id, season_label, start_date, end_date in cur.fetchall():
+            keys.remember_league_season(league_id, season, league_season_id, season_label, start_date, end_date)
+        cur.execute(PRELOAD_QUERIES["teams"])
+        for api_team_id, team_name, team_code, country_id in cur.fetchall():
+            keys.remember_team(api_team_id, team_name, team_code, country_id)
+        logger.info(
+            f"Preloaded dimension keys: {len(keys.countries)} countries, {len(keys.leagues)} leagues, "
+            f"{len(keys.league_seasons)} league-seasons, {len(keys.teams)} teams"
+        )
+        return keys
+
+    def _count(self, found: bool) -> bool:
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found
+
+    # Lookups return the surrogate id (or True for teams) only when the stored
+    # attributes match, i.e. when an upsert would be a no-op.
+
+    def country_id(self, country_name: str) -> Optional[int]:
+        country_id = self.countries.get(country_name)
+        self._count(country_id is not None)
+        return country_id
+
+    def league_id(self, api_league_id: int, league_name: str, country_id: int) -> Optional[int]:
+        cached = self.leagues.get(api_league_id)
+        if self._count(cached is not None and cached[1:] == (_normalize(league_name), _normalize(country_id))):
+            return cached[0]
+        return None
+
+    def league_season_id(
+        self,
+        league_id: int,
+        season: int,
+        season_label: str,
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> Optional[int]:
+        cached = self.league_seasons.get((league_id, season))
+        attributes = (_normalize(season_label), _normalize(start_date), _normalize(end_date))
+        if self._count(cached is not None and cached[1:] == attributes):
+            return cached[0]
+        return None
+
+    def team_unchanged(self, api_team_id: int, team_name: str, team_code: Optional[str], country_id: int) -> bool:
+        cached = self.teams.get(api_team_id)
+        return self._count(cached == (_normalize(team_name), _normalize(team_code), _normalize(country_id)))
+
+    def remember_country(self, country_name: str, country_id: int) -> None:
+        self.countries[country_name] = country_id
+
+    def remember_league(self, api_league_id: int, league_id: int, league_name: str, country_id: int) -> None:
+        self.leagues[api_league_id] = (league_id, _normalize(league_name), _normalize(country_id))
+
+    def remember_league_season(
+        self,
+        league_id: int,
+        season: int,
+        league_season_id: int,
+        season_label: str,
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> None:
+        self.league_seasons[(league_id, season)] = (
+            league_season_id, _normalize(season_label), _normalize(start_date), _normalize(end_date)
+        )
+
+    def remember_team(self, api_team_id: int, team_name: str, team_code: Optional[str], country_id: int) -> None:
+        self.teams[api_team_id] = (_normalize(team_name), _normalize(team_code), _normalize(country_id))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return lookup hits (DB round trips avoided) and misses.
+        """
+        return {"hits": self.hits, "misses": self.misses}
@@ -4,31 +4,18 @@ import etl.src.config as config
 from etl.src.config import EXTRACT_FIXTURES_LOG
 import psycopg2
 import logging
-import requests
 import json
 import time
-from datetime import datetime, timedelta
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from slugify import slugify
 from typing import List, Dict, Any, Tuple, Optional
 from etl.src.extract_metadata import get_db_connection
+from etl.src.http_client import rate_limited_get, limiter, get_session, DailyQuotaExhausted
 from etl.src.logger import get_logger
+from etl.src.run_journal import RunJournal, DONE, SAVED
 logger = get_logger(__name__, log_path=EXTRACT_FIXTURES_LOG)
 
-try:
-    from zoneinfo import ZoneInfo # Python 3.9+
-except ImportError:
-    from backports.zoneinfo import ZoneInfo # python < 3.9
-
-
-
-# API connection parameters loaded from config.py.
-API_KEY = config.API['key']
-API_HOST = config.API['host']
-API_URL = config.API['url']
-HEADERS = {
-    'x-rapidapi-key': API_KEY,
-    'x-rapidapi-host': API_HOST
-}
 
 # Parameterized API endpoint names
 FIXTURES_ENDPOINT = "fixtures"
@@ -85,82 +72,6 @@ def write_json(file_path: str, data: Any) -> None:
         logger.error(f"Failed to write file {file_path}: {e}")
         raise 
 
-def daily_sleep_calculator():
-    """
-    Sleeps until the next UTC day starts at midnight.
-    This is useful for resetting daily rate limits.
-    """
-    utc_now = datetime.now(ZoneInfo("UTC"))
-    next_day = datetime.combine(utc_now.date() + timedelta(days=1), datetime.min.time(), tzinfo=ZoneInfo("UTC"))
-    sleep_sec = (next_day - utc_now).total_seconds()
-    logger.info(f"Sleeping until next UTC day: {sleep_sec} seconds")
-    time.sleep(sleep_sec)
-
-# Unified rate-limited GET with retry/backoff and 429 handling
-def _rate_limited_get(
-    endpoint: str,
-    params: Dict[str, Any],
-    max_retries: int = 5
-) -> List[Dict[str, Any]]:
-    """
-    Perform an HTTP GET with automatic rate-limit handling:
-    - Honors daily and per-minute limit headers.
-    - Retries on HTTP 429 with Retry-After header.
-    - Uses exponential backoff on transient errors.
-    Returns list of JSON 'response' elements or empty list on failure.
-    """
-    backoff = 1
-    for attempt in range(1, max_retries + 1):
-        try:
-            response = requests.get(f"{API_URL}{endpoint}", headers=HEADERS, params=params, timeout=10)
-            # Enforce limits
-            try:
-
-                daily_rem = int(response.headers.get('x-ratelimit-requests-remaining', 1))
-            except (TypeError, ValueError):
-                daily_rem = 1
-            
-            try:
-
-                min_rem   = int(response.headers.get('x-ratelimit-remaining', 1))
-            except (TypeError, ValueError):
-                min_rem = 1
-
-            if daily_rem < 1:
-                # Sleep until next UTC day
-                daily_sleep_calculator()
-                continue
-            if min_rem < 1:
-                logger.info("Minute rate limit reached, sleeping 60s")
-                time.sleep(60)
-                continue
-
-            # Check for HTTP errors
-            if response.status_code == 429:
-                retry_after = int(response.headers.get('Retry-After', backoff))
-                logger.info(f"HTTP 429 received, sleeping {retry_after}s")
-                time.sleep(retry_after)
-                continue
-            response.raise_for_status()
-            
-            try:
-                payload = response.json()
-            except ValueError:
-                logger.error(f"Failed to parse JSON response on attempt {attempt}/{max_retries}")
-                return []
-
-            return payload.get("response", [])
-        
-        except (HTTPError, ConnectionError, Timeout) as e:
-            logger.warning(f"Transient error on attempt {attempt}/{max_retries}: {e}. Retrying in {backoff}s")
-            time.sleep(backoff)
-            backoff = min(backoff * 2, 60)
-        except RequestException as e:
-            logger.error(f"Non-retryable request error: {e}")
-            break
-    logger.error(f"Failed to fetch {endpoint} after {max_retries} attempts with params: {params}")
-    return []
-
 # endpoint params => Listof fixture
 # endpoint is fixtures
 #params is league_id and season
@@ -170,7 +81,7 @@ def fetch_fixtures(endpoint, params):
     Fetch fixtures from the API with rate limiting and error handling.  
     Returns a list of fixtures or an empty list on failure.
     """
-    return _rate_limited_get(endpoint, params)
+    return rate_limited_get(endpoint, params)
 
 #fixtures is a list of fixtures each fixture contains a lot of information that
 #should be documented but i will only extract the ones i consider important
@@ -267,80 +178,201 @@ def get_season_rows(
     """)
     return cur.fetchall()
 
-def extract_fixtures() -> Tuple[int, int]:
+def extract_league_season(
+    country_name: str,
+    league_name: str,
+    api_league_id: int,
+    season_year: int
+) -> int:
+    """
+    Fetch, transform and save the fixtures of a single league-season.
+    Safe to run from worker threads: it touches no database state.
+    Returns the number of fixtures saved (0 if the API returned none).
+    """
+    logger.info(f"Processing fixtures for {league_name} season {season_year}")
+    # Fetch fixtures with timing
+    start_fetch = time.time()
+    fixtures = fetch_fixtures(FIXTURES_ENDPOINT, params={"league": api_league_id, "season": season_year})
+    fetch_elapsed = time.time() - start_fetch
+    logger.info(f"Fetched {len(fixtures)} fixtures for {league_name} season {season_year} in {fetch_elapsed:.2f}s")
+
+    # Transform fixtures with timing
+    start_transform = time.time()
+    extracted = extract_fixtures_field(fixtures)
+    transform_elapsed = time.time() - start_transform
+    logger.info(f"Transformed {len(extracted)} fixtures in {transform_elapsed:.2f}s")
+
+    if not extracted:
+        logger.warning(f"No fixtures for {league_name} ({season_year})")
+        return 0
+
+    # Save fixtures with timing
+    start_save = time.time()
+    save_fixture_data(country_name, league_name, season_year, extracted)
+    save_elapsed = time.time() - start_save
+    logger.info(f"Saved {len(extracted)} fixtures for {league_name} ({season_year}) in {save_elapsed:.2f}s")
+    return len(extracted)
+
+
+def fixtures_unit(league_season_id: int) -> str:
+    """
+    Journal key for one league-season's fixtures.
+    """
+    return f"league_season:{league_season_id}"
+
+
+def _extract_and_journal(
+    journal: RunJournal,
+    country_name: str,
+    league_name: str,
+    api_league_id: int,
+    season_year: int,
+    league_season_id: int
+) -> int:
+    """
+    Run `extract_league_season` and journal the saved file before the DB is marked,
+    so a crash in between does not cost the API call again on resume.
+    """
+    extracted_count = extract_league_season(country_name, league_name, api_league_id, season_year)
+    if extracted_count:
+        journal.record(fixtures_unit(league_season_id), SAVED, fixtures=extracted_count)
+    return extracted_count
+
+
+def extract_fixtures(
+    max_workers: int = config.EXTRACT_MAX_WORKERS,
+    rows: Optional[List[Tuple[str, str, int, int, int]]] = None,
+    resume: bool = False
+) -> Tuple[int, int]:
     """
     ETL for fixtures:
     - Reads api_league_id and season_year from dim tables
     - check if fixtures_bootstrap_done is FALSE
-    - Fetches fixtures from API
+    - Fetches fixtures from API for up to `max_workers` league-seasons in parallel,
+      all sharing one rate-limit budget
     - Transforms and saves to disk
+    - Marks and commits each league-season independently as it completes
+    - Stops scheduling new league-seasons once the daily quota is exhausted
+    - Journals each league-season as its file is saved and again once committed
     - Logs progress and errors
 
+    Parameters
+    ----------
+    max_workers : int, optional
+        Number of league-seasons fetched concurrently.
+    rows : list of tuple, optional
+        League-seasons to process, shaped like `get_season_rows` output.
+        Defaults to every league-season not yet bootstrapped.
+    resume : bool, optional
+        Continue the previous run's journal: league-seasons already committed
+        are skipped, and those saved to disk but not yet marked are marked
+        without fetching them again.
     """
     total_extracted = 0
     total_failed_leagues = 0
+    total_deferred = 0
+    max_workers = max(1, max_workers)
+    start_total = time.time()
     # Measure DB connection time
     start_conn = time.time()
     conn = get_db_connection()
     conn_elapsed = time.time() - start_conn
     logger.info(f"Database connection established in {conn_elapsed:.2f}s")
     cur = conn.cursor()
-    logger.info("Starting fixtures extraction")
+    logger.info(f"Starting fixtures extraction with {max_workers} workers")
     try:
         # Query each league-season combination
-        rows = get_season_rows(cur)
+        if rows is None:
+            rows = get_season_rows(cur)
         if not rows:
             logger.info("No new league-seasons found for fixture extraction.")
             return total_extracted, total_failed_leagues
-        
-        for country_name, league_name, api_league_id, season_year, league_season_id in rows:
-            logger.info(f"Processing fixtures for {league_name} season {season_year}")
-            try:
-                # Fetch fixtures with timing
-                start_fetch = time.time()
-                fixtures = fetch_fixtures(FIXTURES_ENDPOINT, params={"league": api_league_id, "season": season_year})
-                fetch_elapsed = time.time() - start_fetch
-                logger.info(f"Fetched {len(fixtures)} fixtures for {league_name} season {season_year} in {fetch_elapsed:.2f}s")
-
-                # Transform fixtures with timing
-                start_transform = time.time()
-                extracted = extract_fixtures_field(fixtures)
-                transform_elapsed = time.time() - start_transform
-                logger.info(f"Transformed {len(extracted)} fixtures in {transform_elapsed:.2f}s")
-
-                if not extracted:
-                    logger.warning(f"No fixtures for {league_name} ({season_year})")
-                    continue
-
-                # Save fixtures with timing
-                start_save = time.time()
-                save_fixture_data(country_name, league_name, season_year, extracted)
-                mark_fixtures_bootstrap_done(cur, league_season_id)
-                conn.commit()
-
-                save_elapsed = time.time() - start_save
-                logger.info(f"Saved {len(extracted)} fixtures for {league_name} ({season_year}) in {save_elapsed:.2f}s")
-                total_extracted += len(extracted)
 
-            except (RequestException, psycopg2.Error) as e:
-                conn.rollback()
-                logger.error(f"Network/DB error for {league_name} ({season_year}): {e}", exc_info=True)
-                total_failed_leagues += 1
+        journal = RunJournal("extract_fixtures", resume=resume, logger=logger)
+        pending = []
+        for row in rows:
+            league_season_id = row[4]
+            status = journal.status(fixtures_unit(league_season_id))
+            if status == DONE:
                 continue
+            if status == SAVED:
+                # The file is on disk from the interrupted run; only the flag is missing
+                try:
+                    mark_fixtures_bootstrap_done(cur, league_season_id)
+                    conn.commit()
+                    journal.record(fixtures_unit(league_season_id), DONE)
+                except psycopg2.Error as e:
+                    conn.rollback()
+                    logger.error(f"Could not mark resumed league_season_id={league_season_id}: {e}", exc_info=True)
+                    total_failed_leagues += 1
+                continue
+            pending.append(row)
+        if len(pending) < len(rows):
+            logger.info(f"Resumed run: {len(rows) - len(pending)} league-seasons already journaled, {len(pending)} to fetch")
+
+        # Size the keep-alive pool so every worker gets its own connection
+        get_session(pool_size=max_workers)
+
+        # Workers only do network and file I/O; the cursor stays on this thread
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extract_fixtures") as executor:
+            futures = {
+                executor.submit(_extract_and_journal, journal, *row): (row[1], row[3], row[4])
+                for row in pending
+            }
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                league_name, season_year, league_season_id = futures[future]
+                try:
+                    extracted_count = future.result()
+                    if not extracted_count:
+                        continue
+                    mark_fixtures_bootstrap_done(cur, league_season_id)
+                    conn.commit()
+                    journal.record(fixtures_unit(league_season_id), DONE, fixtures=extracted_count)
+                    total_extracted += extracted_count
+
+                except DailyQuotaExhausted as e:
+                    # Leave the rest for the next scheduled run rather than blocking
+                    cancelled = sum(f.cancel() for f in futures)
+                    total_deferred += 1 + cancelled
+                    logger.warning(f"{e}: deferring {league_name} ({season_year}) and {cancelled} unstarted league-seasons")
+
+                except (RequestException, psycopg2.Error) as e:
+                    conn.rollback()
+                    logger.error(f"Network/DB error for {league_name} ({season_year}): {e}", exc_info=True)
+                    total_failed_leagues += 1
+                    continue
         logger.info("All fixture data extraction complete.")
         logger.info(
             f"Extraction summary: {total_extracted} fixtures extracted across "
-            f"{len(rows)} league-seasons with {total_failed_leagues} failures"
+            f"{len(rows)} league-seasons with {total_failed_leagues} failures "
+            f"and {total_deferred} deferred for lack of quota "
+            f"in {time.time() - start_total:.2f}s"
         )
+        logger.info(f"Rate limiter state: {limiter.state()}")
         return total_extracted, total_failed_leagues
     finally:
         cur.close()
         conn.close()
 
 if __name__ == "__main__":
-
-    logger.info("Invoking extract_fixtures")
+    parser = argparse.ArgumentParser(description="Extract fixtures for league-seasons not yet bootstrapped.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=config.EXTRACT_MAX_WORKERS,
+        help="Number of league-seasons to fetch concurrently (1 = serial)."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip league-seasons the previous run already saved or committed."
+    )
+    args = parser.parse_args()
+
+    logger.info("Invoking extract_fixtures (workers=%d)", args.workers)
     try:
-        extract_fixtures()
+        extract_fixtures(max_workers=args.workers, resume=args.resume)
     except KeyboardInterrupt:
         logger.warning("Keyboard interrupt received: shutting down extraction.")
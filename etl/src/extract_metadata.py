@@ -1,16 +1,18 @@
-from requests.exceptions import HTTPError, ConnectionError, Timeout, RequestException
 import os
 import etl.src.config as config
 from etl.src.logger import get_logger
-import requests
+from etl.src.http_client import FetchFailed, cached_get, cache_ttl, configure_response_cache, get_response_cache, limiter
 import psycopg2
 import yaml
 import pprint
 import time
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
-from typing import List, Dict, Any, Optional
+import argparse
+from datetime import date
+from typing import List, Dict, Any, Optional, Tuple
 import psycopg2.extensions
+from psycopg2.extras import execute_values
+from etl.src.run_journal import RunJournal
+from etl.src.dimension_cache import DimensionKeyCache
 
 logger = get_logger(__name__)
 """
@@ -55,7 +57,8 @@ def process_team(
     api_team_id: int,
     team_name: str,
     team_code: str,
-    country_id: int
+    country_id: int,
+    keys: Optional[DimensionKeyCache] = None
 ) -> None:
     """
     Upsert a single team into the dim_teams table.
@@ -64,78 +67,144 @@ def process_team(
     if not api_team_id or not team_name:
         logger.warning(f"Skipping team with missing id or name in league '{league_name}'")
         return
-    upsert_team(cur, api_team_id, team_name, team_code, country_id)
+    upsert_team(cur, api_team_id, team_name, team_code, country_id, keys)
 
-def process_season(
-    cur: psycopg2.extensions.cursor,
+def is_finished_season(season: Dict[str, Any]) -> bool:
+    """
+    Return True if the API marks the season as not current and its end date
+    has passed, meaning its team list can no longer change.
+    """
+    if season.get("current"):
+        return False
+    try:
+        return date.fromisoformat(season.get("end")) < date.today()
+    except (TypeError, ValueError):
+        return False
+
+def parse_season(
     league_name: str,
-    api_league_id: int,
-    league_id: int,
-    season: Dict[str, Any],
-    country_id: int
-) -> None:
+    season: Dict[str, Any]
+) -> Optional[Tuple[int, str, Optional[str], Optional[str]]]:
     """
-    Process one season for a league:
-    - Filters out seasons before MIN_SEASON_TRACKER or with invalid year.
-    - Constructs season_label, upserts into dim_league_seasons.
-    - Fetches teams for that season and processes each.
+    Validate one API season entry and derive its dimension fields.
+    Returns (season_year, season_label, start_date, end_date), or None for
+    seasons before MIN_SEASON_TRACKER or with an invalid year.
     """
     raw_year = season.get("year")
     try:
         season_year = int(raw_year)
     except (TypeError, ValueError):
         logger.warning(f"Invalid season year '{raw_year}' for league '{league_name}', skipping this season")
-        return
+        return None
     if season_year < MIN_SEASON_TRACKER:
         logger.info(f"Skipping season '{season_year}' for league '{league_name}'")
-        return
-
+        return None
     season_label = f"{season_year}/{str(season_year+1)[-2:]}"
-    start_date = season.get("start")
-    end_date = season.get("end")
-    upsert_league_season(cur, league_id, season_year, season_label, start_date, end_date)
+    return season_year, season_label, season.get("start"), season.get("end")
+
+def metadata_unit(country: str, league_name: str, season_year: Optional[int] = None) -> str:
+    """
+    Journal key for a league, or for one of its seasons when `season_year` is given.
+    """
+    unit = f"{country}/{league_name}"
+    return unit if season_year is None else f"{unit}/{season_year}"
 
-    teams = fetch_teams("teams", params={"league": api_league_id, "season": season_year})
+def process_season(
+    cur: psycopg2.extensions.cursor,
+    league_name: str,
+    api_league_id: int,
+    league_id: int,
+    season: Dict[str, Any],
+    country_id: int,
+    journal: Optional[RunJournal] = None,
+    country: Optional[str] = None,
+    keys: Optional[DimensionKeyCache] = None
+) -> bool:
+    """
+    Process one season for a league:
+    - Filters out seasons before MIN_SEASON_TRACKER or with invalid year.
+    - Skips seasons the journal already records as done.
+    - Constructs season_label, upserts into dim_league_seasons.
+    - Fetches teams for that season (cached forever once the season is finished)
+      and processes each.
+    - With a journal, commits the season and records it as done.
+    Returns False if the teams fetch failed; the season is then not journaled,
+    so a resumed run retries it.
+    """
+    parsed = parse_season(league_name, season)
+    if parsed is None:
+        return True
+    season_year, season_label, start_date, end_date = parsed
+    unit = metadata_unit(country, league_name, season_year)
+    if journal and journal.is_done(unit):
+        logger.info(f"Skipping journaled season {unit}")
+        return True
+    upsert_league_season(cur, league_id, season_year, season_label, start_date, end_date, keys)
+
+    ttl = cache_ttl("teams_past_season") if is_finished_season(season) else cache_ttl("teams")
+    try:
+        teams = fetch_teams("teams", params={"league": api_league_id, "season": season_year}, ttl=ttl, raise_on_failure=True)
+    except FetchFailed as e:
+        logger.error(f"Failed to fetch teams for {unit}; leaving it for a resumed run: {e}")
+        return False
     if not teams:
         logger.warning(f"No teams found for league '{league_name}' in season {season_year}")
-        return
     for team in teams:
-        process_team(cur, league_name, team.get("id"), team.get("name"), team.get("code"), country_id)
+        process_team(cur, league_name, team.get("id"), team.get("name"), team.get("code"), country_id, keys)
+    if journal:
+        cur.connection.commit()
+        journal.record(unit)
+    return True
 
 def process_league(
     cur: psycopg2.extensions.cursor,
     country: str,
     country_id: int,
     league_data: Dict[str, Any],
-    missing_league_ids: List[Dict[str, Any]]
+    missing_league_ids: List[Dict[str, Any]],
+    journal: Optional[RunJournal] = None,
+    keys: Optional[DimensionKeyCache] = None
 ) -> None:
     """
     Process one league for a country:
+    - Skips leagues the journal already records as done.
     - Fetches league details from API.
     - Upserts league metadata.
     - Iterates through seasons and processes each season.
     - Records missing leagues.
     """
     league_name = league_data["name"]
-    league_info_list = fetch_league_info("leagues", params={"country": country, "name": league_name})
+    if journal and journal.is_done(metadata_unit(country, league_name)):
+        logger.info(f"Skipping journaled league {metadata_unit(country, league_name)}")
+        return
+    league_info_list = fetch_league_info(
+        "leagues", params={"country": country, "name": league_name}, ttl=cache_ttl("leagues")
+    )
     if not league_info_list:
         logger.warning(f"No league info found for '{league_name}' in country '{country}'")
         missing_league_ids.append({"country": country, "league": league_name})
         return
     league_info = league_info_list[0]
     api_league_id = league_info.get("league", {}).get("id")
-    league_id = upsert_league(cur, country_id, league_name, api_league_id)
+    league_id = upsert_league(cur, country_id, league_name, api_league_id, keys)
     league_seasons = league_info.get("seasons", [])
     if not league_seasons:
         logger.warning(f"No seasons found for league '{league_name}' in country '{country}'")
-        return
+    complete = True
     for season in league_seasons:
-        process_season(cur, league_name, api_league_id, league_id, season, country_id)
+        complete &= process_season(cur, league_name, api_league_id, league_id, season, country_id, journal, country, keys)
+    if journal:
+        cur.connection.commit()
+        # A league with a failed season stays unjournaled so resume revisits it
+        if complete:
+            journal.record(metadata_unit(country, league_name))
 
 def process_country(
     cur: psycopg2.extensions.cursor,
     country_data: Dict[str, Any],
-    missing_league_ids: List[Dict[str, Any]]
+    missing_league_ids: List[Dict[str, Any]],
+    journal: Optional[RunJournal] = None,
+    keys: Optional[DimensionKeyCache] = None
 ) -> None:
     """
     Process one country entry from metadata:
@@ -143,19 +212,9 @@ def process_country(
     - Iterates through each league and processes it.
     """
     country = country_data["country"]
-    country_id = upsert_country(cur, country)
+    country_id = upsert_country(cur, country, keys)
     for league_data in country_data["leagues"]:
-        process_league(cur, country, country_id, league_data, missing_league_ids)
-
-
-# Load API configuration from config.py
-API_KEY = config.API['key']
-API_HOST = config.API['host']
-API_URL = config.API['url']
-HEADERS = {
-    'x-rapidapi-key': API_KEY,
-    'x-rapidapi-host': API_HOST
-}
+        process_league(cur, country, country_id, league_data, missing_league_ids, journal, keys)
 
 
 def load_yaml(file_path: str) -> Dict[str, Any]:
@@ -187,67 +246,17 @@ def load_yaml(file_path: str) -> Dict[str, Any]:
 #fetch the data of a league from a given country and league name
 
 
-# Unified rate-limited GET with retry/backoff and 429 handling
-def _rate_limited_get(
-    endpoint: str,
-    params: Dict[str, Any],
-    max_retries: int = 5
-) -> List[Dict[str, Any]]:
-    """
-    Perform an HTTP GET with automatic rate-limit handling:
-    - Honors daily and per-minute limit headers.
-    - Retries on HTTP 429 with Retry-After header.
-    - Uses exponential backoff on transient errors.
-    Returns list of JSON 'response' elements or empty list on failure.
-    """
-    backoff = 1
-    for attempt in range(1, max_retries + 1):
-        try:
-            response = requests.get(f"{API_URL}{endpoint}", headers=HEADERS, params=params, timeout=10)
-            # Enforce limits
-            daily_rem = int(response.headers.get('x-ratelimit-requests-remaining', 1))
-            min_rem   = int(response.headers.get('x-ratelimit-remaining', 1))
-            if daily_rem < 1:
-                # Sleep until next UTC day
-                utc_now = datetime.now(ZoneInfo("UTC"))
-                next_day = datetime.combine(utc_now.date() + timedelta(days=1), datetime.min.time(), tzinfo=ZoneInfo("UTC"))
-                sleep_sec = (next_day - utc_now).total_seconds()
-                logger.info(f"Daily rate limit reached, sleeping {sleep_sec}s")
-                time.sleep(sleep_sec)
-                continue
-            if min_rem < 1:
-                logger.info("Minute rate limit reached, sleeping 60s")
-                time.sleep(60)
-                continue
-
-            # Check for HTTP errors
-            if response.status_code == 429:
-                retry_after = int(response.headers.get('Retry-After', backoff))
-                logger.info(f"HTTP 429 received, sleeping {retry_after}s")
-                time.sleep(retry_after)
-                continue
-            response.raise_for_status()
-            return response.json().get("response", [])
-        except (HTTPError, ConnectionError, Timeout) as e:
-            logger.warning(f"Transient error on attempt {attempt}/{max_retries}: {e}. Retrying in {backoff}s")
-            time.sleep(backoff)
-            backoff = min(backoff * 2, 60)
-        except RequestException as e:
-            logger.error(f"Non-retryable request error: {e}")
-            break
-    logger.error(f"Failed to fetch {endpoint} after {max_retries} attempts with params: {params}")
-    return []
-
-
 def fetch_league_info(
     endpoint: str,
-    params: Dict[str, Any]
+    params: Dict[str, Any],
+    ttl: Optional[float] = 0
 ) -> List[Dict[str, Any]]:
     """
-    Retrieve league information from the API.
+    Retrieve league information from the API, served from the response cache
+    when an entry younger than `ttl` seconds exists (None = any age).
     Returns a list of league entries or an empty list.
     """
-    return _rate_limited_get(endpoint, params)
+    return cached_get(endpoint, params, ttl)
 
 
 # endpoint params => ListOfTeams
@@ -261,13 +270,17 @@ def fetch_league_info(
 
 def fetch_teams(
     endpoint: str,
-    params: Dict[str, Any]
+    params: Dict[str, Any],
+    ttl: Optional[float] = 0,
+    raise_on_failure: bool = False
 ) -> List[Dict[str, Any]]:
     """
-    Retrieve and transform team list from the API for a given league and season.
-    Returns a list of dicts with 'name', 'id', and 'code'.
+    Retrieve and transform team list from the API for a given league and season,
+    served from the response cache when an entry younger than `ttl` seconds exists.
+    Returns a list of dicts with 'name', 'id', and 'code'; with
+    `raise_on_failure`, a failed fetch raises FetchFailed instead of returning [].
     """
-    raw = _rate_limited_get(endpoint, params)
+    raw = cached_get(endpoint, params, ttl, raise_on_failure=raise_on_failure)
     # Transform into team dicts
     return [
         {"name": t.get("team", {}).get("name"), "id": t.get("team", {}).get("id"), "code": t.get("team", {}).get("code")}
@@ -280,12 +293,17 @@ def fetch_teams(
 
 def upsert_country(
     cur: psycopg2.extensions.cursor,
-    country_name: str
+    country_name: str,
+    keys: Optional[DimensionKeyCache] = None
 ) -> int:
     """
     Insert or update a country in dim_countries.
-    Returns the surrogate country_id.
+    Returns the surrogate country_id, from `keys` without a query when known.
     """
+    if keys:
+        country_id = keys.country_id(country_name)
+        if country_id is not None:
+            return country_id
     sql = """
     INSERT INTO dim.dim_countries (country_name)
     VALUES (%s)
@@ -295,11 +313,13 @@ def upsert_country(
     try:
         cur.execute(sql, (country_name,))
         result = cur.fetchone()
-        if result:
-            return result[0] # return the country id
-        cur.execute("SELECT country_id FROM dim.dim_countries WHERE country_name = %s", (country_name,))
-        logger.info(f"Upserted country: {country_name}")
-        return cur.fetchone()[0]  # Return the country_id
+        if not result:
+            cur.execute("SELECT country_id FROM dim.dim_countries WHERE country_name = %s", (country_name,))
+            logger.info(f"Upserted country: {country_name}")
+            result = cur.fetchone()
+        if keys:
+            keys.remember_country(country_name, result[0])
+        return result[0]  # Return the country_id
     except Exception as e:
         logger.error(f"Error upserting country '{country_name}': {e}")
         raise
@@ -314,12 +334,17 @@ def upsert_league(
     cur: psycopg2.extensions.cursor,
     country_id: int,
     league_name: str,
-    api_league_id: int
+    api_league_id: int,
+    keys: Optional[DimensionKeyCache] = None
 ) -> int:
     """
     Insert or update a league in dim_leagues.
-    Returns the surrogate league_id.
+    Returns the surrogate league_id, from `keys` without a query when unchanged.
     """
+    if keys:
+        league_id = keys.league_id(api_league_id, league_name, country_id)
+        if league_id is not None:
+            return league_id
     sql = """
     INSERT INTO dim.dim_leagues (country_id, league_name, api_league_id)
     VALUES (%s, %s, %s)
@@ -336,11 +361,13 @@ def upsert_league(
     try:
         cur.execute(sql, (country_id, league_name, api_league_id))
         result = cur.fetchone()
-        if result:
-            return result[0]  # return the league_id
-        cur.execute("SELECT league_id FROM dim.dim_leagues WHERE api_league_id = %s", (api_league_id,))
-        logger.info(f"Upserted league: {league_name} in country_id: {country_id}")
-        return cur.fetchone()[0]
+        if not result:
+            cur.execute("SELECT league_id FROM dim.dim_leagues WHERE api_league_id = %s", (api_league_id,))
+            logger.info(f"Upserted league: {league_name} in country_id: {country_id}")
+            result = cur.fetchone()
+        if keys:
+            keys.remember_league(api_league_id, result[0], league_name, country_id)
+        return result[0]  # return the league_id
     except Exception as e:
         logger.error(f"Error upserting league '{league_name}' in country_id '{country_id}': {e}")
         raise
@@ -354,11 +381,12 @@ def upsert_league_season(
     season: int,
     season_label: str,
     start_date: Optional[str],
-    end_date: Optional[str]
+    end_date: Optional[str],
+    keys: Optional[DimensionKeyCache] = None
 ) -> int:
     """
     Insert or update a season for a league in dim_league_seasons.
-    Returns the surrogate league_season_id.
+    Returns the surrogate league_season_id, from `keys` without a query when unchanged.
 
     Args:
         cur: psycopg2 cursor.
@@ -367,7 +395,12 @@ def upsert_league_season(
         season_label: String label (e.g., "2023/24").
         start_date: Optional season start date.
         end_date: Optional season end date.
+        keys: Optional preloaded dimension key cache.
     """
+    if keys:
+        league_season_id = keys.league_season_id(league_id, season, season_label, start_date, end_date)
+        if league_season_id is not None:
+            return league_season_id
     sql = """
     INSERT INTO dim.dim_league_seasons (league_id, season, season_label, start_date, end_date)
     VALUES (%s, %s, %s, %s, %s)
@@ -385,14 +418,15 @@ def upsert_league_season(
     try:
         cur.execute(sql, (league_id, season, season_label, start_date, end_date))
         fetch = cur.fetchone()
-        if fetch:
-            return fetch[0]
-       
-        cur.execute(
-            "SELECT league_season_id FROM dim.dim_league_seasons WHERE league_id = %s AND season = %s",
-            (league_id, season)
-        )
-        return cur.fetchone()[0]
+        if not fetch:
+            cur.execute(
+                "SELECT league_season_id FROM dim.dim_league_seasons WHERE league_id = %s AND season = %s",
+                (league_id, season)
+            )
+            fetch = cur.fetchone()
+        if keys:
+            keys.remember_league_season(league_id, season, fetch[0], season_label, start_date, end_date)
+        return fetch[0]
     except Exception as e:
         logger.error(f"Error upserting league season '{season_label}' for league_id '{league_id}': {e}")
         raise
@@ -403,12 +437,15 @@ def upsert_team(
     api_team_id: int,
     team_name: str,
     team_code: Optional[str],
-    country_id: int
+    country_id: int,
+    keys: Optional[DimensionKeyCache] = None
 ) -> None:
     """
     Insert or update a team in dim_teams.
-    Logs and skips if data is invalid.
+    Logs and skips if data is invalid; skips the query if `keys` shows it unchanged.
     """
+    if keys and keys.team_unchanged(api_team_id, team_name, team_code, country_id):
+        return
     sql = """
             INSERT INTO dim.dim_teams (api_team_id, team_name, team_code, country_id)
             VALUES (%s, %s, %s, %s)
@@ -424,21 +461,276 @@ def upsert_team(
             """
     try:
         cur.execute(sql, (api_team_id, team_name, team_code, country_id))
+        if keys:
+            keys.remember_team(api_team_id, team_name, team_code, country_id)
         logger.info(f"Upserted team: {team_name} with id: {api_team_id}")
     except Exception as e:
         logger.error(f"Error upserting team '{team_name}' with id '{api_team_id}': {e}")
         raise
 
 
-def extract_metadata() -> None:
+# ---------------------------------------------------------------------------
+# Staged mode: fetch everything first, then bulk-write in one short transaction
+# ---------------------------------------------------------------------------
+
+def new_metadata_stage() -> Dict[str, Dict[Any, Tuple]]:
+    """
+    Return an empty staging structure, one dict per dimension keyed by its
+    natural key so repeated API entries collapse to a single row.
+    """
+    return {"countries": {}, "leagues": {}, "league_seasons": {}, "teams": {}}
+
+
+def stage_league(
+    stage: Dict[str, Dict[Any, Tuple]],
+    country: str,
+    league_data: Dict[str, Any],
+    missing_league_ids: List[Dict[str, Any]],
+    journal: Optional[RunJournal] = None,
+    staged_units: Optional[List[str]] = None
+) -> None:
+    """
+    Fetch one league with its seasons and teams from the API into `stage`.
+    Mirrors process_league/process_season without touching the database.
+    Units skipped via `journal` are left out; staged ones are appended to `staged_units`.
+    """
+    staged_units = staged_units if staged_units is not None else []
+    league_name = league_data["name"]
+    if journal and journal.is_done(metadata_unit(country, league_name)):
+        logger.info(f"Skipping journaled league {metadata_unit(country, league_name)}")
+        return
+    league_info_list = fetch_league_info(
+        "leagues", params={"country": country, "name": league_name}, ttl=cache_ttl("leagues")
+    )
+    if not league_info_list:
+        logger.warning(f"No league info found for '{league_name}' in country '{country}'")
+        missing_league_ids.append({"country": country, "league": league_name})
+        return
+    league_info = league_info_list[0]
+    api_league_id = league_info.get("league", {}).get("id")
+    stage["leagues"][api_league_id] = (api_league_id, league_name, country)
+    league_seasons = league_info.get("seasons", [])
+    if not league_seasons:
+        logger.warning(f"No seasons found for league '{league_name}' in country '{country}'")
+    complete = True
+    for season in league_seasons:
+        parsed = parse_season(league_name, season)
+        if parsed is None:
+            continue
+        season_year, season_label, start_date, end_date = parsed
+        unit = metadata_unit(country, league_name, season_year)
+        if journal and journal.is_done(unit):
+            logger.info(f"Skipping journaled season {unit}")
+            continue
+        stage["league_seasons"][(api_league_id, season_year)] = (
+            api_league_id, season_year, season_label, start_date, end_date
+        )
+        ttl = cache_ttl("teams_past_season") if is_finished_season(season) else cache_ttl("teams")
+        try:
+            teams = fetch_teams("teams", params={"league": api_league_id, "season": season_year}, ttl=ttl, raise_on_failure=True)
+        except FetchFailed as e:
+            logger.error(f"Failed to fetch teams for {unit}; leaving it for a resumed run: {e}")
+            complete = False
+            continue
+        if not teams:
+            logger.warning(f"No teams found for league '{league_name}' in season {season_year}")
+        for team in teams:
+            if not team.get("id") or not team.get("name"):
+                logger.warning(f"Skipping team with missing id or name in league '{league_name}'")
+                continue
+            stage["teams"][team["id"]] = (team["id"], team["name"], team.get("code"), country)
+        staged_units.append(unit)
+    # A league with a failed season stays unjournaled so resume revisits it
+    if complete:
+        staged_units.append(metadata_unit(country, league_name))
+
+
+def collect_metadata(
+    metadata: Dict[str, Any],
+    missing_league_ids: List[Dict[str, Any]],
+    journal: Optional[RunJournal] = None,
+    staged_units: Optional[List[str]] = None
+) -> Dict[str, Dict[Any, Tuple]]:
+    """
+    Phase one of staged mode: fetch every country, league, season and team
+    described in metadata.yaml into memory. No database connection is held.
+    """
+    stage = new_metadata_stage()
+    for country_data in metadata["countries"]:
+        country = country_data["country"]
+        stage["countries"][country] = (country,)
+        for league_data in country_data["leagues"]:
+            stage_league(stage, country, league_data, missing_league_ids, journal, staged_units)
+    logger.info(
+        "Staged metadata: " + ", ".join(f"{len(rows)} {name}" for name, rows in stage.items())
+    )
+    return stage
+
+
+# Temp tables mirroring each dimension's natural-key columns
+STAGE_TABLES = {
+    "countries": "CREATE TEMP TABLE stage_countries (country_name TEXT) ON COMMIT DROP",
+    "leagues": (
+        "CREATE TEMP TABLE stage_leagues "
+        "(api_league_id INT, league_name TEXT, country_name TEXT) ON COMMIT DROP"
+    ),
+    "league_seasons": (
+        "CREATE TEMP TABLE stage_league_seasons "
+        "(api_league_id INT, season INT, season_label TEXT, start_date DATE, end_date DATE) ON COMMIT DROP"
+    ),
+    "teams": (
+        "CREATE TEMP TABLE stage_teams "
+        "(api_team_id INT, team_name TEXT, team_code TEXT, country_name TEXT) ON COMMIT DROP"
+    ),
+}
+
+# Set-based upserts from the temp tables. RETURNING (xmax = 0) is TRUE for
+# inserted rows and FALSE for updated ones; unchanged rows are not returned.
+STAGE_UPSERTS = {
+    "countries": """
+        INSERT INTO dim.dim_countries (country_name)
+        SELECT country_name FROM stage_countries
+        ON CONFLICT (country_name) DO NOTHING
+        RETURNING (xmax = 0) AS inserted;
+    """,
+    "leagues": """
+        INSERT INTO dim.dim_leagues (country_id, league_name, api_league_id)
+        SELECT c.country_id, s.league_name, s.api_league_id
+        FROM stage_leagues s
+        JOIN dim.dim_countries c ON c.country_name = s.country_name
+        ON CONFLICT (api_league_id) DO UPDATE
+        SET
+            league_name = EXCLUDED.league_name,
+            country_id = EXCLUDED.country_id,
+            updated_at = NOW()
+        WHERE
+            dim.dim_leagues.league_name IS DISTINCT FROM EXCLUDED.league_name
+            OR dim.dim_leagues.country_id IS DISTINCT FROM EXCLUDED.country_id
+        RETURNING (xmax = 0) AS inserted;
+    """,
+    "league_seasons": """
+        INSERT INTO dim.dim_league_seasons (league_id, season, season_label, start_date, end_date)
+        SELECT l.league_id, s.season, s.season_label, s.start_date, s.end_date
+        FROM stage_league_seasons s
+        JOIN dim.dim_leagues l ON l.api_league_id = s.api_league_id
+        ON CONFLICT (league_id, season) DO UPDATE
+        SET
+            season_label = EXCLUDED.season_label,
+            start_date = EXCLUDED.start_date,
+            end_date = EXCLUDED.end_date
+        WHERE
+            dim.dim_league_seasons.season_label IS DISTINCT FROM EXCLUDED.season_label
+            OR dim.dim_league_seasons.start_date IS DISTINCT FROM EXCLUDED.start_date
+            OR dim.dim_league_seasons.end_date IS DISTINCT FROM EXCLUDED.end_date
+        RETURNING (xmax = 0) AS inserted;
+    """,
+    "teams": """
+        INSERT INTO dim.dim_teams (api_team_id, team_name, team_code, country_id)
+        SELECT s.api_team_id, s.team_name, s.team_code, c.country_id
+        FROM stage_teams s
+        JOIN dim.dim_countries c ON c.country_name = s.country_name
+        ON CONFLICT (api_team_id) DO UPDATE
+        SET
+            team_name = EXCLUDED.team_name,
+            team_code = EXCLUDED.team_code,
+            country_id = EXCLUDED.country_id,
+            updated_at = NOW()
+        WHERE
+            dim.dim_teams.team_name IS DISTINCT FROM EXCLUDED.team_name
+            OR dim.dim_teams.team_code IS DISTINCT FROM EXCLUDED.team_code
+            OR dim.dim_teams.country_id IS DISTINCT FROM EXCLUDED.country_id
+        RETURNING (xmax = 0) AS inserted;
+    """,
+}
+
+# Staged rows whose foreign keys resolve, using the same joins as
+# STAGE_UPSERTS; the rest (e.g. a season whose league is missing) are dropped
+STAGE_RESOLVED = {
+    "countries": "SELECT count(*) FROM stage_countries;",
+    "leagues": """
+        SELECT count(*) FROM stage_leagues s
+        JOIN dim.dim_countries c ON c.country_name = s.country_name;
+    """,
+    "league_seasons": """
+        SELECT count(*) FROM stage_league_seasons s
+        JOIN dim.dim_leagues l ON l.api_league_id = s.api_league_id;
+    """,
+    "teams": """
+        SELECT count(*) FROM stage_teams s
+        JOIN dim.dim_countries c ON c.country_name = s.country_name;
+    """,
+}
+
+
+def bulk_load_metadata(
+    cur: psycopg2.extensions.cursor,
+    stage: Dict[str, Dict[Any, Tuple]],
+    page_size: int = 1000
+) -> Dict[str, Dict[str, int]]:
+    """
+    Phase two of staged mode: load each dimension into a temp table with
+    execute_values, then apply one set-based upsert per dimension.
+    Dimensions are loaded parent-first so foreign keys resolve by join.
+    Transaction commit/rollback is handled by the caller.
+
+    Returns a report of staged/inserted/updated/unchanged/skipped rows per
+    dimension; skipped rows had a parent that did not resolve and were not loaded.
+    """
+    report = {}
+    for name in ("countries", "leagues", "league_seasons", "teams"):
+        rows = list(stage[name].values())
+        start = time.time()
+        cur.execute(STAGE_TABLES[name])
+        if rows:
+            execute_values(cur, f"INSERT INTO stage_{name} VALUES %s", rows, page_size=page_size)
+        cur.execute(STAGE_UPSERTS[name])
+        results = cur.fetchall()
+        cur.execute(STAGE_RESOLVED[name])
+        resolved = cur.fetchone()[0]
+        inserted = sum(1 for (was_inserted,) in results if was_inserted)
+        updated = len(results) - inserted
+        report[name] = {
+            "staged": len(rows),
+            "inserted": inserted,
+            "updated": updated,
+            "unchanged": resolved - inserted - updated,
+            "skipped": len(rows) - resolved,
+        }
+        if report[name]["skipped"]:
+            logger.warning(f"{report[name]['skipped']} staged {name} rows skipped: parent row not found")
+        logger.info(f"Bulk-loaded {name} in {time.time() - start:.2f}s: {report[name]}")
+    return report
+
+
+def extract_metadata(
+    use_cache: bool = True,
+    refresh_cache: bool = False,
+    staged: bool = False,
+    resume: bool = False
+) -> None:
     """
     Main ETL entry point:
     - Loads metadata.yaml.
     - Processes countries, leagues, seasons, and teams.
-    - Commits all changes or rolls back on error.
+    - Commits and journals each season as it completes; an error only rolls
+      back the season in progress.
     - Logs any missing league entries.
+
+    Parameters
+    ----------
+    use_cache : bool, optional
+        Serve `leagues` and `teams` responses from the on-disk cache (default True).
+    refresh_cache : bool, optional
+        Ignore cached entries and overwrite them with fresh API responses.
+    staged : bool, optional
+        Fetch everything before opening a connection, then bulk-load all
+        dimensions in one short transaction (default False).
+    resume : bool, optional
+        Continue the previous run's journal, skipping leagues and seasons it
+        already completed (default False starts a fresh journal).
     """
     #params: metadata is a json file of each country, league and season
+    configure_response_cache(enabled=use_cache, refresh=refresh_cache)
 
     metadata = load_yaml(METADATA_FILE)
     if not metadata:
@@ -449,16 +741,28 @@ def extract_metadata() -> None:
 
     #list of country with and leagues with missing league id
     missing_league_ids = []
+    journal = RunJournal("extract_metadata", resume=resume, logger=logger)
+
+    if staged:
+        extract_metadata_staged(metadata, missing_league_ids, journal)
+        if use_cache:
+            logger.info(f"Response cache stats: {get_response_cache().stats()}")
+        if missing_league_ids:
+            logger.error("League missing IDs:\n" + pprint.pformat(missing_league_ids))
+        return
 
     conn = get_db_connection()
     try:
         cur = conn.cursor()
 
         try:
+            # Resolve unchanged dimension rows locally instead of per-row round trips
+            keys = DimensionKeyCache.load(cur)
             for country_data in metadata["countries"]:
-                process_country(cur, country_data, missing_league_ids)
+                process_country(cur, country_data, missing_league_ids, journal, keys)
+            logger.info(f"Dimension key cache stats: {keys.stats()}")
 
-            # Commit all changes to the database
+            # Commit anything not already committed per season
             conn.commit()
             logger.info("Metadata extraction and upsert completed successfully.")
         except Exception as e:
@@ -470,13 +774,80 @@ def extract_metadata() -> None:
         cur.close()
         conn.close()
         logger.info("Database connection closed.")
+        logger.info(f"Rate limiter state: {limiter.state()}")
+        if use_cache:
+            logger.info(f"Response cache stats: {get_response_cache().stats()}")
     #Report any missing items all at once
     if missing_league_ids:
         logger.error("League missing IDs:\n" + pprint.pformat(missing_league_ids))
 
 
+def extract_metadata_staged(
+    metadata: Dict[str, Any],
+    missing_league_ids: List[Dict[str, Any]],
+    journal: Optional[RunJournal] = None
+) -> Dict[str, Dict[str, int]]:
+    """
+    Run staged mode: collect all metadata from the API, then bulk-load it.
+    The database transaction only spans phase two; staged units are
+    journaled once it commits.
+    """
+    start_fetch = time.time()
+    staged_units = []
+    stage = collect_metadata(metadata, missing_league_ids, journal, staged_units)
+    logger.info(f"Metadata fetch phase finished in {time.time() - start_fetch:.2f}s")
+    logger.info(f"Rate limiter state: {limiter.state()}")
+
+    start_load = time.time()
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        report = bulk_load_metadata(cur, stage)
+        conn.commit()
+        if journal:
+            for unit in staged_units:
+                journal.record(unit)
+        logger.info(f"Metadata bulk load committed in {time.time() - start_load:.2f}s")
+        return report
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Error during metadata bulk load: {e}")
+        raise
+    finally:
+        cur.close()
+        conn.close()
+        logger.info("Database connection closed.")
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract countries, leagues, seasons and teams metadata.")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk API response cache entirely."
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Re-fetch every response from the API and overwrite the cache."
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Fetch all metadata first, then bulk-load dimensions in one short transaction."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip leagues and seasons the previous run already committed."
+    )
+    args = parser.parse_args()
     try:
-        extract_metadata()
+        extract_metadata(
+            use_cache=not args.no_cache,
+            refresh_cache=args.refresh_cache,
+            staged=args.staged,
+            resume=args.resume,
+        )
     except KeyboardInterrupt:
         logger.warning("Extraction cancelled by user")
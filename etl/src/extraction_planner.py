@@ -0,0 +1,314 @@
+"""
+Quota-aware extraction planner.
+- Collects the pending work: league-seasons whose fixtures are not bootstrapped
+  yet and fixture IDs still waiting for results.
+- Orders it by priority (result updates, then current seasons, then the leagues
+  in PRIORITY_LEAGUE_IDS, newest seasons first) and selects exactly as much as
+  the remaining daily API quota can pay for.
+- Persists a cursor so the next scheduled run resumes with the deferred work,
+  instead of a worker sleeping until the quota resets at UTC midnight.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import psycopg2
+
+import etl.src.config as config
+from etl.src.extract_fixtures import extract_fixtures
+from etl.src.extract_metadata import get_db_connection
+from etl.src.http_client import rate_limited_get, limiter, next_utc_midnight
+from etl.src.logger import get_logger
+from etl.src.update_fixtures import to_update_fixture_ids, update_by_ids, to_json, MAX_IDS_PER_CALL
+
+try:
+    from zoneinfo import ZoneInfo # Python 3.9+
+except ImportError:
+    from backports.zoneinfo import ZoneInfo # python < 3.9
+
+logger = get_logger(__name__, log_path=config.EXTRACT_FIXTURES_LOG)
+
+# Endpoint reporting the account's daily usage; it does not count against the quota
+STATUS_ENDPOINT = "status"
+
+
+def get_pending_league_seasons(
+    cur: psycopg2.extensions.cursor
+) -> List[Tuple[str, str, int, int, int, bool]]:
+    """
+    Fetch league-seasons whose fixtures are not bootstrapped yet.
+    Returns tuples shaped like `get_season_rows` plus an is_current flag:
+    (country_name, league_name, api_league_id, season_year, league_season_id, is_current).
+    """
+    cur.execute("""
+        SELECT
+          c.country_name,
+          l.league_name,
+          l.api_league_id,
+          EXTRACT(YEAR FROM ls.start_date)::int AS season_year,
+          ls.league_season_id,
+          COALESCE(NOW()::date BETWEEN ls.start_date AND ls.end_date, FALSE) AS is_current
+        FROM dim.dim_league_seasons ls
+        JOIN dim.dim_leagues l ON ls.league_id = l.league_id
+        JOIN dim.dim_countries c ON l.country_id = c.country_id
+        WHERE ls.fixtures_bootstrap_done = FALSE
+    """)
+    return cur.fetchall()
+
+
+def fetch_remaining_quota() -> int:
+    """
+    Return the number of API calls left today.
+    Uses the limiter's view when headers have already reported it, otherwise
+    asks the status endpoint, falling back to API_DAILY_QUOTA.
+    """
+    daily_remaining = limiter.state()["daily_remaining"]
+    if daily_remaining is not None:
+        return daily_remaining
+    status = rate_limited_get(STATUS_ENDPOINT, {})
+    requests_info = status.get("requests", {}) if isinstance(status, dict) else {}
+    try:
+        return max(0, int(requests_info["limit_day"]) - int(requests_info["current"]))
+    except (KeyError, TypeError, ValueError):
+        daily_remaining = limiter.state()["daily_remaining"]
+        if daily_remaining is not None:
+            return daily_remaining
+        logger.warning(f"Could not read the daily quota; assuming API_DAILY_QUOTA={config.API_DAILY_QUOTA}")
+        return config.API_DAILY_QUOTA
+
+
+def league_rank(api_league_id: int) -> int:
+    """
+    Position of a league in PRIORITY_LEAGUE_IDS; unlisted leagues rank last.
+    """
+    try:
+        return config.PRIORITY_LEAGUE_IDS.index(api_league_id)
+    except ValueError:
+        return len(config.PRIORITY_LEAGUE_IDS)
+
+
+def build_work_items(
+    season_rows: List[Tuple[str, str, int, int, int, bool]],
+    update_ids: List[str],
+    deferred_keys: Optional[Set[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Turn pending league-seasons and fixture IDs into prioritized work items.
+
+    Each item is a dict with `key`, `kind` ('update' or 'bootstrap'), `cost`
+    in API calls and a sortable `priority` tuple. Fixture IDs are grouped into
+    chunks of MAX_IDS_PER_CALL, one call each. Items deferred by the previous
+    run go ahead of new work within the same priority tier.
+    """
+    deferred_keys = deferred_keys or set()
+    items = []
+    for start in range(0, len(update_ids), MAX_IDS_PER_CALL):
+        chunk = update_ids[start:start + MAX_IDS_PER_CALL]
+        items.append({
+            "key": f"update:{chunk[0]}",
+            "kind": "update",
+            "cost": 1,
+            "priority": (0, 0, 0, 0, 0),
+            "ids": chunk,
+        })
+    for row in season_rows:
+        country_name, league_name, api_league_id, season_year, league_season_id, is_current = row
+        key = f"bootstrap:{league_season_id}"
+        items.append({
+            "key": key,
+            "kind": "bootstrap",
+            "cost": 1,
+            "priority": (
+                1,
+                0 if is_current else 1,
+                0 if key in deferred_keys else 1,
+                league_rank(api_league_id),
+                -(season_year or 0),
+            ),
+            "row": (country_name, league_name, api_league_id, season_year, league_season_id),
+        })
+    return items
+
+
+def plan_work(
+    items: List[Dict[str, Any]],
+    budget: int
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Pick the highest-priority items whose total cost fits in `budget`.
+    Returns (selected, deferred), both in priority order.
+    """
+    selected, deferred = [], []
+    remaining = budget
+    for item in sorted(items, key=lambda i: i["priority"]):
+        if item["cost"] <= remaining:
+            selected.append(item)
+            remaining -= item["cost"]
+        else:
+            deferred.append(item)
+    return selected, deferred
+
+
+def load_cursor(path: str = config.PLANNER_CURSOR_FILE) -> Dict[str, Any]:
+    """
+    Read the planner cursor, returning an empty cursor if missing or unreadable.
+    """
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable planner cursor {path}: {e}")
+        return {}
+
+
+def save_cursor(cursor: Dict[str, Any], path: str = config.PLANNER_CURSOR_FILE) -> None:
+    """
+    Write the planner cursor atomically.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cursor, f, indent=2)
+    os.replace(tmp_path, path)
+    logger.info(f"Planner cursor saved to {path}")
+
+
+def quota_paused_until(cursor: Dict[str, Any]) -> Optional[datetime]:
+    """
+    Return when the quota resets if the previous run exhausted it and that
+    time has not passed yet, otherwise None.
+    """
+    resume_after = cursor.get("resume_after")
+    if not resume_after:
+        return None
+    resume_at = datetime.fromisoformat(resume_after)
+    return resume_at if datetime.now(ZoneInfo("UTC")) < resume_at else None
+
+
+def run_planned_extraction(
+    include_bootstrap: bool = True,
+    include_updates: bool = True,
+    budget: Optional[int] = None,
+    max_workers: int = config.EXTRACT_MAX_WORKERS
+) -> Dict[str, int]:
+    """
+    Spend today's remaining API quota on the highest-priority pending work
+    and record what is left for the next scheduled run.
+
+    Parameters
+    ----------
+    include_bootstrap : bool, optional
+        Plan un-bootstrapped league-seasons (default True).
+    include_updates : bool, optional
+        Plan fixture IDs needing result updates (default True).
+    budget : int, optional
+        API calls to spend; defaults to the remaining daily quota.
+    max_workers : int, optional
+        Concurrency passed to `extract_fixtures`.
+
+    Returns
+    -------
+    dict
+        Counts of budget, planned, deferred and calls spent.
+    """
+    start_total = time.time()
+    summary = {"budget": 0, "planned": 0, "deferred": 0, "calls_spent": 0}
+    cursor = load_cursor()
+    paused_until = quota_paused_until(cursor)
+    if paused_until and budget is None:
+        logger.info(f"Daily quota exhausted by a previous run; nothing to do until {paused_until.isoformat()}")
+        return summary
+
+    budget_is_quota = budget is None
+    if budget_is_quota:
+        budget = fetch_remaining_quota()
+    summary["budget"] = budget
+    calls_before = limiter.state()["calls_made"]
+
+    season_rows = []
+    if include_bootstrap:
+        conn = get_db_connection()
+        cur = conn.cursor()
+        try:
+            season_rows = get_pending_league_seasons(cur)
+        finally:
+            cur.close()
+            conn.close()
+    update_ids = to_update_fixture_ids() if include_updates else []
+
+    items = build_work_items(season_rows, update_ids, set(cursor.get("deferred", [])))
+    selected, deferred = plan_work(items, budget)
+    summary["planned"] = len(selected)
+    summary["deferred"] = len(deferred)
+    logger.info(
+        f"Planned {len(selected)} of {len(items)} work items "
+        f"({sum(i['cost'] for i in selected)} calls) within a budget of {budget}; "
+        f"{len(deferred)} deferred"
+    )
+
+    # Both steps stop on their own when the quota runs out mid-run
+    selected_ids = [fid for item in selected if item["kind"] == "update" for fid in item["ids"]]
+    if selected_ids:
+        to_json(update_by_ids(selected_ids), None)
+    selected_rows = [item["row"] for item in selected if item["kind"] == "bootstrap"]
+    if selected_rows:
+        # Runs span days of quota, so always continue the fixtures journal
+        extract_fixtures(max_workers=max_workers, rows=selected_rows, resume=True)
+
+    summary["calls_spent"] = limiter.state()["calls_made"] - calls_before
+    daily_remaining = limiter.state()["daily_remaining"]
+    exhausted = (
+        (daily_remaining is not None and daily_remaining < 1)
+        or (budget_is_quota and summary["calls_spent"] >= budget)
+    )
+
+    # Whatever is still un-bootstrapped among the planned items carries over
+    still_pending = set()
+    if include_bootstrap:
+        conn = get_db_connection()
+        cur = conn.cursor()
+        try:
+            still_pending = {f"bootstrap:{row[4]}" for row in get_pending_league_seasons(cur)}
+        finally:
+            cur.close()
+            conn.close()
+    carried_over = [i["key"] for i in selected + deferred if i["kind"] == "bootstrap" and i["key"] in still_pending]
+
+    save_cursor({
+        "updated_at": datetime.now(ZoneInfo("UTC")).isoformat(),
+        "budget": budget,
+        "calls_spent": summary["calls_spent"],
+        "completed": [i["key"] for i in selected if i["kind"] == "bootstrap" and i["key"] not in still_pending],
+        "deferred": carried_over,
+        "resume_after": next_utc_midnight().isoformat() if exhausted else None,
+    })
+    logger.info(
+        f"Planned extraction finished in {time.time() - start_total:.2f}s: "
+        f"{summary['calls_spent']} calls spent of {budget}, {len(carried_over)} league-seasons carried over"
+    )
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spend the remaining daily API quota on the highest-priority work.")
+    parser.add_argument("--budget", type=int, default=None, help="API calls to spend (defaults to the remaining daily quota).")
+    parser.add_argument("--no-bootstrap", action="store_true", help="Do not plan un-bootstrapped league-seasons.")
+    parser.add_argument("--no-updates", action="store_true", help="Do not plan fixture result updates.")
+    parser.add_argument("--workers", type=int, default=config.EXTRACT_MAX_WORKERS, help="Concurrent league-season fetches.")
+    args = parser.parse_args()
+
+    logger.info("Invoking run_planned_extraction")
+    try:
+        run_planned_extraction(
+            include_bootstrap=not args.no_bootstrap,
+            include_updates=not args.no_updates,
+            budget=args.budget,
+            max_workers=args.workers,
+        )
+    except KeyboardInterrupt:
+        logger.warning("Keyboard interrupt received: shutting down planned extraction.")
@@ -0,0 +1,164 @@
+"""
+Columnar decoder for raw API fixture payloads.
+- Validates and flattens the API `response` array in one pass, appending
+  straight into one list per column instead of building a dict per fixture.
+- `decode_fixtures_table` turns the columns into a typed pyarrow Table, which
+  pandas, Parquet and the loaders consume without a JSON round trip.
+- Applies the same rules as `extract_fixtures.extract_fixtures_field`: a
+  fixture missing its fixture, teams, score or league section is skipped,
+  and so is a malformed one, so one bad record never fails a batch.
+- Used by the bronze archive replay. Extraction and updates still go through
+  `extract_fixtures_field`: they hand fixtures to the transform as JSON
+  (fixtures.json, FIXTURE_UPDATES_JSON), and decoding to columns only to
+  rebuild one dict per fixture for that hand-off is slower than building the
+  dicts directly. The columnar speedup needs an Arrow hand-off instead.
+"""
+from typing import Any, Dict, List, Set, Tuple
+
+import pyarrow as pa
+
+import etl.src.config as config
+from etl.src.logger import get_logger
+
+logger = get_logger(__name__, log_path=config.EXTRACT_FIXTURES_LOG)
+
+# Same columns, in the same order, as the dicts from extract_fixtures_field
+FIXTURE_SCHEMA = pa.schema([
+    ("api_fixture_id", pa.int64()),
+    ("api_league_id", pa.int32()),
+    ("season", pa.int32()),
+    ("kickoff_utc", pa.string()),
+    ("fixture_status", pa.string()),
+    ("home_team_id", pa.int32()),
+    ("home_team_name", pa.string()),
+    ("away_team_id", pa.int32()),
+    ("away_team_name", pa.string()),
+    ("home_team_halftime_goal", pa.int32()),
+    ("away_team_halftime_goal", pa.int32()),
+    ("home_team_fulltime_goal", pa.int32()),
+    ("away_team_fulltime_goal", pa.int32()),
+])
+FIXTURE_COLUMNS = FIXTURE_SCHEMA.names
+
+
+def _column_arrays(columns: Dict[str, List[Any]]) -> Tuple[List[pa.Array], Set[int]]:
+    """
+    Convert the columns to FIXTURE_SCHEMA arrays. Returns (arrays, set()) on
+    success, else ([], indexes of rows holding a value that does not fit its
+    type, e.g. a string id or an out-of-range goal count). Only a column that
+    fails to convert in bulk is checked value by value.
+    """
+    arrays = []
+    bad = set()
+    for field in FIXTURE_SCHEMA:
+        values = columns[field.name]
+        try:
+            arrays.append(pa.array(values, type=field.type))
+            continue
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        for i, value in enumerate(values):
+            try:
+                pa.scalar(value, type=field.type)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                bad.add(i)
+    return ([], bad) if bad else (arrays, bad)
+
+
+def _decode(fixtures: List[Dict[str, Any]]) -> Tuple[Dict[str, List[Any]], List[pa.Array], int]:
+    """
+    Shared body of decode_fixture_columns and decode_fixtures_table; also
+    returns the validated FIXTURE_SCHEMA arrays so the table is not
+    converted twice.
+    """
+    columns = {name: [] for name in FIXTURE_COLUMNS}
+    # Bound appends keep the per-fixture loop free of dict lookups
+    (
+        add_fixture_id, add_league_id, add_season, add_kickoff, add_status,
+        add_home_id, add_home_name, add_away_id, add_away_name,
+        add_home_ht, add_away_ht, add_home_ft, add_away_ft,
+    ) = (columns[name].append for name in FIXTURE_COLUMNS)
+    empty: Dict[str, Any] = {}
+    skipped = 0
+
+    for i, raw in enumerate(fixtures):
+        # Read every field before appending so a malformed record cannot
+        # leave the columns with different lengths
+        try:
+            fixture = raw.get("fixture")
+            teams = raw.get("teams")
+            score = raw.get("score")
+            league = raw.get("league")
+            if not (fixture and teams and score and league):
+                logger.warning(f"Skipping fixture at index {i}: missing fixture, teams, score or league")
+                skipped += 1
+                continue
+            home = teams.get("home") or empty
+            away = teams.get("away") or empty
+            halftime = score.get("halftime") or empty
+            fulltime = score.get("fulltime") or empty
+            fixture_id = fixture.get("id")
+            league_id = league.get("id")
+            season = league.get("season")
+            kickoff = fixture.get("date")
+            status = (fixture.get("status") or empty).get("short", "NS")
+            home_id = home.get("id")
+            home_name = home.get("name")
+            away_id = away.get("id")
+            away_name = away.get("name")
+            home_ht = halftime.get("home")
+            away_ht = halftime.get("away")
+            home_ft = fulltime.get("home")
+            away_ft = fulltime.get("away")
+        except AttributeError as e:
+            logger.warning(f"Skipping malformed fixture at index {i}: {e}")
+            skipped += 1
+            continue
+        add_fixture_id(fixture_id)
+        add_league_id(league_id)
+        add_season(season)
+        add_kickoff(kickoff)
+        add_status(status)
+        add_home_id(home_id)
+        add_home_name(home_name)
+        add_away_id(away_id)
+        add_away_name(away_name)
+        add_home_ht(home_ht)
+        add_away_ht(away_ht)
+        add_home_ft(home_ft)
+        add_away_ft(away_ft)
+
+    arrays, bad = _column_arrays(columns)
+    if bad:
+        ids = [columns["api_fixture_id"][i] for i in sorted(bad)]
+        logger.warning(f"Skipping {len(bad)} fixtures with mistyped values: ids {ids}")
+        for name, values in columns.items():
+            columns[name] = [value for i, value in enumerate(values) if i not in bad]
+        arrays, _ = _column_arrays(columns)
+        skipped += len(bad)
+    if skipped:
+        logger.info(f"Skipped {skipped} fixtures due to missing or malformed data")
+    return columns, arrays, skipped
+
+
+def decode_fixture_columns(fixtures: List[Dict[str, Any]]) -> Tuple[Dict[str, List[Any]], int]:
+    """
+    Flatten raw fixture payloads into column lists in a single pass.
+    Malformed records (a section that is not an object, a value that does not
+    fit FIXTURE_SCHEMA) are skipped with a warning instead of failing the batch.
+
+    Returns
+    -------
+    tuple
+        (columns keyed by FIXTURE_COLUMNS, number of fixtures skipped)
+    """
+    columns, _, skipped = _decode(fixtures)
+    return columns, skipped
+
+
+def decode_fixtures_table(fixtures: List[Dict[str, Any]]) -> pa.Table:
+    """
+    Decode raw fixture payloads into a pyarrow Table with FIXTURE_SCHEMA.
+    """
+    _, arrays, _ = _decode(fixtures)
+    return pa.table(arrays, schema=FIXTURE_SCHEMA)
@@ -0,0 +1,408 @@
+"""
+Shared HTTP client for the football API.
+- Every extractor and updater goes through `rate_limited_get`.
+- A single process-wide token bucket (`limiter`) paces requests evenly so the
+  per-minute quota is never exceeded, instead of reacting to exhaustion after
+  the fact.
+- The bucket is seeded from the `x-ratelimit-*` response headers and exposes
+  its state (tokens, next refill, calls made, daily budget) for logging.
+- All calls share one pooled keep-alive `requests.Session` negotiating gzip, so
+  the TCP/TLS handshake to the API host is paid once per connection, not per call.
+- `cached_get` serves slow-changing endpoints from the on-disk `ResponseCache`.
+- Every successful list response is appended to the bronze archive.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError, ConnectionError, Timeout, RequestException
+
+import etl.src.config as config
+from etl.src.bronze_archive import archive_response
+from etl.src.logger import get_logger
+from etl.src.response_cache import ResponseCache
+
+try:
+    from zoneinfo import ZoneInfo # Python 3.9+
+except ImportError:
+    from backports.zoneinfo import ZoneInfo # python < 3.9
+
+logger = get_logger(__name__, log_path=config.HTTP_CLIENT_LOG)
+
+# API connection parameters loaded from config.py.
+API_KEY = config.API['key']
+API_HOST = config.API['host']
+API_URL = config.API['url']
+HEADERS = {
+    'x-rapidapi-key': API_KEY,
+    'x-rapidapi-host': API_HOST
+}
+
+# Sent on every pooled request in addition to the RapidAPI credentials
+SESSION_HEADERS = {
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+# Rate-limit headers sent by RapidAPI
+MINUTE_LIMIT_HEADER = 'x-ratelimit-limit'
+MINUTE_REMAINING_HEADER = 'x-ratelimit-remaining'
+DAILY_LIMIT_HEADER = 'x-ratelimit-requests-limit'
+DAILY_REMAINING_HEADER = 'x-ratelimit-requests-remaining'
+
+
+def _header_int(headers: Any, name: str) -> Optional[int]:
+    """
+    Parse an integer header, returning None when absent or malformed.
+    """
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+def next_utc_midnight() -> datetime:
+    """
+    Return the start of the next UTC day, when the daily API quota resets.
+    """
+    utc_now = datetime.now(ZoneInfo("UTC"))
+    return datetime.combine(utc_now.date() + timedelta(days=1), datetime.min.time(), tzinfo=ZoneInfo("UTC"))
+
+
+class DailyQuotaExhausted(Exception):
+    """
+    Raised when the daily API quota is spent. Callers stop and leave the
+    remaining work for a later scheduled run instead of sleeping until midnight.
+    """
+
+
+class FetchFailed(RequestException):
+    """
+    Raised by `rate_limited_get(..., raise_on_failure=True)` when a request
+    still fails after its retries, or the API reports errors for the params.
+    """
+
+
+class RequestRejected(FetchFailed):
+    """
+    FetchFailed raised when the API rejects the request itself (an `errors`
+    payload or a 4xx other than 429): retrying the same params cannot succeed.
+    """
+
+
+class TokenBucketLimiter:
+    """
+    Thread-safe token bucket shared by every API caller in the process.
+
+    Tokens refill continuously at `per_minute / 60` per second up to `burst`.
+    Each request takes one token, so with a small burst requests are spread
+    evenly across the minute and the per-minute quota is never exceeded.
+    Response headers re-seed the refill rate from `x-ratelimit-limit` and clamp
+    the bucket to what the server reports as remaining, which keeps several
+    processes sharing one key from drifting apart.
+    """
+
+    def __init__(
+        self,
+        per_minute: float = config.API_RATE_LIMIT_PER_MINUTE,
+        burst: int = config.API_RATE_LIMIT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._sleep = sleep
+        self._capacity = float(max(1, burst))
+        self._rate = per_minute / 60.0
+        self._tokens = self._capacity
+        self._last_refill = clock()
+        self._calls_made = 0
+        self._slept_seconds = 0.0
+        self._minute_limit: Optional[int] = None
+        self._daily_limit: Optional[int] = None
+        self._daily_remaining: Optional[int] = None
+        self._daily_as_of = None
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+            self._last_refill = now
+
+    def acquire(self) -> None:
+        """
+        Take one token, blocking until one is available.
+        Raises DailyQuotaExhausted once the daily budget is known to be spent.
+        """
+        while True:
+            with self._lock:
+                if self._daily_as_of is not None and self._daily_as_of != datetime.now(ZoneInfo("UTC")).date():
+                    # The daily quota reset at UTC midnight since we last saw the headers
+                    self._daily_remaining = None
+                    self._daily_as_of = None
+                if self._daily_remaining is not None and self._daily_remaining < 1:
+                    raise DailyQuotaExhausted(
+                        f"Daily API quota exhausted; resets at {next_utc_midnight().isoformat()}"
+                    )
+                now = self._clock()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self._calls_made += 1
+                    if self._daily_remaining is not None:
+                        self._daily_remaining -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+                self._slept_seconds += wait
+            self._sleep(wait)
+
+    def update(self, headers: Any) -> None:
+        """
+        Seed and correct the bucket from a response's `x-ratelimit-*` headers.
+        """
+        minute_limit = _header_int(headers, MINUTE_LIMIT_HEADER)
+        minute_remaining = _header_int(headers, MINUTE_REMAINING_HEADER)
+        daily_limit = _header_int(headers, DAILY_LIMIT_HEADER)
+        daily_remaining = _header_int(headers, DAILY_REMAINING_HEADER)
+        with self._lock:
+            self._refill(self._clock())
+            if minute_limit and minute_limit != self._minute_limit:
+                self._minute_limit = minute_limit
+                self._rate = minute_limit / 60.0
+                logger.info(f"Rate limiter seeded at {minute_limit} requests/minute")
+            if minute_remaining is not None and minute_remaining < self._tokens:
+                self._tokens = float(max(0, minute_remaining))
+            if daily_limit is not None:
+                self._daily_limit = daily_limit
+            if daily_remaining is not None:
+                if self._daily_remaining is None:
+                    self._daily_remaining = daily_remaining
+                else:
+                    self._daily_remaining = min(self._daily_remaining, daily_remaining)
+                self._daily_as_of = datetime.now(ZoneInfo("UTC")).date()
+
+    def pause(self, seconds: float) -> None:
+        """
+        Drain the bucket so no caller proceeds for roughly `seconds`,
+        e.g. after an HTTP 429 with Retry-After.
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, 1 - seconds * self._rate)
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the limiter for logging and planning.
+        """
+        with self._lock:
+            self._refill(self._clock())
+            next_token_in = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self._rate
+            return {
+                "tokens": round(self._tokens, 3),
+                "capacity": self._capacity,
+                "rate_per_minute": round(self._rate * 60, 3),
+                "next_token_in": round(next_token_in, 3),
+                "calls_made": self._calls_made,
+                "slept_seconds": round(self._slept_seconds, 3),
+                "minute_limit": self._minute_limit,
+                "daily_limit": self._daily_limit,
+                "daily_remaining": self._daily_remaining,
+            }
+
+
+# Single quota budget shared by every thread in the process
+limiter = TokenBucketLimiter()
+
+
+def mount_pool(session: requests.Session, pool_size: int) -> None:
+    """
+    Mount an adapter with a connection pool of `pool_size` on `session`.
+    pool_block makes extra threads wait for a free connection instead of
+    opening throwaway ones that are discarded after a single request.
+    The previous adapter is not closed: requests already using it finish on
+    their connection, which is released when the adapter is garbage collected.
+    """
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size), pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def build_session(pool_size: int = config.HTTP_POOL_SIZE) -> requests.Session:
+    """
+    Create a keep-alive session with a connection pool of `pool_size`.
+    """
+    session = requests.Session()
+    mount_pool(session, pool_size)
+    session.headers.update(HEADERS)
+    session.headers.update(SESSION_HEADERS)
+    return session
+
+
+_session: Optional[requests.Session] = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size: Optional[int] = None) -> requests.Session:
+    """
+    Return the process-wide pooled session, creating it on first use.
+    Passing a `pool_size` larger than the current pool (e.g. the extractor's
+    worker count) mounts a larger pool on the same session so every worker
+    gets its own connection. The session is never closed or replaced, since
+    other threads may be sending requests on it.
+    """
+    global _session, _session_pool_size
+    wanted = pool_size or config.HTTP_POOL_SIZE
+    with _session_lock:
+        if _session is None:
+            _session = build_session(wanted)
+            _session_pool_size = wanted
+            logger.info(f"HTTP session created with pool size {wanted}")
+        elif wanted > _session_pool_size:
+            mount_pool(_session, wanted)
+            _session_pool_size = wanted
+            logger.info(f"HTTP session pool grown to {wanted}")
+        return _session
+
+
+# Unified rate-limited GET with retry/backoff and 429 handling
+def rate_limited_get(
+    endpoint: str,
+    params: Dict[str, Any],
+    max_retries: int = 5,
+    raise_on_failure: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Perform an HTTP GET paced by the shared token bucket:
+    - Reuses pooled keep-alive connections from `get_session()`.
+    - Takes one token from `limiter` before every attempt; DailyQuotaExhausted
+      propagates to the caller.
+    - Re-seeds the limiter from the response's limit headers.
+    - Retries on HTTP 429 with Retry-After header.
+    - Uses exponential backoff on transient errors (timeouts, connection
+      errors, 5xx); other 4xx responses are not retried.
+    Returns list of JSON 'response' elements or empty list on failure; with
+    `raise_on_failure`, failures raise FetchFailed so callers can tell them
+    apart from an empty result (RequestRejected when the API rejected the params).
+    """
+    backoff = 1
+    for attempt in range(1, max_retries + 1):
+        try:
+            limiter.acquire()
+            response = get_session().get(f"{API_URL}{endpoint}", params=params, timeout=10)
+            limiter.update(response.headers)
+
+            # Check for HTTP errors
+            if response.status_code == 429:
+                retry_after = _header_int(response.headers, 'Retry-After') or backoff
+                logger.info(f"HTTP 429 received, pausing limiter for {retry_after}s")
+                limiter.pause(retry_after)
+                continue
+            response.raise_for_status()
+
+            try:
+                payload = response.json()
+            except ValueError:
+                logger.error(f"Failed to parse JSON response on attempt {attempt}/{max_retries}")
+                if raise_on_failure:
+                    raise FetchFailed(f"Unparseable response from {endpoint} with params: {params}")
+                return []
+
+            if raise_on_failure and payload.get("errors"):
+                raise RequestRejected(f"API errors from {endpoint} with params {params}: {payload['errors']}")
+            records = payload.get("response", [])
+            if config.BRONZE_ENABLED and isinstance(records, list):
+                try:
+                    archive_response(endpoint, params, records)
+                except OSError as e:
+                    # Losing the raw copy must not fail the extraction itself
+                    logger.error(f"Failed to archive {endpoint} response: {e}")
+            return records
+
+        except HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status is not None and 400 <= status < 500:
+                logger.error(f"Request to {endpoint} rejected with HTTP {status}: {e}")
+                if raise_on_failure:
+                    raise RequestRejected(f"HTTP {status} from {endpoint} with params: {params}") from e
+                break
+            logger.warning(f"Transient error on attempt {attempt}/{max_retries}: {e}. Retrying in {backoff}s")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+        except (ConnectionError, Timeout) as e:
+            logger.warning(f"Transient error on attempt {attempt}/{max_retries}: {e}. Retrying in {backoff}s")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+        except FetchFailed:
+            raise
+        except RequestException as e:
+            logger.error(f"Non-retryable request error: {e}")
+            break
+    logger.error(f"Failed to fetch {endpoint} after {max_retries} attempts with params: {params}")
+    if raise_on_failure:
+        raise FetchFailed(f"Failed to fetch {endpoint} with params: {params}")
+    return []
+
+
+_response_cache: Optional[ResponseCache] = None
+_cache_enabled = config.RESPONSE_CACHE_ENABLED
+_cache_lock = threading.Lock()
+
+
+def configure_response_cache(enabled: bool = True, refresh: bool = False) -> None:
+    """
+    Turn the response cache on or off for this process, or put it in refresh
+    mode where every call goes to the API and overwrites the cached entry.
+    """
+    global _cache_enabled
+    _cache_enabled = enabled
+    if enabled:
+        get_response_cache().refresh = refresh
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Return the process-wide response cache, opening it on first use.
+    """
+    global _response_cache
+    with _cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(config.RESPONSE_CACHE_PATH)
+        return _response_cache
+
+
+def cache_ttl(name: str) -> Optional[float]:
+    """
+    Look up a configured TTL by name; negative values mean never expire.
+    """
+    ttl = config.RESPONSE_CACHE_TTLS[name]
+    return None if ttl < 0 else ttl
+
+
+def cached_get(
+    endpoint: str,
+    params: Dict[str, Any],
+    ttl: Optional[float],
+    raise_on_failure: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Return the cached response for `endpoint`/`params` if it is fresher than
+    `ttl` seconds (None = any age), otherwise fetch it with `rate_limited_get`
+    and cache non-empty results. Empty results are never cached because
+    `rate_limited_get` also returns [] on failure; with `raise_on_failure`
+    a failed fetch raises FetchFailed instead.
+    """
+    if not _cache_enabled:
+        return rate_limited_get(endpoint, params, raise_on_failure=raise_on_failure)
+    cache = get_response_cache()
+    cached = cache.get(endpoint, params, ttl)
+    if cached is not None:
+        logger.debug(f"Cache hit for {endpoint} {params}")
+        return cached
+    payload = rate_limited_get(endpoint, params, raise_on_failure=raise_on_failure)
+    if payload:
+        cache.put(endpoint, params, payload)
+    return payload
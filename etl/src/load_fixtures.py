@@ -1,16 +1,27 @@
 """
 Module to load cleaned fixtures data into the PostgreSQL `raw.raw_fixtures` table using psycopg2 bulk COPY.
-- Archives existing raw data to raw.raw_fixtures_archive
-- Truncates raw.raw_fixtures
-- Streams new data via COPY for high-performance bulk insert
+- LOAD_MODE=truncate: archives existing raw data to raw.raw_fixtures_archive,
+  truncates raw.raw_fixtures and loads it in place
+- LOAD_MODE=swap: loads a fresh raw.raw_fixtures_staging table, indexes and
+  analyzes it, then renames it into place in one short transaction; the
+  previous table becomes raw.raw_fixtures_archive and readers never see a
+  partial table
+- Streams new data via COPY for high-performance bulk insert: Parquet record
+  batches are encoded lazily (see copy_stream), as CSV or, with
+  LOAD_COPY_FORMAT=binary, binary COPY, so memory stays flat whatever the
+  dataset size
 """
 import os
+import re
 import time
 import etl.src.config as config
 from etl.src.logger import get_logger
-import pandas as pd
 import psycopg2
-from io import StringIO
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Any, Dict, List, Optional, Tuple
+from etl.src.cleaned_dataset import open_cleaned_dataset
+from etl.src.copy_stream import make_copy_stream, table_column_types
 
 logger = get_logger(__name__, log_path=config.LOAD_TO_DB_LOG)
 
@@ -19,51 +30,236 @@ SCHEMA = "raw"
 
 DB_CONFIG = config.DB_CONFIG
 
+# Bytes copy_expert asks the stream for per network write
+COPY_READ_SIZE = 1 << 20
+
+
+def staging_index_sql(indexdef: str, index_name: str, table: str) -> str:
+    """
+    Rewrite a pg_get_indexdef() statement to build the same index, named
+    `index_name`, on `table` (in SCHEMA).
+    """
+    sql, count = re.subn(
+        r"^(CREATE (?:UNIQUE )?INDEX )\S+( ON (?:ONLY )?)\S+",
+        lambda m: f"{m.group(1)}{index_name}{m.group(2)}{SCHEMA}.{table}",
+        indexdef,
+        count=1,
+    )
+    if not count:
+        raise ValueError(f"Unrecognized index definition: {indexdef}")
+    return sql
+
+
+def _table_indexes(cur, table: str) -> List[Tuple[str, str, Optional[str], Optional[str]]]:
+    """
+    Return (index name, definition, constraint name, constraint type) for
+    each index on SCHEMA.table; constraint fields are None for plain indexes.
+    """
+    cur.execute(
+        "SELECT i.relname, pg_get_indexdef(i.oid), c.conname, c.contype "
+        "FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid "
+        "LEFT JOIN pg_constraint c ON c.conindid = x.indexrelid AND c.conrelid = x.indrelid "
+        "WHERE x.indrelid = %s::regclass ORDER BY i.relname;",
+        (f"{SCHEMA}.{table}",)
+    )
+    return cur.fetchall()
+
+
+def _dependent_views(cur, table: str) -> List[Tuple[str, str]]:
+    """
+    Return (qualified name, definition) of views selecting from SCHEMA.table.
+    Views follow a table through renames, so these are re-pointed on swap.
+    """
+    cur.execute(
+        "SELECT DISTINCT v.oid::regclass::text, pg_get_viewdef(v.oid) "
+        "FROM pg_depend d JOIN pg_rewrite r ON r.oid = d.objid "
+        "JOIN pg_class v ON v.oid = r.ev_class "
+        "WHERE d.classid = 'pg_rewrite'::regclass AND d.refobjid = %s::regclass "
+        "AND v.relkind = 'v' ORDER BY 1;",
+        (f"{SCHEMA}.{table}",)
+    )
+    return cur.fetchall()
+
+
+def _owned_sequences(cur, table: str) -> List[Tuple[str, str, str]]:
+    """
+    Return (column, sequence, attidentity) for the serial and identity
+    columns of SCHEMA.table; attidentity is empty for serial columns.
+    """
+    cur.execute(
+        "SELECT attname, seq, attidentity FROM ("
+        "  SELECT a.attname, a.attidentity, a.attnum, "
+        "  pg_get_serial_sequence(%s, quote_ident(a.attname)) AS seq "
+        "  FROM pg_attribute a "
+        "  WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped"
+        ") c WHERE seq IS NOT NULL ORDER BY attnum;",
+        (f"{SCHEMA}.{table}", f"{SCHEMA}.{table}")
+    )
+    return cur.fetchall()
+
+
+def _create_staging(cur, table_name: str) -> str:
+    """
+    Create an empty SCHEMA.<table_name>_staging shaped like the target
+    (columns, defaults, checks), without indexes so COPY does not maintain
+    them row by row. Identity columns continue the target's numbering; serial
+    columns share its sequence already. Returns the staging table name.
+    """
+    staging = f"{table_name}_staging"
+    cur.execute(f"DROP TABLE IF EXISTS {SCHEMA}.{staging};")
+    cur.execute(
+        f"CREATE TABLE {SCHEMA}.{staging} "
+        f"(LIKE {SCHEMA}.{table_name} INCLUDING ALL EXCLUDING INDEXES);"
+    )
+    for column, sequence, identity in _owned_sequences(cur, table_name):
+        if identity:
+            # LIKE gives staging a new identity sequence that starts over
+            cur.execute("SELECT nextval(%s);", (sequence,))
+            cur.execute(
+                f"ALTER TABLE {SCHEMA}.{staging} ALTER COLUMN {column} "
+                f"RESTART WITH {cur.fetchone()[0]};"
+            )
+    return staging
+
+
+def _index_staging(cur, table_name: str, staging: str) -> List[Tuple[str, str]]:
+    """
+    Build the target's indexes (and primary key / unique constraints) on the
+    loaded staging table and analyze it. Returns (target index name, staging
+    index name) pairs for the swap.
+    """
+    names = []
+    for index_name, indexdef, constraint, contype in _table_indexes(cur, table_name):
+        staging_index = f"{index_name}_staging"
+        cur.execute(staging_index_sql(indexdef, staging_index, staging) + ";")
+        if contype in ("p", "u"):
+            kind = "PRIMARY KEY" if contype == "p" else "UNIQUE"
+            # USING INDEX renames the index to the constraint name
+            staging_index = f"{constraint}_staging"
+            cur.execute(
+                f"ALTER TABLE {SCHEMA}.{staging} ADD CONSTRAINT {staging_index} "
+                f"{kind} USING INDEX {index_name}_staging;"
+            )
+        names.append((index_name, staging_index))
+    cur.execute(f"ANALYZE {SCHEMA}.{staging};")
+    return names
+
+
+def _swap_in_staging(cur, table_name: str, staging: str, index_names: List[Tuple[str, str]]) -> None:
+    """
+    Within the current transaction, make the staging table the target and
+    the target the archive, renaming indexes to match and re-pointing views.
+    """
+    archive = f"{table_name}_archive"
+    cur.execute("SET LOCAL lock_timeout = %s;", (config.LOAD_SWAP_LOCK_TIMEOUT,))
+    views = _dependent_views(cur, table_name)
+    for column, sequence, identity in _owned_sequences(cur, table_name):
+        if not identity:
+            # Staging defaults use the target's serial sequence: hand it over
+            # so it is not dropped with the archive on the next swap
+            cur.execute(f"ALTER SEQUENCE {sequence} OWNED BY {SCHEMA}.{staging}.{column};")
+    cur.execute(f"DROP TABLE IF EXISTS {SCHEMA}.{archive};")
+    cur.execute(f"ALTER TABLE {SCHEMA}.{table_name} RENAME TO {archive};")
+    for index_name, _ in index_names:
+        cur.execute(f"ALTER INDEX {SCHEMA}.{index_name} RENAME TO {index_name}_archive;")
+    cur.execute(f"ALTER TABLE {SCHEMA}.{staging} RENAME TO {table_name};")
+    for index_name, staging_index in index_names:
+        cur.execute(f"ALTER INDEX {SCHEMA}.{staging_index} RENAME TO {index_name};")
+    for view, definition in views:
+        cur.execute(f"CREATE OR REPLACE VIEW {view} AS {definition}")
+
+
+def _copy_dataset(
+    cur,
+    dataset,
+    table: str,
+    columns: List[str],
+    filters: Optional[List[Any]],
+    column_types: Optional[Dict[str, str]]
+) -> int:
+    """
+    Stream the dataset into SCHEMA.table with COPY; returns the row count.
+    """
+    scanner = dataset.scanner(
+        columns=columns,
+        filter=pq.filters_to_expression(filters) if filters else None,
+        batch_size=config.LOAD_BATCH_ROWS,
+    )
+    stream, copy_options = make_copy_stream(scanner.to_batches(), scanner.projected_schema, column_types)
+    copy_sql = (
+        f"COPY {SCHEMA}.{table} ({', '.join(columns)}) "
+        f"FROM STDIN WITH {copy_options}"
+    )
+    with stream:
+        cur.copy_expert(copy_sql, stream, size=COPY_READ_SIZE)
+    return stream.rows
+
 
 def load_to_db(
     parquet_file: str,
-    table_name: str = "raw_fixtures"
+    table_name: str = "raw_fixtures",
+    filters: Optional[List[Any]] = None,
+    mode: Optional[str] = None
 ) -> None:
     """
-    Load cleaned fixtures from a Parquet file into a PostgreSQL table.
+    Load cleaned fixtures from a Parquet dataset into a PostgreSQL table.
 
     This function:
-    - Reads the specified Parquet file into a pandas DataFrame.
+    - Opens the specified cleaned dataset directory (or single Parquet file)
+      for scanning in LOAD_BATCH_ROWS record batches, optionally pruned by
+      `filters`.
     - Connects to Postgres via psycopg2 using DB_CONFIG.
     - Ensures the 'raw' schema exists.
-    - Archives existing data into raw.<table_name>_archive.
-    - Truncates the target table.
-    - Uses Postgres COPY to bulk-load the DataFrame.
+    - In "truncate" mode, archives existing data into
+      raw.<table_name>_archive and truncates the target table.
+    - In "swap" mode, creates an empty raw.<table_name>_staging table
+      shaped like the target instead.
+    - Uses Postgres COPY to bulk-load the batches, encoding them (CSV or
+      binary, per LOAD_COPY_FORMAT) on a background thread while earlier
+      ones are sent.
+    - In "swap" mode, builds the target's indexes on the staging table,
+      analyzes it and commits, then renames it into place (the old table
+      becoming the archive) in a second, short transaction. Privileges and
+      foreign keys referencing the target are not carried over.
 
     Parameters
     ----------
     parquet_file : str
-        Path to the Parquet file to load.
+        Path to the cleaned dataset directory or Parquet file to load.
     table_name : str, optional
         Name of the target table under the 'raw' schema (default: "raw_fixtures").
-    if_exists : str, optional
-        Placeholder parameter to match API; currently ignored (default: "append").
+    filters : list, optional
+        pyarrow DNF filters such as [("season", ">=", 2023)] or
+        kickoff_filters(start, end); partitions and row groups that cannot
+        match are not read.
+    mode : str, optional
+        "truncate" or "swap" (default: LOAD_MODE). A target that does not
+        exist yet is loaded directly in either mode.
 
     Raises
     ------
     ValueError
-        If `parquet_file` is None.
+        If `parquet_file` is None or `mode` is unknown.
     OSError
-        If reading or serializing the file fails.
+        If reading or encoding the dataset fails.
     psycopg2.Error
         If any database operation fails (connection, SQL execution, COPY).
     """
     start_time = time.time()
     if parquet_file is None:
         raise ValueError("parquet_file must be provided")
+    mode = (mode or config.LOAD_MODE).lower()
+    if mode not in ("truncate", "swap"):
+        raise ValueError(f"Unknown load mode: {mode}")
 
-    if not os.path.isfile(parquet_file):
+    if not os.path.exists(parquet_file):
         raise FileNotFoundError(f"Parquet file not found: {parquet_file}")
 
-    # 1) Read parquet with timing
-    start_parquet = time.time()
-    df = pd.read_parquet(parquet_file)
-    logger.info(f"Parquet file loaded in {time.time() - start_parquet:.2f}s")
+    # 1) Open the dataset; nothing is read until COPY pulls batches
+    dataset = open_cleaned_dataset(parquet_file)
+    columns = dataset.schema.names
+    column_types = None
+    staging = None
 
     # 2) Connect via psycopg2 and process within a transaction
     conn = psycopg2.connect(**DB_CONFIG)
@@ -72,7 +268,7 @@ def load_to_db(
         # 3a) Ensure schema exists
         cur.execute(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA};")
 
-        # 3b) Archive + truncate if table exists
+        # 3b) Prepare the table to COPY into if the target exists
         cur.execute(
             "SELECT EXISTS ("
             "  SELECT 1 FROM information_schema.tables "
@@ -82,31 +278,49 @@ def load_to_db(
         )
         exists = cur.fetchone()[0]
         if exists:
-            archive_table = f"{SCHEMA}.{table_name}_archive"
-            cur.execute(f"DROP TABLE IF EXISTS {archive_table};")
-            cur.execute(f"CREATE TABLE {archive_table} AS TABLE {SCHEMA}.{table_name};")
-            logger.info(f"Archived raw data to {archive_table}")
-            cur.execute(f"TRUNCATE TABLE {SCHEMA}.{table_name};")
-            logger.info(f"Truncated table {SCHEMA}.{table_name}")
+            # Only COPY columns the table has (e.g. path-derived country/league)
+            column_types = table_column_types(cur, SCHEMA, table_name)
+            table_columns = set(column_types)
+            dropped = [col for col in columns if col not in table_columns]
+            if dropped:
+                logger.info(f"Skipping columns not in {SCHEMA}.{table_name}: {dropped}")
+                columns = [col for col in columns if col in table_columns]
+            if mode == "swap":
+                staging = _create_staging(cur, table_name)
+                logger.info(f"Created staging table {SCHEMA}.{staging}")
+            else:
+                archive_table = f"{SCHEMA}.{table_name}_archive"
+                cur.execute(f"DROP TABLE IF EXISTS {archive_table};")
+                cur.execute(f"CREATE TABLE {archive_table} AS TABLE {SCHEMA}.{table_name};")
+                logger.info(f"Archived raw data to {archive_table}")
+                cur.execute(f"TRUNCATE TABLE {SCHEMA}.{table_name};")
+                logger.info(f"Truncated table {SCHEMA}.{table_name}")
         else:
             logger.info(f"Table {SCHEMA}.{table_name} does not exist, creating new")
 
-        # 3c) Bulk load via COPY with timing
-        buffer = StringIO()
-        df.to_csv(buffer, index=False, header=True)
-        buffer.seek(0)
-        columns = ', '.join(df.columns)
-        copy_sql = (
-            f"COPY {SCHEMA}.{table_name} ({columns}) "
-            "FROM STDIN WITH CSV HEADER"
-        )
+        # 3c) Bulk load via streamed COPY with timing
+        target = staging or table_name
         start_copy = time.time()
-        cur.copy_expert(copy_sql, buffer)
+        rows = _copy_dataset(cur, dataset, target, columns, filters, column_types)
+        logger.info(f"Loaded {rows} rows into {SCHEMA}.{target} via COPY in {time.time() - start_copy:.2f}s")
+
+        # 3d) Swap mode: index and analyze staging, then rename it into place
+        if staging:
+            start_index = time.time()
+            index_names = _index_staging(cur, table_name, staging)
+            conn.commit()
+            logger.info(f"Built {len(index_names)} indexes and analyzed {SCHEMA}.{staging} in {time.time() - start_index:.2f}s")
+            start_swap = time.time()
+            _swap_in_staging(cur, table_name, staging, index_names)
         conn.commit()
-        logger.info(f"Loaded {len(df)} rows into {SCHEMA}.{table_name} via COPY in {time.time() - start_copy:.2f}s")
+        if staging:
+            logger.info(
+                f"Swapped {SCHEMA}.{staging} in as {SCHEMA}.{table_name} in {time.time() - start_swap:.2f}s; "
+                f"previous table kept as {SCHEMA}.{table_name}_archive"
+            )
         total_elapsed = time.time() - start_time
         logger.info(f"Total load_to_db duration: {total_elapsed:.2f}s")
-    except (OSError, psycopg2.Error) as e:
+    except (OSError, psycopg2.Error, pa.ArrowException) as e:
         logger.error(f"Failed to load data into table '{table_name}': {e}", exc_info=True)
         conn.rollback()
         total_elapsed = time.time() - start_time
@@ -1,23 +1,27 @@
 """
 Module to apply processed fixture updates by merging transformed data back into the database.
-Reads the list of updated fixture IDs from a Parquet file and the latest
-cleaned Parquet to update all relevant columns in raw.raw_fixtures.
+Reads the list of updated fixture IDs from the latest update dataset and the
+latest cleaned dataset to update all relevant columns in raw.raw_fixtures.
+Both are Hive-partitioned Parquet datasets (see cleaned_dataset); reads are
+filtered by fixture id so unrelated partitions and row groups are skipped.
 """
 
 import os
 import time
 from typing import Any, Optional
-from io import StringIO
 
 import pandas as pd
 import psycopg2
+import pyarrow as pa
 from pathlib import Path
 from psycopg2 import sql
 import argparse
 
 from etl.src.config import CLEANED_DATA_DIR, LOAD_UPDATES_LOG, FIXTURES_UPDATE_DIR
 from etl.src.extract_metadata import get_db_connection
-from etl.src.transform_fixtures import write_outputs
+from etl.src.transform_fixtures import compact_dtypes, parse_kickoff, write_outputs
+from etl.src.cleaned_dataset import find_latest_output, read_cleaned_dataset
+from etl.src.copy_stream import make_copy_stream, table_column_types
 from etl.src.logger import get_logger
 
 logger = get_logger(__name__, log_path=LOAD_UPDATES_LOG)
@@ -44,17 +48,12 @@ def resolve_directory(mode: str) -> Path:
         raise FileNotFoundError(f"Directory for mode '{mode}' does not exist: {dir_path}")
     return dir_path
 
- # Find the latest file for a given mode and pattern
-def find_latest_file_for_mode(mode: str, pattern_template: str = "cleaned_fixtures_{mode}_*.parquet") -> Path:
+ # Find the latest cleaned output for a given mode
+def find_latest_file_for_mode(mode: str) -> Path:
     """
-    Find the most recent file in the directory for the given mode matching the pattern.
+    Find the most recent cleaned dataset (or legacy Parquet file) for the given mode.
     """
-    dir_path = resolve_directory(mode)
-    pattern = pattern_template.format(mode=mode)
-    files = list(dir_path.glob(pattern))
-    if not files:
-        raise FileNotFoundError(f"No files matching '{pattern}' in {dir_path}")
-    return max(files, key=lambda p: p.stat().st_mtime)
+    return find_latest_output(str(resolve_directory(mode)), mode)
 
  # Load the updates DataFrame with status and kickoff columns
 def load_updates_df(update_parquet: str) -> pd.DataFrame:
@@ -64,32 +63,36 @@ def load_updates_df(update_parquet: str) -> pd.DataFrame:
     Parameters
     ----------
     update_parquet : str
-        Path to the Parquet file containing updated fixtures.
+        Path to the dataset (or Parquet file) containing updated fixtures.
     
     Returns
     -------
     pd.DataFrame
         DataFrame with columns api_fixture_id, fixture_status, and kickoff_utc.
     """
-    df_updates: pd.DataFrame = pd.read_parquet(update_parquet, columns=[UPDATE_KEY, "fixture_status", "kickoff_utc"])
+    df_updates: pd.DataFrame = read_cleaned_dataset(update_parquet, columns=[UPDATE_KEY, "fixture_status", "kickoff_utc"])
     return df_updates
 
  # Load the base status DataFrame from the cleaned Parquet file
-def load_base_status_df(cleaned_parquet: str) -> pd.DataFrame:
+def load_base_status_df(cleaned_parquet: str, fixture_ids: Optional[list[int]] = None) -> pd.DataFrame:
     """
-    Load the base status DataFrame from the cleaned fixtures Parquet.
+    Load the base status DataFrame from the cleaned fixtures dataset.
     
     Parameters
     ----------
     cleaned_parquet : str
-        Path to the cleaned fixtures Parquet file.
+        Path to the cleaned fixtures dataset (or Parquet file).
+    fixture_ids : list[int], optional
+        Only read these fixtures; files and row groups whose id range
+        excludes them are skipped.
     
     Returns
     -------
     pd.DataFrame
         DataFrame with columns api_fixture_id, fixture_status, and kickoff_utc.
     """
-    return pd.read_parquet(cleaned_parquet, columns=[UPDATE_KEY, "fixture_status", "kickoff_utc"])
+    filters = [(UPDATE_KEY, "in", fixture_ids)] if fixture_ids is not None else None
+    return read_cleaned_dataset(cleaned_parquet, columns=[UPDATE_KEY, "fixture_status", "kickoff_utc"], filters=filters)
 
  # Get the list of fixture IDs that have changed (played or rescheduled)
 def get_changed_ids(df_base_status: pd.DataFrame, df_updates: pd.DataFrame) -> list[int]:
@@ -114,7 +117,11 @@ def get_changed_ids(df_base_status: pd.DataFrame, df_updates: pd.DataFrame) -> l
     played_ids = df_merged.loc[mask_played, UPDATE_KEY].tolist()
     logger.info('%d fixtures changed to FT', len(played_ids))
 
-    mask_rescheduled = df_merged["kickoff_utc_upd"] != df_merged["kickoff_utc_base"]
+    # Compare instants, not strings: outputs written before kickoffs were
+    # typed still hold ISO strings, whose formatting may differ
+    kickoff_upd = parse_kickoff(df_merged["kickoff_utc_upd"])
+    kickoff_base = parse_kickoff(df_merged["kickoff_utc_base"])
+    mask_rescheduled = (kickoff_upd != kickoff_base) & ~(kickoff_upd.isna() & kickoff_base.isna())
     rescheduled_ids = df_merged.loc[mask_rescheduled, UPDATE_KEY].tolist()
     logger.info('%d fixtures rescheduled', len(rescheduled_ids))
 
@@ -124,12 +131,12 @@ def get_changed_ids(df_base_status: pd.DataFrame, df_updates: pd.DataFrame) -> l
  # Load filtered updates DataFrame for the changed fixture IDs
 def load_filtered_updates(update_parquet: str, changed_ids: list[int]) -> pd.DataFrame:
     """
-    Load only the updated rows for the given fixture IDs from the update Parquet.
+    Load only the updated rows for the given fixture IDs from the update dataset.
     
     Parameters
     ----------
     update_parquet : str
-        Path to the Parquet file containing updated fixtures.
+        Path to the dataset (or Parquet file) containing updated fixtures.
     changed_ids : list[int]
         List of fixture IDs to load.
     
@@ -138,7 +145,7 @@ def load_filtered_updates(update_parquet: str, changed_ids: list[int]) -> pd.Dat
     pd.DataFrame
         DataFrame filtered to only the specified fixture IDs.
     """
-    return pd.read_parquet(update_parquet, filters=[(UPDATE_KEY, "in", changed_ids)])
+    return read_cleaned_dataset(update_parquet, filters=[(UPDATE_KEY, "in", changed_ids)])
 
 # -- Helper: fetch target table columns once ----------------------------------
 # Returns the list of column names for raw.raw_fixtures in physical order.
@@ -146,16 +153,7 @@ def load_filtered_updates(update_parquet: str, changed_ids: list[int]) -> pd.Dat
 # a temp table with only the columns we actually intend to update.
 
 def get_target_columns(cur) -> list[str]:
-    cur.execute(
-        """
-        SELECT column_name
-        FROM information_schema.columns
-        WHERE table_schema = %s AND table_name = %s
-        ORDER BY ordinal_position
-        """,
-        [SCHEMA, TABLE_NAME],
-    )
-    return [r[0] for r in cur.fetchall()]
+    return list(table_column_types(cur, SCHEMA, TABLE_NAME))
 
 def persist_updated_datasets(df_filtered: pd.DataFrame, cleaned_parquet: str) -> None:
     """
@@ -165,7 +163,7 @@ def persist_updated_datasets(df_filtered: pd.DataFrame, cleaned_parquet: str) ->
     try:
         start_persist = time.time()
         # Reload full dataset
-        df_full = pd.read_parquet(cleaned_parquet)
+        df_full = read_cleaned_dataset(cleaned_parquet)
         t_reload = time.time() - start_persist
         logger.info('Reloaded full dataset in %.2fs', t_reload)
 
@@ -173,6 +171,8 @@ def persist_updated_datasets(df_filtered: pd.DataFrame, cleaned_parquet: str) ->
         df_full = pd.concat([df_full, df_filtered]) \
                     .drop_duplicates(subset=UPDATE_KEY, keep='last') \
                     .reset_index(drop=True)
+        # Concatenating differing categoricals falls back to object; re-compact
+        df_full = compact_dtypes(df_full)
         t_merge = time.time() - start_persist - t_reload
         logger.info('Merged updated rows in %.2fs', t_merge)
 
@@ -240,8 +240,8 @@ def load_played_updates(
     # Load update DataFrame including status
     df_updates = load_updates_df(update_parquet)
 
-    # Load base status DataFrame
-    df_base_status = load_base_status_df(cleaned_parquet)
+    # Load base status DataFrame, only for the fixtures in the update
+    df_base_status = load_base_status_df(cleaned_parquet, df_updates[UPDATE_KEY].dropna().astype(int).tolist())
 
     # Get changed fixture IDs
     changed_ids = get_changed_ids(df_base_status, df_updates)
@@ -274,8 +274,10 @@ def load_played_updates(
             # through COPY + UPDATE steps.
             conn.autocommit = False
 
-            # Get all columns from the destination table and intersect with DF
-            tgt_cols = get_target_columns(cur)
+            # Get all columns (and their types, for binary COPY) from the
+            # destination table and intersect with DF
+            tgt_types = table_column_types(cur, SCHEMA, TABLE_NAME)
+            tgt_cols = list(tgt_types)
             df_cols = [c for c in df_filtered.columns if c in tgt_cols]
 
             if UPDATE_KEY not in df_cols:
@@ -310,7 +312,8 @@ def load_played_updates(
 
             # 3) COPY only the (key + update) columns into the temp table in chunks.
             ordered_cols = [UPDATE_KEY] + update_cols
-            copy_sql = sql.SQL("COPY {temp} ({cols}) FROM STDIN WITH CSV").format(
+            # WITH options (CSV or binary) come from make_copy_stream per chunk
+            copy_sql = sql.SQL("COPY {temp} ({cols}) FROM STDIN WITH ").format(
                 temp=sql.Identifier(temp_table),
                 cols=sql.SQL(", ").join(sql.Identifier(c) for c in ordered_cols),
             ).as_string(cur)
@@ -340,13 +343,12 @@ def load_played_updates(
             # Execute COPY + UPDATE per chunk
             for start in range(0, len(df_filtered), page_size):
                 chunk = df_filtered.loc[:, ordered_cols].iloc[start : start + page_size]
-                buf = StringIO()
-                # Write CSV without header for COPY
-                chunk.to_csv(buf, index=False, header=False)
-                buf.seek(0)
+                batch = pa.RecordBatch.from_pandas(chunk, preserve_index=False)
+                stream, copy_options = make_copy_stream([batch], batch.schema, tgt_types)
                 # NOTE: If autocommit were True or table created with ON COMMIT DROP,
                 # the temp table would vanish before COPY, causing UndefinedTable.
-                cur.copy_expert(copy_sql, buf)
+                with stream:
+                    cur.copy_expert(copy_sql + copy_options, stream)
                 cur.execute(update_sql)
                 conn.commit()
                 logger.info('Applied %d updates for chunk [%d:%d]', len(chunk), start, start + len(chunk))
@@ -0,0 +1,158 @@
+"""
+Kickoff-window poll scheduler for played-fixture updates.
+- A fixture becomes due POLL_FINISH_AFTER_MINUTES after its kickoff_utc, when
+  the match is likely finished.
+- If a poll does not bring a final result, the fixture is re-polled with
+  exponential backoff: starting at POLL_RETRY_MINUTES for matches running late
+  and at POLL_DEFERRED_BACKOFF_HOURS for postponed or suspended ones, capped at
+  POLL_MAX_BACKOFF_HOURS.
+- A rescheduled fixture (new kickoff after its last poll) starts over.
+- The per-fixture schedule lives in POLL_STATE_FILE between runs, so each run
+  polls only the minimal due set instead of sweeping every stale fixture.
+"""
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import etl.src.config as config
+from etl.src.logger import get_logger
+
+try:
+    from zoneinfo import ZoneInfo # Python 3.9+
+except ImportError:
+    from backports.zoneinfo import ZoneInfo # python < 3.9
+
+logger = get_logger(__name__, log_path=config.UPDATE_FIXTURES_LOG)
+
+# Statuses with a final result; the fixture leaves the schedule
+FINISHED_STATUSES = {"FT", "AET", "PEN", "AWD", "WO"}
+
+# Statuses where the match will not finish soon
+DEFERRED_STATUSES = {"PST", "SUSP", "INT", "CANC", "ABD", "TBD"}
+
+
+def _as_utc(value: Any) -> datetime:
+    """
+    Parse an ISO string or datetime into an aware UTC datetime.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=ZoneInfo("UTC"))
+    return value.astimezone(ZoneInfo("UTC"))
+
+
+def load_poll_state(path: str = config.POLL_STATE_FILE) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the poll schedule, returning an empty one if missing or unreadable.
+    """
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable poll state {path}: {e}")
+        return {}
+
+
+def save_poll_state(state: Dict[str, Dict[str, Any]], path: str = config.POLL_STATE_FILE) -> None:
+    """
+    Write the poll schedule atomically.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+    logger.info(f"Poll state for {len(state)} fixtures saved to {path}")
+
+
+def next_poll_at(kickoff_utc: Any, status: Optional[str], entry: Optional[Dict[str, Any]]) -> datetime:
+    """
+    When a pending fixture should next be polled.
+
+    Parameters
+    ----------
+    kickoff_utc : datetime or str
+        Scheduled kickoff.
+    status : str, optional
+        Latest known fixture_status short code.
+    entry : dict, optional
+        The fixture's poll state: attempts and last_polled_at.
+    """
+    kickoff = _as_utc(kickoff_utc)
+    first_poll = kickoff + timedelta(minutes=config.POLL_FINISH_AFTER_MINUTES)
+    if not entry or not entry.get("attempts"):
+        return first_poll
+    last_polled = _as_utc(entry["last_polled_at"])
+    if kickoff > last_polled:
+        # Rescheduled since the last poll
+        return first_poll
+    if (status or "").upper() in DEFERRED_STATUSES:
+        base = timedelta(hours=config.POLL_DEFERRED_BACKOFF_HOURS)
+    else:
+        base = timedelta(minutes=config.POLL_RETRY_MINUTES)
+    delay = min(base * 2 ** (entry["attempts"] - 1), timedelta(hours=config.POLL_MAX_BACKOFF_HOURS))
+    return max(first_poll, last_polled + delay)
+
+
+def select_poll_ids(
+    pending: List[Tuple[str, Any, Optional[str]]],
+    state: Dict[str, Dict[str, Any]],
+    now: Optional[datetime] = None
+) -> List[str]:
+    """
+    Return the ids from `pending` (api_fixture_id, kickoff_utc, fixture_status)
+    that are due at `now`. Entries for fixtures no longer pending are dropped
+    from `state`.
+    """
+    now = now or datetime.now(ZoneInfo("UTC"))
+    pending_ids = {str(fid) for fid, _, _ in pending}
+    for fid in list(state):
+        if fid not in pending_ids:
+            del state[fid]
+
+    due, waiting, deferred = [], 0, 0
+    for fid, kickoff_utc, status in pending:
+        fid = str(fid)
+        entry = state.get(fid)
+        current_status = (entry or {}).get("status") or status
+        if next_poll_at(kickoff_utc, current_status, entry) <= now:
+            due.append(fid)
+        elif (current_status or "").upper() in DEFERRED_STATUSES:
+            deferred += 1
+        else:
+            waiting += 1
+    logger.info(
+        f"Poll schedule: {len(due)} fixtures due, {waiting} waiting for the final whistle "
+        f"or a retry, {deferred} backed off as postponed/suspended"
+    )
+    return due
+
+
+def record_polls(
+    state: Dict[str, Dict[str, Any]],
+    polled_ids: List[str],
+    fixtures: List[Dict[str, Any]],
+    now: Optional[datetime] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Update `state` after polling `polled_ids`: finished fixtures leave the
+    schedule, the rest record another attempt with their latest status.
+    """
+    now = now or datetime.now(ZoneInfo("UTC"))
+    latest = {str(f.get("api_fixture_id")): f for f in fixtures}
+    for fid in polled_ids:
+        fixture = latest.get(fid, {})
+        status = fixture.get("fixture_status")
+        if status in FINISHED_STATUSES and fixture.get("home_team_fulltime_goal") is not None:
+            state.pop(fid, None)
+            continue
+        entry = state.setdefault(fid, {"attempts": 0})
+        entry["attempts"] += 1
+        entry["last_polled_at"] = now.isoformat()
+        if status:
+            entry["status"] = status
+    return state
@@ -0,0 +1,116 @@
+"""
+On-disk cache of API responses, stored in a local SQLite file.
+- Entries are content-addressed by endpoint and normalized params, so
+  {"league": 39, "season": 2023} and {"season": "2023", "league": "39"} share a key.
+- Payloads are stored as zlib-compressed JSON.
+- TTLs are chosen per call by the caller: None means the entry never expires
+  (e.g. teams of a finished season), a number of seconds bounds its age.
+- `refresh` skips reads but still writes, forcing a re-fetch of everything.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+import etl.src.config as config
+from etl.src.logger import get_logger
+
+logger = get_logger(__name__, log_path=config.HTTP_CLIENT_LOG)
+
+
+def cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """
+    Return a stable hash of the endpoint and its params.
+    Param names and values are stringified and sorted so ordering and
+    int/str differences do not produce separate entries.
+    """
+    normalized = {str(k): str(v) for k, v in (params or {}).items()}
+    raw = json.dumps({"endpoint": endpoint, "params": normalized}, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Thread-safe SQLite-backed cache of `response` payloads with hit/miss counters.
+    """
+
+    def __init__(
+        self,
+        path: str = config.RESPONSE_CACHE_PATH,
+        refresh: bool = False,
+        clock: Callable[[], float] = time.time,
+    ):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.refresh = refresh
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS api_responses (
+                cache_key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                params TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                payload BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def get(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        ttl: Optional[float]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the cached payload if present and younger than `ttl` seconds
+        (any age when `ttl` is None), otherwise None.
+        """
+        if self.refresh:
+            self.misses += 1
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, payload FROM api_responses WHERE cache_key = ?",
+                (cache_key(endpoint, params),)
+            ).fetchone()
+            if row is None or (ttl is not None and self._clock() - row[0] > ttl):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(zlib.decompress(row[1]))
+
+    def put(self, endpoint: str, params: Dict[str, Any], payload: List[Dict[str, Any]]) -> None:
+        """
+        Store or replace the payload for this endpoint and params.
+        """
+        blob = zlib.compress(json.dumps(payload).encode("utf-8"))
+        normalized = json.dumps({str(k): str(v) for k, v in (params or {}).items()}, sort_keys=True)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO api_responses (cache_key, endpoint, params, fetched_at, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (cache_key(endpoint, params), endpoint, normalized, self._clock(), blob)
+            )
+            self._conn.commit()
+            self.writes += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return hit/miss/write counters for this process.
+        """
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,110 @@
+"""
+Durable journal of completed work units for resumable bootstrap runs.
+- One append-only JSON-lines file per job under RUN_JOURNAL_DIR.
+- Each line records a unit key (e.g. a country/league/season or a
+  league-season id), its status and when it was reached; the last line for a
+  unit wins.
+- A fresh run truncates the journal; a resumed run reads it back so units
+  already finished are skipped instead of re-spending API calls.
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import etl.src.config as config
+from etl.src.logger import get_logger
+
+try:
+    from zoneinfo import ZoneInfo # Python 3.9+
+except ImportError:
+    from backports.zoneinfo import ZoneInfo # python < 3.9
+
+# Fallback for journals created without the owning job's logger
+default_logger = get_logger(__name__, log_path=config.EXTRACT_METADATA_LOG)
+
+# Statuses that mean a unit needs no further API calls
+DONE = "done"
+SAVED = "saved"
+FINISHED_STATUSES = {DONE, SAVED}
+
+
+class RunJournal:
+    """
+    Thread-safe, append-only record of unit statuses for one job. Messages
+    go to `logger`, normally the job's own, so they land in the job's log.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        resume: bool = False,
+        directory: Optional[str] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        self.logger = logger or default_logger
+        directory = directory or config.RUN_JOURNAL_DIR
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{name}.jsonl")
+        self.resume = resume
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if resume:
+            self._entries = self._read()
+            self.logger.info(f"Resuming {name} from {self.path}: {len(self._entries)} units journaled")
+        else:
+            open(self.path, "w").close()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        entries = {}
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A crash mid-write can leave a truncated last line
+                        continue
+                    entries[entry["unit"]] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def status(self, unit: str) -> Optional[str]:
+        """
+        Return the last recorded status of `unit`, or None if never recorded.
+        """
+        with self._lock:
+            entry = self._entries.get(unit)
+            return entry["status"] if entry else None
+
+    def is_done(self, unit: str) -> bool:
+        """
+        Return True if `unit` needs no more API calls.
+        """
+        return self.status(unit) in FINISHED_STATUSES
+
+    def record(self, unit: str, status: str = DONE, **details: Any) -> None:
+        """
+        Append a status line for `unit` and flush it to disk.
+        """
+        entry = {"unit": unit, "status": status, "at": datetime.now(ZoneInfo("UTC")).isoformat(), **details}
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._entries[unit] = entry
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Return the number of units per status.
+        """
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for entry in self._entries.values():
+                counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+            return counts
@@ -0,0 +1,280 @@
+"""
+Arrow execution backend for the fixtures transform.
+- Same stages as the pandas path in transform_fixtures (load, cast, results,
+  write), run on pyarrow instead: fixture files are decoded straight into
+  Arrow tables, the casts and result computation are one Acero projection
+  that is planned lazily and evaluated by the Arrow thread pool across
+  record batches (kickoffs outside the canonical format are reparsed
+  afterwards, on just those rows), and the table goes to the partitioned
+  dataset writer without a pandas round trip.
+- The pandas path stays the reference; parity tests check that both write
+  the same cleaned dataset (columns, values and compact types).
+- Selected with TRANSFORM_BACKEND=arrow or `transform_fixtures --backend arrow`.
+  The incremental full-mode cache and the memory report are pandas-only.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import pyarrow as pa
+import pyarrow.acero as acero
+import pyarrow.compute as pc
+
+import etl.src.config as config
+from etl.src.bronze_archive import load_archived_fixtures
+from etl.src.cleaned_dataset import write_cleaned_table
+from etl.src.fixture_decoder import FIXTURE_SCHEMA
+from etl.src.logger import get_logger
+from etl.src.transform_fixtures import (
+    CATEGORY_COLS,
+    COMPACT_INT_DTYPES,
+    KICKOFF_COL,
+    KICKOFF_DTYPE,
+    REQUIRED_COLS,
+    RESULT_COLS,
+    RESULT_DTYPE,
+    RESULT_STATUSES,
+    output_dataset_path,
+    read_fixture_files,
+)
+
+logger = get_logger(__name__, log_path=config.TRANSFORM_FIXTURES_LOG)
+
+# Arrow equivalents of the pandas compact dtypes
+ARROW_INT_TYPES = {
+    "api_fixture_id": pa.int64(),
+    **{col: pa.from_numpy_dtype(dtype.lower()) for col, dtype in COMPACT_INT_DTYPES.items()},
+}
+RESULT_LABELS = pa.array(RESULT_DTYPE.categories.tolist())
+ARROW_KICKOFF_TYPE = pa.timestamp(KICKOFF_DTYPE.unit, tz="UTC")
+# Extractor kickoffs are second-precision ISO-8601 with an offset or Z
+KICKOFF_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+# Rewrites other ISO-8601 kickoffs pandas accepts into KICKOFF_FORMAT plus an
+# optional fraction: date only, space separator, no offset (taken as UTC)
+KICKOFF_NORMALIZATIONS = [
+    (r"^(\d{4}-\d{2}-\d{2})$", r"\1T00:00:00"),
+    (r"^(\d{4}-\d{2}-\d{2}) ", r"\1T"),
+    (r"^([\d-]+T[\d:.]+)$", r"\1Z"),
+]
+KICKOFF_FRACTION = r"^[\d-]+T\d{2}:\d{2}:\d{2}\.(?P<fraction>\d{1,9})"
+# Raw kickoff strings carried through the projection for _reparse_kickoffs
+RAW_KICKOFF_COL = "__raw_kickoff_utc"
+
+
+def load_fixtures(is_update: bool, from_archive: bool = False, base_dir: Optional[str] = None) -> pa.Table:
+    """
+    Load fixtures for the given mode as an Arrow table (empty if none).
+    """
+    if is_update:
+        try:
+            with open(config.FIXTURE_UPDATES_JSON, "r") as f:
+                rows = json.load(f)
+        except FileNotFoundError:
+            logger.warning(f"No fixture update JSON found at {config.FIXTURE_UPDATES_JSON}")
+            return FIXTURE_SCHEMA.empty_table()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load update fixtures from {config.FIXTURE_UPDATES_JSON}: {e}")
+            return FIXTURE_SCHEMA.empty_table()
+        return pa.Table.from_pylist(rows, schema=FIXTURE_SCHEMA)
+    if from_archive:
+        return load_archived_fixtures()
+    json_file_paths = sorted(str(p) for p in Path(base_dir or config.FIXTURES_PATH).rglob("fixtures.json"))
+    tables = [table for _, table in read_fixture_files(json_file_paths)]
+    return pa.concat_tables(tables) if tables else FIXTURE_SCHEMA.empty_table()
+
+
+def _kickoff_expression(field_type: pa.DataType) -> pc.Expression:
+    """
+    Parse kickoff strings in KICKOFF_FORMAT to UTC timestamps; anything else
+    becomes null here and is retried by _reparse_kickoffs.
+    """
+    if pa.types.is_timestamp(field_type):
+        return pc.field(KICKOFF_COL).cast(ARROW_KICKOFF_TYPE)
+    return pc.strptime(pc.field(KICKOFF_COL), format=KICKOFF_FORMAT, unit=KICKOFF_DTYPE.unit, error_is_null=True)
+
+
+def _parse_other_kickoffs(values: pa.Array) -> pa.Array:
+    """
+    Parse kickoffs that are not in KICKOFF_FORMAT the way parse_kickoff does:
+    fractional seconds, a space separator, no offset (UTC) or no time at all.
+    Unparseable values become null.
+    """
+    for pattern, replacement in KICKOFF_NORMALIZATIONS:
+        values = pc.replace_substring_regex(values, pattern=pattern, replacement=replacement)
+    # strptime has no fractional-seconds directive: parse whole seconds and
+    # add the fraction back as nanoseconds
+    seconds = pc.strptime(
+        pc.replace_substring_regex(values, pattern=r"(T\d{2}:\d{2}:\d{2})\.\d+", replacement=r"\1"),
+        format=KICKOFF_FORMAT, unit="ns", error_is_null=True
+    )
+    fraction = pc.struct_field(pc.extract_regex(values, pattern=KICKOFF_FRACTION), [0])
+    nanos = pc.utf8_rpad(fraction, width=9, padding="0").cast(pa.int64()).cast(pa.duration("ns"))
+    return pc.add(seconds, pc.coalesce(nanos, pa.scalar(0, pa.duration("ns")))).cast(ARROW_KICKOFF_TYPE)
+
+
+def _reparse_kickoffs(table: pa.Table) -> pa.Table:
+    """
+    Retry the kickoffs _kickoff_expression left null with _parse_other_kickoffs,
+    on those rows only so canonical input costs a single strptime, then drop
+    RAW_KICKOFF_COL.
+    """
+    if RAW_KICKOFF_COL not in table.column_names:
+        return table
+    raw = table[RAW_KICKOFF_COL].combine_chunks()
+    parsed = table[KICKOFF_COL].combine_chunks()
+    table = table.drop_columns([RAW_KICKOFF_COL])
+    retry = pc.and_(pc.is_null(parsed), pc.is_valid(raw))
+    if not pc.any(retry).as_py():
+        return table
+    kickoffs = pc.replace_with_mask(parsed, retry, _parse_other_kickoffs(pc.filter(raw, retry)))
+    return table.set_column(table.schema.get_field_index(KICKOFF_COL), KICKOFF_COL, kickoffs)
+
+
+def _cast_expressions(schema: pa.Schema) -> Dict[str, pc.Expression]:
+    """
+    Projection that casts id, season and goal columns to their compact types,
+    parses the kickoff and passes every other column through.
+    """
+    expressions = {
+        name: pc.field(name).cast(ARROW_INT_TYPES[name]) if name in ARROW_INT_TYPES else pc.field(name)
+        for name in schema.names
+    }
+    if KICKOFF_COL in expressions:
+        field_type = schema.field(KICKOFF_COL).type
+        expressions[KICKOFF_COL] = _kickoff_expression(field_type)
+        if not pa.types.is_timestamp(field_type):
+            expressions[RAW_KICKOFF_COL] = pc.field(KICKOFF_COL)
+    return expressions
+
+
+def _result_expressions() -> Dict[str, pc.Expression]:
+    """
+    Projection producing RESULT_DTYPE codes (0 win, 1 draw, 2 loss) for each
+    result column; null when the fixture has no result.
+    """
+    status = pc.utf8_upper(pc.field("fixture_status").cast(pa.string()))
+    eligible = pc.is_in(status, value_set=pa.array(sorted(RESULT_STATUSES)))
+    no_result = pc.scalar(pa.scalar(None, pa.int8()))
+    expressions = {}
+    for half in ("fulltime", "halftime"):
+        # Null when either score is missing; int16 so int8 goals cannot overflow
+        sign = pc.sign(pc.subtract(
+            pc.field(f"home_team_{half}_goal").cast(pa.int16()),
+            pc.field(f"away_team_{half}_goal").cast(pa.int16()),
+        ))
+        expressions[f"home_{half}_result"] = pc.if_else(eligible, pc.subtract(pc.scalar(1), sign).cast(pa.int8()), no_result)
+        expressions[f"away_{half}_result"] = pc.if_else(eligible, pc.add(sign, pc.scalar(1)).cast(pa.int8()), no_result)
+    return expressions
+
+
+def _project(table: pa.Table, expressions: Dict[str, pc.Expression]) -> pa.Table:
+    # One chunk per fixture file (~380 rows) makes per-batch overhead dominate;
+    # the source node re-slices the combined table into large batches
+    plan = acero.Declaration.from_sequence([
+        acero.Declaration("table_source", acero.TableSourceNodeOptions(table.combine_chunks())),
+        acero.Declaration("project", acero.ProjectNodeOptions(list(expressions.values()), list(expressions))),
+    ])
+    return plan.to_table(use_threads=True)
+
+
+def _encode(table: pa.Table) -> pa.Table:
+    """
+    Turn result codes into win/draw/loss dictionary columns and dictionary-encode
+    the remaining CATEGORY_COLS.
+    """
+    for name in RESULT_COLS:
+        if name in table.column_names:
+            codes = table[name]
+            encoded = pa.chunked_array(
+                [pa.DictionaryArray.from_arrays(chunk, RESULT_LABELS) for chunk in codes.chunks],
+                type=pa.dictionary(pa.int8(), pa.string()),
+            )
+            table = table.set_column(table.schema.get_field_index(name), name, encoded)
+    for name in CATEGORY_COLS:
+        if name in table.column_names and not pa.types.is_dictionary(table.schema.field(name).type):
+            table = table.set_column(table.schema.get_field_index(name), name, pc.dictionary_encode(table[name]))
+    return table
+
+
+def cast_numeric_columns(table: pa.Table) -> pa.Table:
+    """
+    Cast ID, season and goal columns to their compact integer types and the
+    kickoff to a UTC timestamp.
+    """
+    return _reparse_kickoffs(_project(table, _cast_expressions(table.schema)))
+
+
+def compute_results(table: pa.Table) -> pa.Table:
+    """
+    Append fulltime and halftime results for FT, WO and AWD fixtures.
+    """
+    passthrough = {name: pc.field(name) for name in table.column_names}
+    return _encode(_project(table, {**passthrough, **_result_expressions()}))
+
+
+def clean_table(table: pa.Table) -> pa.Table:
+    """
+    Casts and results in a single projection, then dictionary encoding.
+    """
+    return _encode(_reparse_kickoffs(_project(table, {**_cast_expressions(table.schema), **_result_expressions()})))
+
+
+def write_outputs(table: pa.Table, is_update: bool) -> None:
+    """
+    Write the cleaned table as this run's partitioned dataset (plus a CSV copy
+    if CLEANED_CSV_ENABLED).
+    """
+    dataset_path = output_dataset_path(is_update)
+    try:
+        start_write = time.time()
+        if config.CLEANED_CSV_ENABLED:
+            csv_path = str(dataset_path) + '.csv'
+            table.to_pandas().to_csv(csv_path + '.tmp', index=False)
+            os.replace(csv_path + '.tmp', csv_path)
+            logger.info(f"Cleaned fixtures CSV written to {csv_path}")
+        write_cleaned_table(table, str(dataset_path))
+        logger.info(f"Cleaned fixtures dataset written to {dataset_path} in {time.time() - start_write:.2f}s")
+    except Exception as e:
+        logger.error(f"Failed to write outputs to {dataset_path.parent}: {e}", exc_info=True)
+
+
+def transform_fixtures_arrow(is_update: bool = False, from_archive: bool = False) -> int:
+    """
+    Arrow-backend transformation; same contract as transform_fixtures.
+
+    Returns
+    -------
+    int
+        Number of fixtures processed and transformed.
+    """
+    logger.info(f"Starting fixtures transformation on the Arrow backend ({pa.cpu_count()} threads)")
+    start_time = time.time()
+    try:
+        t0 = time.time()
+        table = load_fixtures(is_update, from_archive)
+        logger.info(f"Loaded {table.num_rows} fixtures in {time.time() - t0:.2f}s (mode={'update' if is_update else 'full'})")
+        if table.num_rows == 0:
+            logger.warning("No fixtures to transform; exiting.")
+            return 0
+        missing = set(REQUIRED_COLS) - set(table.column_names)
+        if missing:
+            logger.error(f"Missing required columns: {missing}")
+            return 0
+
+        t1 = time.time()
+        table = clean_table(table)
+        logger.debug(f"Casting and computing results took {time.time() - t1:.2f}s")
+        logger.info(f"Upcoming fixtures: {table['home_fulltime_result'].null_count}")
+
+        t2 = time.time()
+        write_outputs(table, is_update)
+        logger.debug(f"Writing outputs took {time.time() - t2:.2f}s")
+
+        logger.info(f"Transformation complete: {table.num_rows} rows processed in {time.time() - start_time:.2f}s")
+        return table.num_rows
+    except (ValueError, OSError, pa.ArrowException) as e:
+        logger.info(f"Transformation aborted after {time.time() - start_time:.2f} seconds due to error")
+        logger.error(f"Error during fixtures transformation: {e}", exc_info=True)
+        return 0
@@ -1,13 +1,22 @@
-from etl.src.config import TRANSFORM_FIXTURES_LOG, CLEANED_DATA_DIR, FIXTURES_UPDATE_DIR, FIXTURES_PATH, FIXTURE_UPDATES_JSON
+from etl.src.config import TRANSFORM_FIXTURES_LOG, CLEANED_DATA_DIR, FIXTURES_UPDATE_DIR, FIXTURES_PATH, FIXTURE_UPDATES_JSON, TRANSFORM_MAX_WORKERS, CLEANED_CSV_ENABLED, TRANSFORM_BACKEND, TRANSFORM_STREAMING
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.csv as pacsv
+import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from etl.src.logger import get_logger
 import time
-from typing import List
+from typing import List, Optional, Tuple
 from datetime import datetime
 import os
 import argparse
+from etl.src.bronze_archive import load_archived_fixtures
+from etl.src.fixture_decoder import FIXTURE_SCHEMA
+from etl.src.transform_manifest import TransformManifest
+from etl.src.cleaned_dataset import CleanedDatasetWriter, write_cleaned_dataset
 logger = get_logger(__name__, log_path=TRANSFORM_FIXTURES_LOG)
 
 REQUIRED_COLS = [
@@ -26,44 +35,92 @@ REQUIRED_COLS = [
             "away_team_fulltime_goal"
         ]
 
-def load_full_fixtures(base_dir: str = FIXTURES_PATH) -> pd.DataFrame:
+RESULT_COLS = ["home_fulltime_result", "away_fulltime_result", "home_halftime_result", "away_halftime_result"]
+RESULT_DTYPE = pd.CategoricalDtype(["win", "draw", "loss"])
+
+# Statuses whose score decides the result: normal full time, walkover, awarded
+RESULT_STATUSES = {"FT", "WO", "AWD"}
+
+# RESULT_DTYPE codes indexed by sign(home - away) + 1, i.e. [loss, draw, win] from each side
+HOME_CODE_BY_SIGN = np.array([2, 1, 0], dtype=np.int8)
+AWAY_CODE_BY_SIGN = np.array([0, 1, 2], dtype=np.int8)
+
+def _read_fixture_file(file_path: str) -> Tuple[str, Optional[pa.Table], Optional[str]]:
+    """
+    Read one country/league/season/fixtures.json file into an Arrow table.
+    Runs in a worker process; returns (path, table or None, error message).
+    """
+    try:
+        p = Path(file_path)
+        season, league, country = p.parent.name, p.parent.parent.name, p.parent.parent.parent.name
+        with open(file_path, "r") as f:
+            rows = json.load(f)
+        table = pa.Table.from_pylist(rows, schema=FIXTURE_SCHEMA)
+        # The season folder wins over the payload, as it always has
+        season_value = int(season) if season.isdigit() else None
+        table = table.set_column(
+            table.schema.get_field_index("season"), "season",
+            pa.array([season_value] * table.num_rows, type=pa.int32())
+        )
+        for name, value in (("country", country), ("league", league)):
+            # One-entry dictionary per file; chunks are unified on conversion
+            table = table.append_column(
+                pa.field(name, pa.dictionary(pa.int32(), pa.string())),
+                pa.DictionaryArray.from_arrays(pa.array([0] * table.num_rows, type=pa.int32()), pa.array([value]))
+            )
+        return file_path, table, None
+    except (OSError, ValueError, TypeError, pa.ArrowException) as e:
+        return file_path, None, str(e)
+
+
+def read_fixture_files(json_file_paths: List[str], max_workers: Optional[int] = None) -> List[Tuple[str, pa.Table]]:
+    """
+    Parse fixture files into Arrow tables in a process pool.
+    Returns (path, table) for every file that loaded; failures are logged.
+    """
+    if not json_file_paths:
+        return []
+    max_workers = max(1, min(max_workers or TRANSFORM_MAX_WORKERS, len(json_file_paths)))
+    if max_workers == 1:
+        results = list(map(_read_fixture_file, json_file_paths))
+    else:
+        chunksize = max(1, len(json_file_paths) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_read_fixture_file, json_file_paths, chunksize=chunksize))
+    loaded = []
+    for file_path, table, error in results:
+        if error:
+            logger.warning(f"Failed to load {file_path}: {error}")
+            continue
+        loaded.append((file_path, table))
+        logger.debug(f"Loaded {file_path} with {table.num_rows} fixtures")
+    return loaded
+
+
+def load_full_fixtures(base_dir: str = FIXTURES_PATH, max_workers: Optional[int] = None) -> pd.DataFrame:
     """
     Load and concatenate all fixtures.json files under `base_dir` (full fixtures).
+    Files are parsed in parallel worker processes straight into Arrow tables,
+    so load time scales with cores instead of file count. The country, league
+    and season taken from each file's path are kept, country and league as
+    categorical (dictionary-encoded) columns.
     Returns a DataFrame of all fixture records.
     """
     start_load = time.time()
-    #Hold the fixtures from different leagues as iterables
-    all_fixtures = []
-
     #Find all fixtures.json files in subfolders using Path.rglob
-    json_file_paths = [str(p) for p in Path(base_dir).rglob("fixtures.json")]
+    json_file_paths = sorted(str(p) for p in Path(base_dir).rglob("fixtures.json"))
     logger.debug(f"Found {len(json_file_paths)} fixture files in {base_dir}")
 
-    for file_path in json_file_paths:
-        try:
-            # Extract country, league, and season from the folder path
-            p = Path(file_path)
-            season = p.parent.name
-            league = p.parent.parent.name
-            country = p.parent.parent.parent.name
-            
-            # load fixture json to pandas 
-            df = pd.read_json(file_path)
-
-            df['season'] = season
-
-            all_fixtures.append(df)
-            logger.debug(f"Loaded {file_path} with {len(df)} fixtures")
-
-        except (OSError, ValueError) as e:
-            logger.warning(f"Failed to load {file_path}: {e}")
-    if not all_fixtures:
+    tables = [table for _, table in read_fixture_files(json_file_paths, max_workers)]
+
+    if not tables:
         logger.warning("No fixture files loaded in full mode")
         logger.info('load_full_fixtures took %.2fs (no files)', time.time() - start_load)
         return pd.DataFrame()
+    df = pa.concat_tables(tables).to_pandas()
     elapsed_load = time.time() - start_load
-    logger.info('load_full_fixtures took %.2fs', elapsed_load)
-    return pd.concat(all_fixtures, ignore_index=True)
+    logger.info('load_full_fixtures took %.2fs for %d files', elapsed_load, len(tables))
+    return df
 
 def load_updated_fixtures(update_json: str = FIXTURE_UPDATES_JSON) -> pd.DataFrame:
     """
@@ -194,29 +251,234 @@ def compute_game_results(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _result_status_mask(status: pd.Series) -> np.ndarray:
+    """
+    Boolean array of rows whose status (any case) is in RESULT_STATUSES.
+    Factorizes once so the upper-casing runs per distinct status, not per row.
+    """
+    codes, uniques = pd.factorize(status)
+    # Trailing False is picked up by code -1 (missing status)
+    eligible = np.array([str(u).upper() in RESULT_STATUSES for u in uniques] + [False])
+    return eligible[codes]
+
+
+def _half_results(df: pd.DataFrame, home_col: str, away_col: str, eligible: np.ndarray) -> tuple:
+    """
+    Home and away results for one half as RESULT_DTYPE categoricals, from the
+    goal-difference sign looked up in HOME/AWAY_CODE_BY_SIGN.
+    """
+    home, away = df[home_col], df[away_col]
+    valid = eligible & home.notna().to_numpy() & away.notna().to_numpy()
+    sign = np.sign(
+        home.to_numpy(dtype=np.int32, na_value=0) - away.to_numpy(dtype=np.int32, na_value=0)
+    ) + 1
+    home_codes = np.where(valid, HOME_CODE_BY_SIGN[sign], -1)
+    away_codes = np.where(valid, AWAY_CODE_BY_SIGN[sign], -1)
+    return (
+        pd.Categorical.from_codes(home_codes, dtype=RESULT_DTYPE),
+        pd.Categorical.from_codes(away_codes, dtype=RESULT_DTYPE),
+    )
+
+
 def compute_results(df: pd.DataFrame) -> pd.DataFrame:
     """
     Compute fulltime and halftime results, handling abandoned, walkover, and awarded fixtures.
+
+    One vectorized pass per half: FT, WO and AWD fixtures with both scores
+    get 'win'/'draw'/'loss' from the sign of the goal difference; all other
+    rows are missing. Results are RESULT_DTYPE categoricals. Matches
+    handle_special_results followed by compute_game_results, which are kept
+    as the reference implementation.
     """
-    # Initialize result columns to None
-    for col in [
-        "home_fulltime_result", "away_fulltime_result",
-        "home_halftime_result", "away_halftime_result"
-    ]:
-        df[col] = None
-    # Compute for walkover and awarded
-    df = handle_special_results(df)
-    # Compute for normal games
-    df = compute_game_results(df)
+    eligible = _result_status_mask(df["fixture_status"])
+    for half in ("fulltime", "halftime"):
+        home, away = _half_results(df, f"home_team_{half}_goal", f"away_team_{half}_goal", eligible)
+        df[f"home_{half}_result"] = home
+        df[f"away_{half}_result"] = away
     return df
 
-def load_fixtures(is_update: bool) -> pd.DataFrame:
+
+# Compact dtypes for the cleaned frame; Parquet stores categoricals as
+# dictionary-encoded columns and the small ints as int8/int16/int32.
+# Result columns already come out of compute_results as RESULT_DTYPE.
+CATEGORY_COLS = ["fixture_status", "home_team_name", "away_team_name", "country", "league"]
+COMPACT_INT_DTYPES = {
+    "api_league_id": "Int32",
+    "season": "Int16",
+    "home_team_id": "Int32",
+    "away_team_id": "Int32",
+    "home_team_halftime_goal": "Int8",
+    "away_team_halftime_goal": "Int8",
+    "home_team_fulltime_goal": "Int8",
+    "away_team_fulltime_goal": "Int8",
+}
+# Kickoffs are stored as UTC instants (Parquet TIMESTAMP, isAdjustedToUTC)
+KICKOFF_COL = "kickoff_utc"
+KICKOFF_DTYPE = pd.DatetimeTZDtype("ns", "UTC")
+
+
+def parse_kickoff(values: pd.Series) -> pd.Series:
+    """
+    Parse ISO-8601 kickoff strings (any offset) into KICKOFF_DTYPE;
+    unparseable values become NaT. Already-parsed series pass through.
+    """
+    if values.dtype == KICKOFF_DTYPE:
+        return values
+    return pd.to_datetime(values, utc=True, format="ISO8601", errors="coerce").astype(KICKOFF_DTYPE)
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a cleaned frame to compact dtypes: results as a fixed
+    win/draw/loss categorical, status and names as categoricals, goals,
+    ids and season as the smallest nullable ints that hold them, and the
+    kickoff as a UTC timestamp.
+    """
+    for col in RESULT_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype(RESULT_DTYPE)
+    for col in CATEGORY_COLS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    for col, dtype in COMPACT_INT_DTYPES.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+    if KICKOFF_COL in df.columns:
+        df[KICKOFF_COL] = parse_kickoff(df[KICKOFF_COL])
+    return df
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare the deep memory footprint of a compact cleaned frame with its
+    previous representation (object strings, Int64 numbers).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per column plus a TOTAL row: dtype and bytes before/after.
+    """
+    legacy = df.copy()
+    for col in legacy.columns:
+        dtype = legacy[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            legacy[col] = legacy[col].astype(object)
+        elif col in COMPACT_INT_DTYPES:
+            legacy[col] = legacy[col].astype("Int64")
+    before = legacy.memory_usage(deep=True, index=False)
+    after = df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "dtype_before": legacy.dtypes.astype(str),
+        "dtype_after": df.dtypes.astype(str),
+        "bytes_before": before,
+        "bytes_after": after,
+    })
+    report.loc["TOTAL"] = ["", "", before.sum(), after.sum()]
+    return report
+
+
+def log_memory_report(df: pd.DataFrame) -> None:
+    report = memory_report(df)
+    total_before, total_after = report.loc["TOTAL", ["bytes_before", "bytes_after"]]
+    logger.info(
+        f"Cleaned frame memory: {total_before / 1e6:.1f} MB before, {total_after / 1e6:.1f} MB after "
+        f"({total_before / max(total_after, 1):.1f}x smaller) for {len(df)} rows"
+    )
+    logger.info("Memory by column:\n%s", report.to_string())
+
+
+def clean_fixtures(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast numeric columns, compute results and compact dtypes: the per-row
+    part of the transform.
+    """
+    df = cast_numeric_columns(df)
+    df = compute_results(df)
+    return compact_dtypes(df)
+
+
+def transform_full_incremental(
+    base_dir: str = FIXTURES_PATH,
+    cache_dir: Optional[str] = None,
+    max_workers: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Full-mode transform that only re-transforms changed fixture files.
+
+    Each league-season file whose content hash matches the manifest is served
+    from its cached cleaned partition; new or changed files are read, cleaned
+    and cached. Files that disappeared (or no longer load) are dropped from
+    the cache, so the stitched result matches a from-scratch full run.
+
+    Returns
+    -------
+    pd.DataFrame
+        Cleaned fixtures for every source file (empty if none).
+    """
+    start = time.time()
+    manifest = TransformManifest(cache_dir)
+    base = Path(base_dir)
+    json_file_paths = sorted(str(p) for p in base.rglob("fixtures.json"))
+
+    current, changed = [], {}
+    for file_path in json_file_paths:
+        relative_path = Path(file_path).relative_to(base).as_posix()
+        try:
+            signature = manifest.signature(file_path, relative_path)
+        except OSError as e:
+            logger.warning(f"Failed to stat {file_path}: {e}")
+            continue
+        if manifest.is_current(relative_path, signature):
+            current.append(relative_path)
+        else:
+            changed[file_path] = (relative_path, signature)
+    logger.info(f"Incremental transform: {len(changed)} changed and {len(current)} unchanged fixture files")
+
+    tables, keep = [], set()
+    for file_path, table in read_fixture_files(list(changed), max_workers):
+        relative_path, signature = changed[file_path]
+        df = table.to_pandas()
+        if not validate_schema(df, REQUIRED_COLS):
+            continue
+        cleaned = pa.Table.from_pandas(clean_fixtures(df), preserve_index=False)
+        partition = manifest.partition_path(relative_path)
+        partition.parent.mkdir(parents=True, exist_ok=True)
+        tmp_partition = str(partition) + ".tmp"
+        pq.write_table(cleaned, tmp_partition)
+        os.replace(tmp_partition, partition)
+        manifest.record(relative_path, signature, cleaned.num_rows)
+        tables.append(cleaned)
+        keep.add(relative_path)
+
+    for relative_path in current:
+        try:
+            tables.append(pq.read_table(manifest.partition_path(relative_path)))
+            keep.add(relative_path)
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"Dropping unreadable cached partition for {relative_path}: {e}")
+
+    removed = manifest.prune(keep)
+    if removed:
+        logger.info(f"Removed {removed} stale partitions from the transform cache")
+    manifest.save()
+
+    logger.info('transform_full_incremental took %.2fs', time.time() - start)
+    if not tables:
+        return pd.DataFrame()
+    # Categories come back in dictionary order; re-apply the fixed dtypes
+    return compact_dtypes(pa.concat_tables(tables, promote_options="default").to_pandas())
+
+
+def load_fixtures(is_update: bool, from_archive: bool = False) -> pd.DataFrame:
     """
     Load fixtures based on mode.
     Parameters
     ----------
     is_update : bool
         If True, load updated fixtures; otherwise load all fixtures.
+    from_archive : bool, optional
+        In full mode, rebuild from the bronze archive of raw API responses
+        instead of the extracted fixtures.json files.
     Returns
     -------
     pd.DataFrame
@@ -227,6 +489,11 @@ def load_fixtures(is_update: bool) -> pd.DataFrame:
         df_fixtures = load_updated_fixtures()
         logger.info(f"Loaded {len(df_fixtures)} fixtures for update")
         return df_fixtures
+    elif from_archive:
+        logger.info("Running fixtures transformation in full mode from the bronze archive")
+        df_fixtures = load_archived_fixtures().to_pandas()
+        logger.info(f"Loaded {len(df_fixtures)} fixtures from the bronze archive")
+        return df_fixtures
     else:
         logger.info("Running fixtures transformation in full mode")
         df_fixtures = load_full_fixtures()
@@ -258,87 +525,191 @@ def log_upcoming_stats(df: pd.DataFrame) -> None:
     upcoming_count = df["home_fulltime_result"].isna().sum()
     logger.info(f"Upcoming fixtures: {upcoming_count}")
 
-def write_outputs(df: pd.DataFrame, is_update: bool) -> None:
+def output_dataset_path(is_update: bool) -> Path:
     """
-    Write cleaned fixtures to the appropriate directory with dynamic filenames.
+    Return the timestamped dataset path for this run's cleaned output,
+    creating the output directory if needed.
     """
     # Determine output directory
     out_dir = Path(select_output_dir(is_update))
     logger.debug(f'Debug: writing outputs to directory {out_dir}')
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Build dynamic filenames based on mode and timestamp
+    # Build dynamic names based on mode and timestamp
     mode = 'update' if is_update else 'full'
     ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-    csv_filename = f'cleaned_fixtures_{mode}_{ts}.csv'
-    parquet_filename = f'cleaned_fixtures_{mode}_{ts}.parquet'
+    return out_dir / f'cleaned_fixtures_{mode}_{ts}'
+
 
-    csv_path = out_dir / csv_filename
-    parquet_path = out_dir / parquet_filename
+def write_outputs(df: pd.DataFrame, is_update: bool) -> None:
+    """
+    Write cleaned fixtures to the appropriate directory as a timestamped,
+    Hive-partitioned Parquet dataset (plus a CSV copy if CLEANED_CSV_ENABLED).
+    """
+    dataset_path = output_dataset_path(is_update)
+    out_dir = dataset_path.parent
+    csv_path = dataset_path.with_name(dataset_path.name + '.csv')
 
     try:
         start_write = time.time()
-        # Atomic CSV write
-        tmp_csv = str(csv_path) + '.tmp'
-        df.to_csv(tmp_csv, index=False)
-        os.replace(tmp_csv, str(csv_path))
-        logger.info('Cleaned fixtures CSV written to %s', csv_path)
-
-        # Atomic Parquet write
-        tmp_parquet = str(parquet_path) + '.tmp'
-        df.to_parquet(tmp_parquet, index=False)
-        os.replace(tmp_parquet, str(parquet_path))
-        logger.info('Cleaned fixtures Parquet written to %s', parquet_path)
+        if CLEANED_CSV_ENABLED:
+            # Atomic CSV write
+            tmp_csv = str(csv_path) + '.tmp'
+            df.to_csv(tmp_csv, index=False)
+            os.replace(tmp_csv, str(csv_path))
+            logger.info('Cleaned fixtures CSV written to %s', csv_path)
+
+        # Partitioned dataset, renamed into place once complete
+        write_cleaned_dataset(df, str(dataset_path))
+        logger.info('Cleaned fixtures dataset written to %s', dataset_path)
         elapsed_write = time.time() - start_write
         logger.info('write_outputs total duration: %.2fs', elapsed_write)
     except Exception as e:
         logger.error('Failed to write outputs to %s: %s', out_dir, e, exc_info=True)
 
 
-def transform_fixtures(is_update: bool = False) -> int:
+def transform_full_streaming(base_dir: str = FIXTURES_PATH) -> int:
+    """
+    Full-mode transform that holds one league-season file in memory at a time.
+
+    Each fixtures.json is read, cleaned and appended to this run's dataset
+    (as its own country/league/season partition) and, if CLEANED_CSV_ENABLED,
+    to a streaming CSV before the next file is read, so peak memory is
+    bounded by the largest file rather than the whole history.
+
+    Returns
+    -------
+    int
+        Number of fixtures written.
+    """
+    json_file_paths = sorted(str(p) for p in Path(base_dir).rglob("fixtures.json"))
+    logger.info(f"Streaming transform over {len(json_file_paths)} fixture files")
+    dataset_path = output_dataset_path(is_update=False)
+    csv_path = str(dataset_path) + '.csv'
+    writer = CleanedDatasetWriter(str(dataset_path))
+    csv_writer, csv_schema = None, None
+    upcoming = 0
+    try:
+        for file_path in json_file_paths:
+            _, table, error = _read_fixture_file(file_path)
+            if error:
+                logger.warning(f"Failed to load {file_path}: {error}")
+                continue
+            if table.num_rows == 0:
+                continue
+            df = table.to_pandas()
+            if not validate_schema(df, REQUIRED_COLS):
+                continue
+            cleaned = pa.Table.from_pandas(clean_fixtures(df), preserve_index=False)
+            writer.write(cleaned)
+            if CLEANED_CSV_ENABLED:
+                if csv_writer is None:
+                    csv_schema = cleaned.schema.remove_metadata()
+                    csv_writer = pacsv.CSVWriter(csv_path + '.tmp', csv_schema)
+                csv_writer.write_table(cleaned.cast(csv_schema))
+            upcoming += cleaned["home_fulltime_result"].null_count
+            logger.debug(f"Streamed {cleaned.num_rows} fixtures from {file_path}")
+    except Exception:
+        writer.abort()
+        if csv_writer is not None:
+            csv_writer.close()
+            os.remove(csv_path + '.tmp')
+        raise
+
+    if csv_writer is not None:
+        csv_writer.close()
+        os.replace(csv_path + '.tmp', csv_path)
+        logger.info('Cleaned fixtures CSV written to %s', csv_path)
+    if writer.rows == 0:
+        writer.abort()
+        logger.warning("No fixtures to transform; exiting.")
+        return 0
+    writer.close()
+    logger.info(f"Upcoming fixtures: {upcoming}")
+    return writer.rows
+
+
+def transform_fixtures(
+    is_update: bool = False,
+    from_archive: bool = False,
+    incremental: bool = True,
+    report_memory: bool = False,
+    backend: Optional[str] = None,
+    streaming: Optional[bool] = None
+) -> int:
     """
     Main transformation:
-    - Loads raw fixtures from disk
+    - Loads raw fixtures from disk (or, with `from_archive`, rebuilds them
+      from the bronze archive without any API calls)
+    - In full mode with `incremental`, only re-transforms fixture files whose
+      content changed and reuses cached cleaned partitions for the rest
+    - In full mode with `streaming` (default TRANSFORM_STREAMING), transforms
+      and writes one league-season file at a time instead (bounded memory,
+      no cache)
     - Computes home/away results for fulltime and halftime
-    - Converts scores to nullable integers
-    - Writes cleaned CSV and Parquet to the base data directory
+    - Converts scores to compact nullable integers and strings to categoricals
+      (`report_memory` logs the footprint against the old object/Int64 dtypes)
+    - Writes a partitioned cleaned Parquet dataset to the base data directory
+
+    `backend` (default TRANSFORM_BACKEND) selects "pandas", the reference
+    implementation, or "arrow" (see transform_arrow), which always runs full
+    mode from scratch.
 
     Returns
     -------
     int
         Number of fixtures processed and transformed.
     """
+    backend = (backend or TRANSFORM_BACKEND).lower()
+    if backend == "arrow":
+        # Imported here: the Arrow backend builds on this module's helpers
+        from etl.src.transform_arrow import transform_fixtures_arrow
+        return transform_fixtures_arrow(is_update, from_archive)
+    if backend != "pandas":
+        raise ValueError(f"Unknown transform backend: {backend}")
+
     logger.info("Starting fixtures transformation")
     start_time = time.time()
+    streaming = TRANSFORM_STREAMING if streaming is None else streaming
     try:
-        # Load
-        t0 = time.time()
-        df_fixtures = load_fixtures(is_update)
-        load_dur = time.time() - t0
-        logger.info(f"Loaded {len(df_fixtures)} fixtures in {load_dur:.2f}s (mode={'update' if is_update else 'full'})")
-        if is_update:
-            logger.debug("First few rows of update data:\n%s", df_fixtures.head().to_string())
-
-        if df_fixtures.empty:
-            logger.warning("No fixtures to transform; exiting.")
-            return 0
-
-        # Schema validation
-        if not validate_schema(df_fixtures, REQUIRED_COLS):
-            return 0
-
-        # Cast
-        t1 = time.time()
-        df_fixtures = cast_numeric_columns(df_fixtures)
-        logger.debug(f"Casting numeric columns took {(time.time() - t1):.2f}s")
-
-        # Compute results
-        t2 = time.time()
-        df_fixtures = compute_results(df_fixtures)
-        logger.debug(f"Computing results took {(time.time() - t2):.2f}s")
+        if not is_update and not from_archive and streaming:
+            count = transform_full_streaming()
+            logger.info(f"Transformation complete: {count} rows streamed in {time.time() - start_time:.2f}s")
+            return count
+        if not is_update and not from_archive and incremental:
+            # Unchanged league-seasons come back already cleaned from the cache
+            t0 = time.time()
+            df_fixtures = transform_full_incremental()
+            logger.info(f"Incremental full transform produced {len(df_fixtures)} fixtures in {time.time() - t0:.2f}s")
+            if df_fixtures.empty:
+                logger.warning("No fixtures to transform; exiting.")
+                return 0
+        else:
+            # Load
+            t0 = time.time()
+            df_fixtures = load_fixtures(is_update, from_archive)
+            load_dur = time.time() - t0
+            logger.info(f"Loaded {len(df_fixtures)} fixtures in {load_dur:.2f}s (mode={'update' if is_update else 'full'})")
+            if is_update:
+                logger.debug("First few rows of update data:\n%s", df_fixtures.head().to_string())
+
+            if df_fixtures.empty:
+                logger.warning("No fixtures to transform; exiting.")
+                return 0
+
+            # Schema validation
+            if not validate_schema(df_fixtures, REQUIRED_COLS):
+                return 0
+
+            # Cast and compute results
+            t1 = time.time()
+            df_fixtures = clean_fixtures(df_fixtures)
+            logger.debug(f"Casting and computing results took {(time.time() - t1):.2f}s")
 
         # Log stats
         log_upcoming_stats(df_fixtures)
+        if report_memory:
+            log_memory_report(df_fixtures)
 
         # Write outputs
         t3 = time.time()
@@ -363,10 +734,41 @@ if __name__ == "__main__":
         action="store_true",
         help="Run in update mode (process only updated fixtures)."
     )
+    parser.add_argument(
+        "--from-archive",
+        action="store_true",
+        help="Rebuild the cleaned layer from the bronze archive of raw API responses."
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="In full mode, ignore the transform cache and re-transform every file."
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["pandas", "arrow"],
+        default=None,
+        help="Execution backend (default: TRANSFORM_BACKEND, else pandas)."
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        default=None,
+        help="In full mode, transform and write one league-season file at a time (bounded memory)."
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="Log the cleaned frame's memory footprint before/after compact dtypes."
+    )
     args = parser.parse_args()
 
     logger.info("Invoking transform_fixtures (update mode=%s)", args.update)
     try:
-        transform_fixtures(is_update=args.update)
+        transform_fixtures(
+            is_update=args.update, from_archive=args.from_archive, incremental=not args.rebuild,
+            report_memory=args.memory_report, backend=args.backend,
+            streaming=args.streaming
+        )
     except KeyboardInterrupt:
         logger.warning("KeyboardInterrupt received: shutting down transformation gracefully.")
@@ -0,0 +1,119 @@
+"""
+Manifest of source fixture files for the incremental full transform.
+- Records each fixtures.json file's size, mtime and content hash, keyed by its
+  path relative to the fixtures root (country/league/season/fixtures.json).
+- Each entry points at a cached Parquet partition of that file's cleaned
+  output under TRANSFORM_CACHE_DIR/partitions.
+- A file is re-transformed only when its content hash changes; size and mtime
+  are checked first so unchanged files are never re-read.
+- Bumping MANIFEST_VERSION (when the transform logic changes) invalidates
+  every cached partition.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import etl.src.config as config
+from etl.src.logger import get_logger
+
+logger = get_logger(__name__, log_path=config.TRANSFORM_FIXTURES_LOG)
+
+MANIFEST_VERSION = 3
+MANIFEST_NAME = "manifest.json"
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Return the hex SHA-256 of a file, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TransformManifest:
+    """
+    Source file signatures and cached partitions for one fixtures root.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir or config.TRANSFORM_CACHE_DIR)
+        self.path = self.cache_dir / MANIFEST_NAME
+        self.files: Dict[str, Dict[str, Any]] = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable transform manifest {self.path}: {e}")
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            logger.info("Transform manifest version changed; rebuilding all partitions")
+            return {}
+        return data.get("files", {})
+
+    def partition_path(self, relative_path: str) -> Path:
+        """
+        Cached Parquet partition for a source file, mirroring its folders.
+        """
+        return self.cache_dir / "partitions" / Path(relative_path).parent / "fixtures.parquet"
+
+    def signature(self, path: str, relative_path: str) -> Dict[str, Any]:
+        """
+        Return {size, mtime_ns, sha256} for `path`, reusing the recorded hash
+        when size and mtime are unchanged.
+        """
+        stat = os.stat(path)
+        entry = self.files.get(relative_path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            sha256 = entry["sha256"]
+        else:
+            sha256 = file_sha256(path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+
+    def is_current(self, relative_path: str, signature: Dict[str, Any]) -> bool:
+        """
+        Return True if the file's content matches the manifest and its cached
+        partition still exists.
+        """
+        entry = self.files.get(relative_path)
+        return (
+            entry is not None
+            and entry["sha256"] == signature["sha256"]
+            and self.partition_path(relative_path).exists()
+        )
+
+    def record(self, relative_path: str, signature: Dict[str, Any], rows: int) -> None:
+        self.files[relative_path] = {**signature, "rows": rows}
+
+    def prune(self, keep: set) -> int:
+        """
+        Forget files no longer present and delete their cached partitions.
+        Returns the number of entries removed.
+        """
+        removed = [rel for rel in self.files if rel not in keep]
+        for rel in removed:
+            try:
+                self.partition_path(rel).unlink()
+            except FileNotFoundError:
+                pass
+            del self.files[rel]
+        return len(removed)
+
+    def save(self) -> None:
+        """
+        Write the manifest atomically.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = str(self.path) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": self.files}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        logger.info(f"Transform manifest for {len(self.files)} files saved to {self.path}")
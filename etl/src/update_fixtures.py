@@ -6,18 +6,28 @@ Module to update played fixtures in raw.raw_fixtures by fetching missing results
 
 import os
 import json
+import math
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
+from requests.exceptions import RequestException
+
+import etl.src.config as config
 from etl.src.config import UPDATE_FIXTURES_LOG, FIXTURE_UPDATES_JSON
 from etl.src.extract_fixtures import fetch_fixtures, FIXTURES_ENDPOINT, extract_fixtures_field, _validate_fixture
 from etl.src.extract_metadata import get_db_connection
-from typing import List, Dict, Any, Optional
+from etl.src.http_client import rate_limited_get, get_session, limiter, DailyQuotaExhausted, RequestRejected
+from etl.src.poll_scheduler import load_poll_state, save_poll_state, select_poll_ids, record_polls
+from typing import List, Dict, Any, Optional, Tuple
 
 from etl.src.logger import get_logger
 from datetime import date
 logger = get_logger(__name__, log_path=UPDATE_FIXTURES_LOG)
 
+# Maximum number of fixture ids the API accepts in one `ids` request
+MAX_IDS_PER_CALL = 20
+
 
 # Helper to write updates JSON atomically
 def _write_updates_json(updates: List[Dict[str, Any]], output_path: str) -> None:
@@ -185,60 +195,112 @@ def update_played_fixtures(to_date: Optional[str] = None) -> List[Dict[str, Any]
         logger.info(f"Updated a total of {len(updated_fixtures)} fixtures.")
 
 
-def update_by_ids(ids: List[int]) -> List[Dict[str, Any]]:
+def fetch_id_batch(batch_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Fetch one batch of fixtures by id, raising FetchFailed instead of
+    returning an empty list when the request fails. 429s and transient errors
+    are retried here, up to UPDATE_BATCH_ATTEMPTS; RequestRejected means the
+    API refused the ids themselves.
+    """
+    return rate_limited_get(
+        FIXTURES_ENDPOINT, {"ids": "-".join(batch_ids)},
+        max_retries=config.UPDATE_BATCH_ATTEMPTS, raise_on_failure=True
+    )
+
+
+def update_by_ids(
+    ids: List[str],
+    max_workers: int = config.UPDATE_MAX_WORKERS,
+    retry_budget: int = config.UPDATE_RETRY_BUDGET,
+    failed_ids: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
     """
     Update specific fixtures by their fixture IDs.
+    - Splits the ids into batches of MAX_IDS_PER_CALL and fetches up to
+      `max_workers` batches concurrently under the shared rate limiter.
+    - A batch the API rejects is split in half and both halves are retried,
+      isolating bad ids; each retry spends one call of `retry_budget`.
+    - A single rejected id, or any rejected batch once the budget is spent, is
+      reported in `failed_ids` instead of being retried again.
+    - A batch still failing after fetch_id_batch's retries for 429s and
+      transient errors is left for the next run, not split or reported.
+    - Stops scheduling batches once the daily quota is exhausted.
 
     Parameters
     ----------
-    ids : List[int]
+    ids : List[str]
         List of fixture IDs to update.
+    max_workers : int, optional
+        Number of batches fetched concurrently.
+    retry_budget : int, optional
+        Extra API calls allowed for splitting rejected batches.
+    failed_ids : list, optional
+        Receives the ids that could not be fetched.
 
     Returns
     -------
     List[Dict[str, Any]]
         List of updated fixture dictionaries.
     """
-
-
-    """
-    TODOS:
-    ADD timing
-    """
     if not ids:
         logger.info("No fixture IDs provided for update; exiting early.")
         return []
+    failed_ids = failed_ids if failed_ids is not None else []
 
-    updated_fixtures = []
     fixtures = []
-    logger.info(f"Starting update_by_ids for {len(ids)} fixture IDs")
-    # Fetch fixtures with built-in rate limiting
+    deferred_ids = []
+    unavailable_ids = []
+    retries_left = retry_budget
+    max_workers = max(1, max_workers)
+    logger.info(f"Starting update_by_ids for {len(ids)} fixture IDs with {max_workers} workers")
     start_req = time.time()
-    ptr= 0
-    batch_size = 20 # Adjust batch size as needed
-    while ptr < len(ids):
-        batch_ids = ids[ptr:ptr+batch_size]
-        batch_ids = "-".join(batch_ids)
-        logger.info(batch_ids)
-        try:
-            batch_fixtures = fetch_fixtures(
-            FIXTURES_ENDPOINT,
-                {
-                    "ids": batch_ids
-                }
-            )
-            fetch_fixtures_elapsed = time.time() - start_req
-            logger.info(
-                f"Fetched {len(batch_fixtures)} fixtures for provided IDs in {fetch_fixtures_elapsed:.2f}s"
-            )
-            fixtures.extend(batch_fixtures)
-            ptr += batch_size
-        except Exception as e:
-            logger.error(
-                f"Error fetching fixtures for provided IDs: {e} in batch {ptr// batch_size}",
-                exc_info=True
-            )
-            continue
+    get_session(pool_size=max_workers)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="update_by_ids") as executor:
+        pending = {
+            executor.submit(fetch_id_batch, ids[ptr:ptr + MAX_IDS_PER_CALL]): ids[ptr:ptr + MAX_IDS_PER_CALL]
+            for ptr in range(0, len(ids), MAX_IDS_PER_CALL)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch_ids = pending.pop(future)
+                if future.cancelled():
+                    deferred_ids.extend(batch_ids)
+                    continue
+                try:
+                    fixtures.extend(future.result())
+                except DailyQuotaExhausted as e:
+                    deferred_ids.extend(batch_ids)
+                    for other in pending:
+                        other.cancel()
+                    logger.warning(f"{e}: no new batches will be scheduled")
+                except RequestRejected as e:
+                    if len(batch_ids) == 1 or retries_left < 2:
+                        logger.error(f"Giving up on fixture IDs {'-'.join(batch_ids)}: {e}")
+                        failed_ids.extend(batch_ids)
+                        continue
+                    # Split so one bad id cannot sink the rest of its batch
+                    retries_left -= 2
+                    half = len(batch_ids) // 2
+                    logger.warning(f"Batch of {len(batch_ids)} IDs failed ({e}); retrying as two halves")
+                    for part in (batch_ids[:half], batch_ids[half:]):
+                        pending[executor.submit(fetch_id_batch, part)] = part
+                except RequestException as e:
+                    # Rate limiting or an outage, not the ids: splitting cannot help
+                    unavailable_ids.extend(batch_ids)
+                    logger.warning(f"Batch of {len(batch_ids)} IDs still failing after retries: {e}")
+
+    logger.info(
+        f"Fetched {len(fixtures)} fixtures for {len(ids)} IDs in {time.time() - start_req:.2f}s "
+        f"({retry_budget - retries_left} retry calls)"
+    )
+    if deferred_ids:
+        logger.warning(f"Daily quota exhausted: leaving {len(deferred_ids)} fixture IDs for the next run")
+    if unavailable_ids:
+        logger.warning(f"API unavailable: leaving {len(unavailable_ids)} fixture IDs for the next run")
+    if failed_ids:
+        logger.error(f"Could not fetch {len(failed_ids)} fixture IDs: {', '.join(failed_ids)}")
 
     try:
         # 2) Extract updated fixtures batch
@@ -248,11 +310,10 @@ def update_by_ids(ids: List[int]) -> List[Dict[str, Any]]:
             logger.info("No fixture updates extracted for provided IDs; exiting early.")
             return []
         
-        updated_fixtures.extend(extracted_batch)
         logger.info(
             f"Extracted {len(extracted_batch)} updated fixtures for provided IDs"
         )
-        return updated_fixtures
+        return extracted_batch
     except Exception as e:  
         logger.error(
             f"Error extracting fixtures for provided IDs: {e}",
@@ -261,6 +322,211 @@ def update_by_ids(ids: List[int]) -> List[Dict[str, Any]]:
         return []
     
     
+def to_update_fixture_groups(finished_after_minutes: int = 120) -> List[Dict[str, Any]]:
+    """
+    Fetch the fixture IDs needing updates grouped by league-season.
+    Each group is a dict with league_season_id, api_league_id, season,
+    from_date (earliest pending kickoff) and the pending ids with their
+    kickoffs and statuses, ordered by kickoff.
+
+    Parameters
+    ----------
+    finished_after_minutes : int, optional
+        Only fixtures that kicked off at least this long ago are pending.
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            SELECT
+                ls.league_season_id,
+                l.api_league_id,
+                ls.season,
+                ARRAY_AGG(srf.api_fixture_id ORDER BY srf.kickoff_utc) AS ids,
+                ARRAY_AGG(srf.kickoff_utc ORDER BY srf.kickoff_utc) AS kickoffs,
+                ARRAY_AGG(srf.fixture_status ORDER BY srf.kickoff_utc) AS statuses
+            FROM raw_stg.stg_raw_fixtures as srf
+            JOIN raw_stg.stg_dim_leagues l
+            ON srf.api_league_id = l.api_league_id
+            JOIN raw_stg.stg_dim_league_seasons ls
+            ON l.league_id = ls.league_id
+                AND ls.season = srf.season
+            WHERE srf.kickoff_utc < NOW() - make_interval(mins => %s)
+                AND (srf.home_team_fulltime_goal IS NULL OR srf.away_team_fulltime_goal IS NULL)
+                AND ls.is_current
+            GROUP BY ls.league_season_id, l.api_league_id, ls.season
+        """, (finished_after_minutes,))
+        groups = [
+            {
+                "league_season_id": league_season_id,
+                "api_league_id": api_league_id,
+                "season": season,
+                "from_date": kickoffs[0].date(),
+                "ids": [str(fid) for fid in ids],
+                "kickoffs": list(kickoffs),
+                "statuses": list(statuses),
+            }
+            for league_season_id, api_league_id, season, ids, kickoffs, statuses in cur.fetchall()
+        ]
+        logger.info(
+            f"Identified {sum(len(g['ids']) for g in groups)} fixture IDs needing updates "
+            f"across {len(groups)} league-seasons."
+        )
+        return groups
+    except Exception as e:
+        logger.error(f"Error querying fixture groups needing updates: {e}", exc_info=True)
+        return []
+    finally:
+        conn.close()
+
+
+def restrict_groups(groups: List[Dict[str, Any]], keep_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Keep only `keep_ids` in each group, dropping emptied groups and moving
+    from_date up to the earliest kickoff still kept.
+    """
+    keep = set(keep_ids)
+    restricted = []
+    for group in groups:
+        kept = [
+            (fid, kickoff, status)
+            for fid, kickoff, status in zip(group["ids"], group["kickoffs"], group["statuses"])
+            if fid in keep
+        ]
+        if not kept:
+            continue
+        ids, kickoffs, statuses = (list(column) for column in zip(*kept))
+        restricted.append({
+            **group,
+            "from_date": kickoffs[0].date(),
+            "ids": ids,
+            "kickoffs": kickoffs,
+            "statuses": statuses,
+        })
+    return restricted
+
+
+def plan_update_strategy(groups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Choose which league-seasons to refresh with one date-range call and which
+    pending ids to pack into `ids` calls, minimizing total API calls.
+
+    Fetching a set R of groups by range costs |R| + ceil(ids left / MAX_IDS_PER_CALL).
+    For a given |R| the best choice is always the largest groups, so trying
+    every |R| from 0 to the number of groups finds the optimum.
+
+    Returns
+    -------
+    dict
+        range_groups, ids, projected_calls, and the cost of the pure
+        ids_only_calls / range_only_calls strategies for comparison.
+    """
+    by_size = sorted(groups, key=lambda g: len(g["ids"]), reverse=True)
+    remaining = sum(len(g["ids"]) for g in groups)
+    best_k, best_calls = 0, math.ceil(remaining / MAX_IDS_PER_CALL)
+    ids_only_calls = best_calls
+    for k, group in enumerate(by_size, start=1):
+        remaining -= len(group["ids"])
+        calls = k + math.ceil(remaining / MAX_IDS_PER_CALL)
+        # Ties go to fewer range calls: ids fetch only what is pending
+        if calls < best_calls:
+            best_k, best_calls = k, calls
+    return {
+        "range_groups": by_size[:best_k],
+        "ids": [fid for group in by_size[best_k:] for fid in group["ids"]],
+        "projected_calls": best_calls,
+        "ids_only_calls": ids_only_calls,
+        "range_only_calls": len(groups),
+    }
+
+
+def update_fixtures_planned(
+    to_date: Optional[str] = None,
+    failed_ids: Optional[List[str]] = None,
+    scheduled: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Fetch pending fixture updates with the cheapest mix of date-range and
+    id-batch calls from `plan_update_strategy`, logging projected versus
+    actual calls saved against fetching every id in batches.
+
+    With `scheduled`, only fixtures the poll scheduler considers due are
+    fetched and the poll state is updated afterwards.
+    """
+    start_total = time.time()
+    if to_date is None:
+        to_date = date.today().isoformat()
+    if scheduled:
+        groups = to_update_fixture_groups(config.POLL_FINISH_AFTER_MINUTES)
+        poll_state = load_poll_state()
+        poll_ids = select_poll_ids(pending_fixtures(groups), poll_state)
+        groups = restrict_groups(groups, poll_ids)
+    else:
+        groups = to_update_fixture_groups()
+    if not groups:
+        if scheduled:
+            save_poll_state(poll_state)
+        logger.info("No fixtures need updating; exiting early.")
+        return []
+    plan = plan_update_strategy(groups)
+    logger.info(
+        f"Update plan: {len(plan['range_groups'])} date-range calls + {len(plan['ids'])} ids in batches "
+        f"= {plan['projected_calls']} calls (ids only: {plan['ids_only_calls']}, "
+        f"range only: {plan['range_only_calls']})"
+    )
+    calls_before = limiter.state()["calls_made"]
+
+    updated_fixtures = []
+    for group in plan["range_groups"]:
+        try:
+            fixtures = fetch_fixtures(
+                FIXTURES_ENDPOINT,
+                {
+                    "league": group["api_league_id"],
+                    "season": group["season"],
+                    "from": group["from_date"].isoformat(),
+                    "to": to_date
+                }
+            )
+        except DailyQuotaExhausted as e:
+            logger.warning(f"{e}: leaving remaining league-season ranges for the next run")
+            break
+        updated_fixtures.extend(extract_fixtures_field(fixtures))
+    if plan["ids"]:
+        updated_fixtures.extend(update_by_ids(plan["ids"], failed_ids=failed_ids))
+
+    actual_calls = limiter.state()["calls_made"] - calls_before
+    if scheduled:
+        save_poll_state(record_polls(poll_state, poll_ids, updated_fixtures))
+    logger.info(
+        f"update_fixtures_planned finished in {time.time() - start_total:.2f}s: "
+        f"{actual_calls} calls made vs {plan['projected_calls']} projected; "
+        f"saved {plan['ids_only_calls'] - plan['projected_calls']} projected / "
+        f"{plan['ids_only_calls'] - actual_calls} actual calls against ids only"
+    )
+    return updated_fixtures
+
+
+def pending_fixtures(groups: List[Dict[str, Any]]) -> List[Tuple[str, Any, Optional[str]]]:
+    """
+    Flatten groups into (api_fixture_id, kickoff_utc, fixture_status) tuples.
+    """
+    return [
+        fixture
+        for group in groups
+        for fixture in zip(group["ids"], group["kickoffs"], group["statuses"])
+    ]
+
+
+def has_due_polls() -> bool:
+    """
+    Return True if the poll scheduler has any fixture due now.
+    Used to short-circuit scheduled update runs that have nothing to fetch.
+    """
+    groups = to_update_fixture_groups(config.POLL_FINISH_AFTER_MINUTES)
+    return bool(select_poll_ids(pending_fixtures(groups), load_poll_state()))
+
+
 def to_json(updated_fixtures: List[Dict[str, Any]], output_filename: str) -> None:
     """
     Write the list of fixture updates to a JSON file.
@@ -281,13 +547,14 @@ def to_json(updated_fixtures: List[Dict[str, Any]], output_filename: str) -> Non
 
 
 
-def update_fixtures_main(output_filename: Optional[str] = None) -> None:
+def update_fixtures_main(output_filename: Optional[str] = None, scheduled: bool = False) -> None:
     """
     Main function to update played fixtures and write updates to JSON.
+    Uses the cheapest mix of date-range and id-batch calls per league-season;
+    with `scheduled`, only the fixtures the poll scheduler marks as due.
     """
     try:
-        ids = to_update_fixture_ids()
-        updated_fixtures = update_by_ids(ids)
+        updated_fixtures = update_fixtures_planned(scheduled=scheduled)
         count = to_json(updated_fixtures, output_filename)
         logger.info(f"update_fixtures_main finished: {count} updates applied.")
     except Exception as e:
@@ -304,7 +571,12 @@ if __name__ == "__main__":
     parser.add_argument(
         "--earliest-kickoff",
         action="store_true",
-        help="If set, update fixtures by specific IDs needing updates instead of by league-season."
+        help="If set, refresh every league-season by date range instead of the cost-based plan."
+    )
+    parser.add_argument(
+        "--scheduled",
+        action="store_true",
+        help="Only poll fixtures the kickoff-window scheduler marks as due."
     )
     parser.add_argument(
         "--output-file",
@@ -329,7 +601,7 @@ if __name__ == "__main__":
             )
             
         else:
-            update_fixtures_main(output_filename=args.output_file)
+            update_fixtures_main(output_filename=args.output_file, scheduled=args.scheduled)
             
         
     except KeyboardInterrupt:
@@ -0,0 +1,40 @@
+import gzip
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from etl.src.bronze_archive import archive_response, archive_files, iter_archive, load_archived_fixtures
+
+
+def raw_fixture(fixture_id, league_id, season, status, home_goals):
+    return {
+        "fixture": {"id": fixture_id, "date": "2024-05-19T15:00:00+00:00", "status": {"short": status}, "referee": "M. Oliver"},
+        "league": {"id": league_id, "season": season},
+        "teams": {"home": {"id": 1, "name": "Home"}, "away": {"id": 2, "name": "Away"}},
+        "score": {"halftime": {"home": 0, "away": 0}, "fulltime": {"home": home_goals, "away": 0}},
+    }
+
+
+def at(day, hour):
+    return datetime(2024, 5, day, hour, tzinfo=ZoneInfo("UTC"))
+
+
+def test_archive_partitions_and_compresses(tmp_path):
+    params = {"league": 39, "season": 2023}
+    paths = archive_response("fixtures", params, [raw_fixture(1, 39, 2023, "NS", None)], at(18, 9), root=str(tmp_path))
+    assert len(paths) == 1
+    assert "endpoint=fixtures/league=39/season=2023/fetch_date=2024-05-18" in paths[0]
+    with gzip.open(paths[0], "rt") as f:
+        assert '"referee":"M. Oliver"' in f.read()
+    # Records from an ids request land in their own league/season partitions
+    archive_response("fixtures", {"ids": "1-7"}, [raw_fixture(7, 140, 2023, "FT", 1)], at(18, 10), root=str(tmp_path))
+    assert len(archive_files("fixtures", league=140, root=str(tmp_path))) == 1
+    assert [e["params"] for e in iter_archive("fixtures", season=2023, root=str(tmp_path))] == [params, {"ids": "1-7"}]
+
+
+def test_rebuild_keeps_latest_fetch_per_fixture(tmp_path):
+    archive_response("fixtures", {}, [raw_fixture(1, 39, 2023, "NS", None), raw_fixture(2, 39, 2023, "NS", None)], at(18, 9), root=str(tmp_path))
+    archive_response("fixtures", {}, [raw_fixture(1, 39, 2023, "FT", 3)], at(19, 18), root=str(tmp_path))
+    table = load_archived_fixtures(root=str(tmp_path))
+    rows = {row["api_fixture_id"]: row for row in table.to_pylist()}
+    assert rows[1]["fixture_status"] == "FT" and rows[1]["home_team_fulltime_goal"] == 3
+    assert rows[2]["fixture_status"] == "NS"
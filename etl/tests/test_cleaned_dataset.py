@@ -0,0 +1,92 @@
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from etl.src.cleaned_dataset import (
+    find_latest_output,
+    kickoff_filters,
+    read_cleaned_dataset,
+    write_cleaned_dataset,
+)
+
+
+def make_cleaned(with_path_columns=True):
+    df = pd.DataFrame({
+        "api_fixture_id": pd.array([30, 10, 20, 40], dtype="Int64"),
+        "season": pd.array([2023, 2023, 2023, 2022], dtype="Int64"),
+        "kickoff_utc": ["2023-08-13", "2023-08-11", "2023-08-12", "2022-08-10"],
+        "fixture_status": ["FT", "FT", "NS", "FT"],
+        "home_fulltime_result": ["win", "draw", None, "loss"],
+    })
+    if with_path_columns:
+        df["country"] = pd.Categorical(["England", "England", "England", "Spain"])
+        df["league"] = pd.Categorical(["Premier League", "Premier League", "Premier League", "La Liga"])
+    return df
+
+
+def test_full_output_is_partitioned_and_sorted(tmp_path):
+    path = tmp_path / "cleaned_fixtures_full_20240101_000000"
+    files = write_cleaned_dataset(make_cleaned(), str(path))
+
+    assert files == 2
+    part = path / "country=England" / "league=Premier%20League" / "season=2023" / "part-0.parquet"
+    assert part.exists()
+    assert not os.path.exists(str(path) + ".tmp")
+
+    parquet = pq.ParquetFile(part)
+    assert parquet.read().column("api_fixture_id").to_pylist() == [10, 20, 30]
+    row_group = parquet.metadata.row_group(0)
+    assert row_group.sorting_columns[0].column_index == parquet.schema_arrow.get_field_index("api_fixture_id")
+    assert row_group.column(0).statistics.has_min_max
+
+    df = read_cleaned_dataset(str(path))
+    assert sorted(df["api_fixture_id"].tolist()) == [10, 20, 30, 40]
+    assert set(df["league"]) == {"Premier League", "La Liga"}
+
+
+def test_update_output_is_partitioned_by_season(tmp_path):
+    path = tmp_path / "cleaned_fixtures_update_20240101_000000"
+    write_cleaned_dataset(make_cleaned(with_path_columns=False), str(path))
+
+    assert sorted(p.name for p in path.iterdir()) == ["season=2022", "season=2023"]
+    df = read_cleaned_dataset(str(path), filters=[("api_fixture_id", "in", [20, 40])])
+    assert sorted(df["api_fixture_id"].tolist()) == [20, 40]
+    assert sorted(df["season"].tolist()) == [2022, 2023]
+
+
+def test_filters_prune_partitions_and_read_legacy_files(tmp_path):
+    path = tmp_path / "cleaned_fixtures_full_20240101_000000"
+    write_cleaned_dataset(make_cleaned(), str(path))
+    df = read_cleaned_dataset(str(path), columns=["api_fixture_id", "season"], filters=[("season", "=", 2022)])
+    assert df["api_fixture_id"].tolist() == [40]
+
+    legacy = tmp_path / "cleaned_fixtures_full_20230101_000000.parquet"
+    make_cleaned().to_parquet(legacy, index=False)
+    assert read_cleaned_dataset(str(legacy), filters=[("api_fixture_id", "=", 10)])["api_fixture_id"].tolist() == [10]
+
+
+def test_find_latest_output_prefers_newest_and_skips_partial(tmp_path):
+    (tmp_path / "cleaned_fixtures_full_20230101_000000.parquet").write_bytes(b"")
+    (tmp_path / "cleaned_fixtures_full_20240101_000000").mkdir()
+    (tmp_path / "cleaned_fixtures_full_20250101_000000.tmp").mkdir()
+    (tmp_path / "cleaned_fixtures_full_20250101_000000.csv").write_text("")
+    assert find_latest_output(str(tmp_path), "full").name == "cleaned_fixtures_full_20240101_000000"
+
+
+def test_kickoff_is_stored_as_utc_timestamp_and_filters_by_range(tmp_path):
+    df = make_cleaned()
+    df["kickoff_utc"] = pd.to_datetime(df["kickoff_utc"], utc=True).astype("datetime64[ns, UTC]")
+    path = tmp_path / "cleaned_fixtures_full_20240101_000000"
+    write_cleaned_dataset(df, str(path), row_group_size=1)
+
+    part = path / "country=England" / "league=Premier%20League" / "season=2023" / "part-0.parquet"
+    parquet = pq.ParquetFile(part)
+    assert str(parquet.schema_arrow.field("kickoff_utc").type) == "timestamp[ns, tz=UTC]"
+    kickoff_index = parquet.schema_arrow.get_field_index("kickoff_utc")
+    assert parquet.metadata.row_group(0).column(kickoff_index).statistics.has_min_max
+
+    filters = kickoff_filters("2023-08-12", pd.Timestamp("2023-08-13 03:00", tz="Europe/Madrid"))
+    back = read_cleaned_dataset(str(path), filters=filters)
+    assert back["api_fixture_id"].tolist() == [20, 30]
+    assert str(back["kickoff_utc"].dtype) == "datetime64[ns, UTC]"
@@ -0,0 +1,141 @@
+import struct
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+import pytest
+
+from etl.src.copy_stream import (
+    PGCOPY_HEADER,
+    BinaryCopyStream,
+    CsvCopyStream,
+    encode_binary_batch,
+    encode_csv_batch,
+    make_copy_stream,
+)
+
+
+def make_batch(first_id, rows=3):
+    return pa.record_batch({
+        "api_fixture_id": pa.array(range(first_id, first_id + rows), pa.int64()),
+        "home_team_name": pa.array(["Arsenal", None, 'Say "hi", FC'][:rows]).dictionary_encode(),
+        "home_team_fulltime_goal": pa.array([2, None, 0][:rows], pa.int8()),
+        "kickoff_utc": pa.array([1691780400 * 10**9, None, 1691780400 * 10**9 + 1500][:rows], pa.timestamp("ns", "UTC")),
+    })
+
+
+def test_encode_csv_batch_writes_copy_csv():
+    lines = encode_csv_batch(make_batch(1)).decode().splitlines()
+    assert lines == [
+        '1,"Arsenal",2,"2023-08-11 19:00:00.000000+0000"',
+        "2,,,",
+        '3,"Say ""hi"", FC",0,"2023-08-11 19:00:00.000001+0000"',
+    ]
+
+
+PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+DECODERS = {
+    "smallint": lambda b: struct.unpack(">h", b)[0],
+    "integer": lambda b: struct.unpack(">i", b)[0],
+    "bigint": lambda b: struct.unpack(">q", b)[0],
+    "boolean": lambda b: b == b"\x01",
+    "text": lambda b: b.decode(),
+    "timestamp with time zone": lambda b: PG_EPOCH + timedelta(microseconds=struct.unpack(">q", b)[0]),
+}
+
+
+def decode_binary_copy(data, pg_types):
+    """Minimal binary COPY reader for checking the encoder."""
+    assert data.startswith(PGCOPY_HEADER)
+    pos, rows = len(PGCOPY_HEADER), []
+    while True:
+        (fields,) = struct.unpack_from(">h", data, pos)
+        pos += 2
+        if fields == -1:
+            assert pos == len(data)
+            return rows
+        row = []
+        for pg_type in pg_types[:fields]:
+            (length,) = struct.unpack_from(">i", data, pos)
+            pos += 4
+            row.append(None if length == -1 else DECODERS[pg_type](data[pos:pos + length]))
+            pos += max(length, 0)
+        rows.append(tuple(row))
+
+
+def test_binary_copy_round_trips_supported_types():
+    batch = pa.record_batch({
+        "id": pa.array([1, 2, 3, 4], pa.int64()),
+        "goals": pa.array([2, None, 0, -1], pa.int8()),
+        "league_id": pa.array([39, 140, None, 2**31 - 1], pa.int32()),
+        "team": pa.array(["Arsenal", None, "", "Atlético"]).dictionary_encode(),
+        "status": pa.array(["xx", "FT", "NS", None, "AET"]).slice(1),
+        "kickoff": pa.array([1691780400 * 10**9, None, 1500, 0], pa.timestamp("ns", "UTC")),
+        "played": pa.array([True, False, None, True]),
+    })
+    pg_types = ["bigint", "smallint", "integer", "text", "character varying", "timestamp with time zone", "boolean"]
+    with BinaryCopyStream([batch.slice(0, 2), batch.slice(2)], pg_types) as stream:
+        data = stream.read()
+
+    decode_types = [t if t != "character varying" else "text" for t in pg_types]
+    kickoff = datetime(2023, 8, 11, 19, tzinfo=timezone.utc)
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    assert decode_binary_copy(data, decode_types) == [
+        (1, 2, 39, "Arsenal", "FT", kickoff, True),
+        (2, None, 140, None, "NS", None, False),
+        (3, 0, None, "", None, epoch + timedelta(microseconds=1), None),
+        (4, -1, 2**31 - 1, "Atlético", "AET", epoch, True),
+    ]
+    assert stream.rows == 4
+
+
+def test_binary_copy_rejects_values_too_wide_for_the_column():
+    batch = pa.record_batch({"goals": pa.array([40000], pa.int32())})
+    with pytest.raises(pa.ArrowInvalid):
+        encode_binary_batch(batch, ["smallint"])
+
+
+def test_make_copy_stream_falls_back_to_csv():
+    batch = make_batch(1)
+    types = {"api_fixture_id": "bigint", "home_team_name": "text", "home_team_fulltime_goal": "smallint",
+             "kickoff_utc": "timestamp with time zone"}
+    stream, options = make_copy_stream([batch], batch.schema, types, copy_format="binary")
+    with stream:
+        assert options == "(FORMAT binary)" and stream.read().startswith(PGCOPY_HEADER)
+    stream, options = make_copy_stream([batch], batch.schema, {**types, "kickoff_utc": "date"}, copy_format="binary")
+    with stream:
+        assert options == "CSV" and stream.read() == encode_csv_batch(batch)
+    with pytest.raises(ValueError):
+        make_copy_stream([batch], batch.schema, types, copy_format="parquet")
+
+
+def test_stream_reads_in_pieces_and_counts_rows():
+    with CsvCopyStream([make_batch(i * 10) for i in range(5)], prefetch=1) as stream:
+        pieces = iter(lambda: stream.read(7), b"")
+        data = b"".join(pieces)
+    assert stream.rows == 15
+    assert data == b"".join(encode_csv_batch(make_batch(i * 10)) for i in range(5))
+
+
+def test_stream_encodes_lazily_and_stops_on_close():
+    consumed = []
+
+    def batches():
+        for i in range(1000):
+            consumed.append(i)
+            yield make_batch(i * 10)
+
+    stream = CsvCopyStream(batches(), prefetch=2)
+    stream.read(10)
+    stream.close()
+    # At most the queue plus the batch being encoded/put and the one read
+    assert len(consumed) <= 5
+
+
+def test_stream_raises_source_errors():
+    def batches():
+        yield make_batch(1)
+        raise OSError("disk gone")
+
+    with CsvCopyStream(batches()) as stream:
+        with pytest.raises(OSError, match="disk gone"):
+            stream.read()
@@ -0,0 +1,121 @@
+import pytest
+import etl.src.extract_fixtures as extract_fixtures_mod
+from etl.src.extract_fixtures import extract_fixtures
+
+
+class DummyCursor:
+    def __init__(self):
+        self.queries = []
+
+    def execute(self, sql, params=None):
+        self.queries.append((sql.strip(), params))
+
+    def close(self):
+        pass
+
+
+class DummyConn:
+    def __init__(self):
+        self.cur = DummyCursor()
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return self.cur
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+ROWS = [
+    ("England", "Premier League", 39, 2023, 1),
+    ("Spain", "La Liga", 140, 2023, 2),
+    ("Italy", "Serie A", 135, 2023, 3),
+]
+
+
+@pytest.fixture
+def dummy_conn(monkeypatch, tmp_path):
+    conn = DummyConn()
+    monkeypatch.setattr(extract_fixtures_mod.config, "RUN_JOURNAL_DIR", str(tmp_path / "journal"))
+    monkeypatch.setattr(extract_fixtures_mod, "get_db_connection", lambda: conn)
+    monkeypatch.setattr(extract_fixtures_mod, "get_season_rows", lambda cur: ROWS)
+    return conn
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_extract_fixtures_marks_each_league_season(dummy_conn, monkeypatch, workers):
+    counts = {39: 380, 140: 0, 135: 380}
+    monkeypatch.setattr(
+        extract_fixtures_mod, "extract_league_season",
+        lambda country, league, api_league_id, season: counts[api_league_id]
+    )
+    total, failed = extract_fixtures(max_workers=workers)
+    assert (total, failed) == (760, 0)
+    # League-seasons with no fixtures are not marked as bootstrapped
+    marked = sorted(params[0] for _, params in dummy_conn.cur.queries)
+    assert marked == [1, 3]
+    assert dummy_conn.commits == 2
+
+
+def test_extract_fixtures_failure_does_not_block_others(dummy_conn, monkeypatch):
+    def fake_extract(country, league, api_league_id, season):
+        if api_league_id == 140:
+            raise extract_fixtures_mod.RequestException("boom")
+        return 10
+
+    monkeypatch.setattr(extract_fixtures_mod, "extract_league_season", fake_extract)
+    total, failed = extract_fixtures(max_workers=3)
+    assert (total, failed) == (20, 1)
+    assert dummy_conn.rollbacks == 1
+    assert dummy_conn.commits == 2
+
+
+def test_extract_fixtures_stops_when_daily_quota_exhausted(dummy_conn, monkeypatch):
+    calls = []
+
+    def fake_extract(country, league, api_league_id, season):
+        calls.append(api_league_id)
+        raise extract_fixtures_mod.DailyQuotaExhausted("quota spent")
+
+    monkeypatch.setattr(extract_fixtures_mod, "extract_league_season", fake_extract)
+    total, failed = extract_fixtures(max_workers=1)
+    assert (total, failed) == (0, 0)
+    # The first failure cancels the league-seasons that had not started yet
+    assert len(calls) < len(ROWS)
+    assert dummy_conn.commits == 0
+
+
+def test_extract_fixtures_resume_skips_journaled_league_seasons(dummy_conn, monkeypatch):
+    calls = []
+
+    def crash_after_first(country, league, api_league_id, season):
+        calls.append(api_league_id)
+        if api_league_id != 39:
+            raise extract_fixtures_mod.DailyQuotaExhausted("quota spent")
+        return 380
+
+    monkeypatch.setattr(extract_fixtures_mod, "extract_league_season", crash_after_first)
+    extract_fixtures(max_workers=1)
+    assert calls[0] == 39
+
+    # A file saved before the process died is marked without refetching it
+    journal = extract_fixtures_mod.RunJournal("extract_fixtures", resume=True)
+    journal.record(extract_fixtures_mod.fixtures_unit(2), extract_fixtures_mod.SAVED, fixtures=300)
+
+    calls.clear()
+    monkeypatch.setattr(
+        extract_fixtures_mod, "extract_league_season",
+        lambda country, league, api_league_id, season: calls.append(api_league_id) or 380
+    )
+    total, failed = extract_fixtures(max_workers=1, resume=True)
+    assert calls == [135]
+    assert (total, failed) == (380, 0)
+    marked = [params[0] for _, params in dummy_conn.cur.queries]
+    assert marked == [1, 2, 3]
@@ -2,7 +2,9 @@ import sys
 import os
 import yaml
 import pytest
-from etl.src.extract_metadata import load_yaml, upsert_country, upsert_league, upsert_league_season
+from datetime import date
+from etl.src.extract_metadata import load_yaml, upsert_country, upsert_league, upsert_league_season, upsert_team
+from etl.src.dimension_cache import DimensionKeyCache
 
 class DummyCursor:
     def __init__(self, fetchone_responses):
@@ -46,4 +48,166 @@ def test_upsert_league_season_insert():
     assert sid == 4
     sql, params = cur.queries[0]
     assert "INSERT INTO dim.dim_league_seasons" in sql
-    assert params == (10, 2021, "2021/22", "2021-08-01", "2022-05-22")
\ No newline at end of file
+    assert params == (10, 2021, "2021/22", "2021-08-01", "2022-05-22")
+
+class PreloadCursor(DummyCursor):
+    def __init__(self, fetchall_responses, fetchone_responses=()):
+        super().__init__(fetchone_responses)
+        self.fetchall_responses = list(fetchall_responses)
+
+    def fetchall(self):
+        return self.fetchall_responses.pop(0)
+
+def test_dimension_key_cache_skips_unchanged_rows():
+    cur = PreloadCursor([
+        [("Spain", 1)],
+        [(140, 3, "La Liga", 1)],
+        [(3, 2021, 4, "2021/22", date(2021, 8, 1), date(2022, 5, 22))],
+        [(541, "Real Madrid", "REA", 1)],
+    ])
+    keys = DimensionKeyCache.load(cur)
+    preload_queries = len(cur.queries)
+    assert upsert_country(cur, "Spain", keys) == 1
+    assert upsert_league(cur, 1, "La Liga", 140, keys) == 3
+    assert upsert_league_season(cur, 3, 2021, "2021/22", "2021-08-01", "2022-05-22", keys) == 4
+    upsert_team(cur, 541, "Real Madrid", "REA", 1, keys)
+    assert len(cur.queries) == preload_queries
+    assert keys.stats() == {"hits": 4, "misses": 0}
+
+def test_dimension_key_cache_writes_new_and_changed_rows():
+    cur = PreloadCursor([[], [(140, 3, "La Liga", 1)], [], []], fetchone_responses=[(2,), (3,)])
+    keys = DimensionKeyCache.load(cur)
+    preload_queries = len(cur.queries)
+    assert upsert_country(cur, "Italy", keys) == 2
+    # A renamed league goes to the database and the cache picks up the new name
+    assert upsert_league(cur, 1, "LaLiga", 140, keys) == 3
+    assert len(cur.queries) == preload_queries + 2
+    assert upsert_country(cur, "Italy", keys) == 2
+    assert upsert_league(cur, 1, "LaLiga", 140, keys) == 3
+    assert len(cur.queries) == preload_queries + 2
+
+import etl.src.extract_metadata as extract_metadata_mod
+from etl.src.extract_metadata import collect_metadata, bulk_load_metadata, process_league
+from etl.src.http_client import FetchFailed
+from etl.src.run_journal import RunJournal
+
+LEAGUE_INFO = [{
+    "league": {"id": 39, "name": "Premier League"},
+    "seasons": [
+        {"year": 2019, "start": "2019-08-09", "end": "2020-07-26", "current": False},
+        {"year": 2023, "start": "2023-08-11", "end": "2024-05-19", "current": False},
+        {"year": 2024, "start": "2024-08-16", "end": "2025-05-25", "current": True},
+    ],
+}]
+
+def test_collect_metadata_stages_without_db(monkeypatch):
+    monkeypatch.setattr(extract_metadata_mod, "MIN_SEASON_TRACKER", 2020)
+    monkeypatch.setattr(extract_metadata_mod, "fetch_league_info", lambda endpoint, params, ttl: LEAGUE_INFO)
+    monkeypatch.setattr(extract_metadata_mod, "fetch_teams", lambda endpoint, params, ttl, **kwargs: [
+        {"id": 33, "name": "Manchester United", "code": "MUN"},
+        {"id": None, "name": "Unknown", "code": None},
+    ])
+    metadata = {"countries": [{"country": "England", "leagues": [{"name": "Premier League"}]}]}
+    missing = []
+    stage = collect_metadata(metadata, missing)
+    assert missing == []
+    assert list(stage["countries"]) == ["England"]
+    assert stage["leagues"] == {39: (39, "Premier League", "England")}
+    # Seasons before MIN_SEASON_TRACKER are skipped
+    assert sorted(stage["league_seasons"]) == [(39, 2023), (39, 2024)]
+    # Teams are de-duplicated across seasons and invalid ones dropped
+    assert stage["teams"] == {33: (33, "Manchester United", "MUN", "England")}
+
+def test_collect_metadata_skips_journaled_seasons(monkeypatch, tmp_path):
+    monkeypatch.setattr(extract_metadata_mod, "MIN_SEASON_TRACKER", 2020)
+    monkeypatch.setattr(extract_metadata_mod, "fetch_league_info", lambda endpoint, params, ttl: LEAGUE_INFO)
+    team_calls = []
+    monkeypatch.setattr(
+        extract_metadata_mod, "fetch_teams",
+        lambda endpoint, params, ttl, **kwargs: team_calls.append(params["season"]) or []
+    )
+    journal = RunJournal("extract_metadata", directory=str(tmp_path))
+    journal.record("England/Premier League/2023")
+    metadata = {"countries": [{"country": "England", "leagues": [{"name": "Premier League"}]}]}
+    staged_units = []
+    stage = collect_metadata(metadata, [], journal, staged_units)
+    assert team_calls == [2024]
+    assert sorted(stage["league_seasons"]) == [(39, 2024)]
+    assert staged_units == ["England/Premier League/2024", "England/Premier League"]
+
+def test_collect_metadata_does_not_journal_failed_team_fetches(monkeypatch, tmp_path):
+    monkeypatch.setattr(extract_metadata_mod, "MIN_SEASON_TRACKER", 2020)
+    monkeypatch.setattr(extract_metadata_mod, "fetch_league_info", lambda endpoint, params, ttl: LEAGUE_INFO)
+
+    def fetch_teams(endpoint, params, ttl, raise_on_failure=False):
+        assert raise_on_failure
+        if params["season"] == 2023:
+            raise FetchFailed("teams: HTTP 500")
+        return [{"id": 33, "name": "Manchester United", "code": "MUN"}]
+
+    monkeypatch.setattr(extract_metadata_mod, "fetch_teams", fetch_teams)
+    metadata = {"countries": [{"country": "England", "leagues": [{"name": "Premier League"}]}]}
+    staged_units = []
+    collect_metadata(metadata, [], RunJournal("extract_metadata", directory=str(tmp_path)), staged_units)
+    # Neither the failed season nor its league is journaled, so resume retries them
+    assert staged_units == ["England/Premier League/2024"]
+
+def test_process_league_does_not_journal_failed_team_fetches(monkeypatch, tmp_path):
+    monkeypatch.setattr(extract_metadata_mod, "MIN_SEASON_TRACKER", 2020)
+    monkeypatch.setattr(extract_metadata_mod, "fetch_league_info", lambda endpoint, params, ttl: LEAGUE_INFO)
+
+    def fetch_teams(endpoint, params, ttl, raise_on_failure=False):
+        raise FetchFailed("teams: HTTP 500")
+
+    monkeypatch.setattr(extract_metadata_mod, "fetch_teams", fetch_teams)
+    monkeypatch.setattr(extract_metadata_mod, "upsert_league", lambda *args: 1)
+    monkeypatch.setattr(extract_metadata_mod, "upsert_league_season", lambda *args: 1)
+    cur = DummyCursor([])
+    cur.connection = type("Connection", (), {"commit": lambda self: None})()
+    journal = RunJournal("extract_metadata", directory=str(tmp_path))
+    process_league(cur, "England", 1, {"name": "Premier League"}, [], journal)
+    assert not journal.is_done("England/Premier League/2023")
+    assert not journal.is_done("England/Premier League/2024")
+    assert not journal.is_done("England/Premier League")
+
+class BulkCursor:
+    def __init__(self, results, resolved):
+        self.results = list(results)
+        self.resolved = list(resolved)
+        self.queries = []
+
+    def execute(self, sql, params=None):
+        self.queries.append(sql.strip())
+
+    def fetchall(self):
+        return self.results.pop(0)
+
+    def fetchone(self):
+        return (self.resolved.pop(0),)
+
+def test_bulk_load_metadata_reports_counts(monkeypatch):
+    staged_rows = {}
+    monkeypatch.setattr(
+        extract_metadata_mod, "execute_values",
+        lambda cur, sql, rows, page_size: staged_rows.setdefault(sql, rows)
+    )
+    stage = {
+        "countries": {"England": ("England",), "Spain": ("Spain",)},
+        "leagues": {39: (39, "Premier League", "England")},
+        "league_seasons": {
+            (39, 2024): (39, 2024, "2024/25", "2024-08-16", "2025-05-25"),
+            (999, 2024): (999, 2024, "2024/25", "2024-08-16", "2025-05-25"),
+        },
+        "teams": {33: (33, "Manchester United", "MUN", "England"), 40: (40, "Liverpool", "LIV", "England")},
+    }
+    # One RETURNING result per dimension: (xmax = 0) is TRUE for inserts; the
+    # season of unknown league 999 does not resolve
+    cur = BulkCursor([[(True,)], [(False,)], [], [(True,), (False,)]], resolved=[2, 1, 1, 2])
+    report = bulk_load_metadata(cur, stage)
+    assert report["countries"] == {"staged": 2, "inserted": 1, "updated": 0, "unchanged": 1, "skipped": 0}
+    assert report["leagues"] == {"staged": 1, "inserted": 0, "updated": 1, "unchanged": 0, "skipped": 0}
+    assert report["league_seasons"] == {"staged": 2, "inserted": 0, "updated": 0, "unchanged": 1, "skipped": 1}
+    assert report["teams"] == {"staged": 2, "inserted": 1, "updated": 1, "unchanged": 0, "skipped": 0}
+    # Three statements per dimension plus one batched VALUES insert each
+    assert len(cur.queries) == 12
+    assert len(staged_rows) == 4
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+from etl.src.extraction_planner import (
+    build_work_items,
+    plan_work,
+    load_cursor,
+    save_cursor,
+    quota_paused_until,
+)
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    from backports.zoneinfo import ZoneInfo
+
+SEASON_ROWS = [
+    # country, league, api_league_id, season, league_season_id, is_current
+    ("Scotland", "Premiership", 179, 2024, 1, True),
+    ("England", "Premier League", 39, 2021, 2, False),
+    ("England", "Premier League", 39, 2024, 3, True),
+    ("Spain", "La Liga", 140, 2022, 4, False),
+]
+
+
+def test_updates_then_current_seasons_then_big_leagues():
+    items = build_work_items(SEASON_ROWS, [str(i) for i in range(25)])
+    selected, deferred = plan_work(items, budget=100)
+    assert [i["key"] for i in selected] == [
+        "update:0", "update:20",
+        "bootstrap:3", "bootstrap:1",
+        "bootstrap:2", "bootstrap:4",
+    ]
+    assert deferred == []
+    # Fixture ids are chunked to the API's ids-per-call limit
+    assert [len(i["ids"]) for i in selected[:2]] == [20, 5]
+
+
+def test_plan_spends_exactly_the_budget():
+    items = build_work_items(SEASON_ROWS, ["1", "2"])
+    selected, deferred = plan_work(items, budget=3)
+    assert sum(i["cost"] for i in selected) == 3
+    assert [i["key"] for i in deferred] == ["bootstrap:2", "bootstrap:4"]
+
+
+def test_deferred_items_go_first_within_their_tier():
+    items = build_work_items(SEASON_ROWS, [], deferred_keys={"bootstrap:4"})
+    selected, _ = plan_work(items, budget=3)
+    assert [i["key"] for i in selected] == ["bootstrap:3", "bootstrap:1", "bootstrap:4"]
+
+
+def test_cursor_round_trip(tmp_path):
+    path = str(tmp_path / "cursor.json")
+    assert load_cursor(path) == {}
+    save_cursor({"deferred": ["bootstrap:4"], "resume_after": None}, path)
+    assert load_cursor(path)["deferred"] == ["bootstrap:4"]
+
+
+def test_quota_paused_until():
+    future = datetime.now(ZoneInfo("UTC")) + timedelta(hours=3)
+    past = datetime.now(ZoneInfo("UTC")) - timedelta(minutes=1)
+    assert quota_paused_until({"resume_after": future.isoformat()}) == future
+    assert quota_paused_until({"resume_after": past.isoformat()}) is None
+    assert quota_paused_until({}) is None
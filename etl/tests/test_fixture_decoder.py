@@ -0,0 +1,55 @@
+from etl.src.extract_fixtures import extract_fixtures_field
+from etl.src.fixture_decoder import decode_fixture_columns, decode_fixtures_table, FIXTURE_COLUMNS
+
+RAW_FIXTURES = [
+    {
+        "fixture": {"id": 1035037, "date": "2023-08-11T19:00:00+00:00", "status": {"short": "FT"}},
+        "league": {"id": 39, "season": 2023},
+        "teams": {"home": {"id": 44, "name": "Burnley"}, "away": {"id": 50, "name": "Manchester City"}},
+        "score": {"halftime": {"home": 0, "away": 2}, "fulltime": {"home": 0, "away": 3}},
+    },
+    {
+        "fixture": {"id": 1035400, "date": "2024-05-19T15:00:00+00:00", "status": {}},
+        "league": {"id": 39, "season": 2023},
+        "teams": {"home": {"id": 50, "name": "Manchester City"}, "away": {"id": 48, "name": "West Ham"}},
+        "score": {"halftime": {"home": None, "away": None}, "fulltime": {"home": None, "away": None}},
+    },
+    # Missing score section: skipped by both paths
+    {
+        "fixture": {"id": 1035401, "date": "2024-05-19T15:00:00+00:00", "status": {"short": "NS"}},
+        "league": {"id": 39, "season": 2023},
+        "teams": {"home": {"id": 1, "name": "A"}, "away": {"id": 2, "name": "B"}},
+    },
+]
+
+
+def test_columns_match_dict_path():
+    columns, skipped = decode_fixture_columns(RAW_FIXTURES)
+    rows = extract_fixtures_field(RAW_FIXTURES)
+    assert skipped == 1
+    assert list(columns) == list(rows[0])
+    assert [dict(zip(FIXTURE_COLUMNS, values)) for values in zip(*columns.values())] == rows
+
+
+def test_table_is_typed():
+    table = decode_fixtures_table(RAW_FIXTURES)
+    assert table.num_rows == 2
+    assert str(table.schema.field("api_fixture_id").type) == "int64"
+    assert table.column("home_team_fulltime_goal").to_pylist() == [0, None]
+    assert table.column("fixture_status").to_pylist() == ["FT", "NS"]
+
+
+def test_malformed_records_are_skipped_and_counted():
+    good = RAW_FIXTURES[0]
+    malformed = [
+        "not a fixture",
+        {**good, "teams": ["Burnley", "Manchester City"]},
+        {**good, "fixture": {**good["fixture"], "status": "FT"}},
+        {**good, "fixture": {**good["fixture"], "id": "1035037x"}},
+        {**good, "score": {**good["score"], "fulltime": {"home": 2 ** 40, "away": 0}}},
+    ]
+    columns, skipped = decode_fixture_columns([good, *malformed, RAW_FIXTURES[1]])
+    assert skipped == len(malformed)
+    assert columns["api_fixture_id"] == [1035037, 1035400]
+    assert all(len(values) == 2 for values in columns.values())
+    assert decode_fixtures_table(malformed + [good]).num_rows == 1
@@ -0,0 +1,102 @@
+import pytest
+import etl.src.http_client as http_client
+from etl.src.http_client import TokenBucketLimiter, DailyQuotaExhausted
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_limiter(clock, per_minute=60, burst=1):
+    return TokenBucketLimiter(per_minute=per_minute, burst=burst, clock=clock, sleep=clock.sleep)
+
+
+def test_acquire_paces_requests_evenly(clock):
+    limiter = make_limiter(clock, per_minute=60)
+    for _ in range(4):
+        limiter.acquire()
+    # First call uses the initial token, the rest wait one second each
+    assert clock.sleeps == pytest.approx([1.0, 1.0, 1.0])
+    assert limiter.state()["calls_made"] == 4
+
+
+def test_update_seeds_rate_from_headers(clock):
+    limiter = make_limiter(clock, per_minute=60)
+    limiter.acquire()
+    limiter.update({
+        "x-ratelimit-limit": "300",
+        "x-ratelimit-remaining": "299",
+        "x-ratelimit-requests-limit": "7500",
+        "x-ratelimit-requests-remaining": "7000",
+    })
+    state = limiter.state()
+    assert state["rate_per_minute"] == 300
+    assert state["daily_limit"] == 7500
+    assert state["daily_remaining"] == 7000
+    limiter.acquire()
+    assert clock.sleeps == pytest.approx([0.2])
+    # Daily budget is decremented locally between header updates
+    assert limiter.state()["daily_remaining"] == 6999
+
+
+def test_update_clamps_tokens_to_server_remaining(clock):
+    limiter = make_limiter(clock, per_minute=60, burst=5)
+    limiter.update({"x-ratelimit-remaining": "0"})
+    assert limiter.state()["tokens"] == 0
+    limiter.acquire()
+    assert clock.sleeps == pytest.approx([1.0])
+
+
+def test_pause_blocks_for_retry_after(clock):
+    limiter = make_limiter(clock, per_minute=60)
+    limiter.pause(5)
+    assert limiter.state()["next_token_in"] == pytest.approx(5.0)
+    limiter.acquire()
+    assert sum(clock.sleeps) == pytest.approx(5.0)
+    assert limiter.state()["slept_seconds"] == pytest.approx(5.0)
+
+
+def test_malformed_headers_are_ignored(clock):
+    limiter = make_limiter(clock, per_minute=60)
+    limiter.update({"x-ratelimit-limit": "n/a", "x-ratelimit-remaining": None})
+    assert limiter.state()["rate_per_minute"] == 60
+
+
+def test_acquire_raises_when_daily_quota_spent(clock):
+    limiter = make_limiter(clock, per_minute=60)
+    limiter.update({"x-ratelimit-requests-remaining": "1"})
+    limiter.acquire()
+    with pytest.raises(DailyQuotaExhausted):
+        limiter.acquire()
+
+
+def test_get_session_grows_pool_without_closing_shared_session(monkeypatch):
+    monkeypatch.setattr(http_client, "_session", None)
+    monkeypatch.setattr(http_client, "_session_pool_size", 0)
+    session = http_client.get_session(pool_size=2)
+    closed = []
+    monkeypatch.setattr(session, "close", lambda: closed.append(True))
+    old_adapter = session.get_adapter("https://example.com")
+
+    assert http_client.get_session(pool_size=8) is session
+    assert closed == []
+    adapter = session.get_adapter("https://example.com")
+    assert adapter is not old_adapter
+    assert adapter._pool_maxsize == 8
+    # A smaller request keeps the larger pool
+    http_client.get_session(pool_size=4)
+    assert session.get_adapter("https://example.com") is adapter
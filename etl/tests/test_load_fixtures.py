@@ -0,0 +1,221 @@
+import io
+import os
+
+import pandas as pd
+import psycopg2
+import pytest
+
+import etl.src.config as config
+import etl.src.load_fixtures as load_fixtures
+from etl.src.cleaned_dataset import write_cleaned_dataset
+from etl.src.load_fixtures import staging_index_sql
+from etl.tests.test_copy_stream import decode_binary_copy
+
+TABLE_TYPES = {"api_fixture_id": "bigint", "season": "integer", "fixture_status": "text"}
+
+
+class FakeCursor:
+    """Answers the catalog queries load_to_db makes and records the rest."""
+
+    def __init__(self, table_columns, indexes=(), views=(), sequences=(), next_value=None):
+        self.table_columns = table_columns
+        self.indexes = list(indexes)
+        self.views = list(views)
+        self.sequences = list(sequences)
+        self.next_value = next_value
+        self.copied = None
+        self.copy_sql = None
+        self.sql = []
+
+    def execute(self, sql, params=None):
+        self.sql.append(sql)
+
+    def fetchone(self):
+        if "nextval" in self.sql[-1]:
+            return [self.next_value]
+        return [self.table_columns is not None]
+
+    def fetchall(self):
+        last = self.sql[-1]
+        if "pg_index" in last:
+            return self.indexes
+        if "pg_rewrite" in last:
+            return self.views
+        if "pg_get_serial_sequence" in last:
+            return self.sequences
+        return list(self.table_columns.items())
+
+    def copy_expert(self, sql, file, size=8192):
+        self.sql.append(sql)
+        self.copy_sql = sql
+        self.copied = b"".join(iter(lambda: file.read(size), b""))
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    df = pd.DataFrame({
+        "api_fixture_id": pd.array([2, 1, 3], dtype="Int64"),
+        "season": pd.array([2023, 2023, 2022], dtype="Int64"),
+        "fixture_status": pd.Categorical(["FT", "NS", "FT"]),
+        "kickoff_utc": pd.to_datetime(["2023-08-12", "2023-08-11", "2022-08-10"], utc=True),
+        "country": pd.Categorical(["England"] * 3),
+        "league": pd.Categorical(["Premier League"] * 3),
+    })
+    path = tmp_path / "cleaned_fixtures_full_20240101_000000"
+    write_cleaned_dataset(df, str(path))
+    return str(path)
+
+
+def connect(monkeypatch, cursor):
+    conn = FakeConnection(cursor)
+    monkeypatch.setattr(load_fixtures.psycopg2, "connect", lambda **kwargs: conn)
+    return conn
+
+
+def test_load_to_db_streams_dataset_columns_the_table_has(dataset_path, monkeypatch):
+    cursor = FakeCursor(TABLE_TYPES)
+    conn = connect(monkeypatch, cursor)
+    monkeypatch.setattr(load_fixtures.config, "LOAD_BATCH_ROWS", 1)
+
+    load_fixtures.load_to_db(dataset_path, filters=[("season", "=", 2023)], mode="truncate")
+
+    assert cursor.copy_sql == "COPY raw.raw_fixtures (api_fixture_id, fixture_status, season) FROM STDIN WITH CSV"
+    loaded = pd.read_csv(io.BytesIO(cursor.copied), names=["api_fixture_id", "fixture_status", "season"])
+    assert sorted(loaded["api_fixture_id"]) == [1, 2]
+    assert set(loaded["season"]) == {2023}
+    assert "TRUNCATE TABLE raw.raw_fixtures;" in cursor.sql
+    assert conn.commits == 1
+
+    monkeypatch.setattr(load_fixtures.config, "LOAD_COPY_FORMAT", "binary")
+    load_fixtures.load_to_db(dataset_path, mode="truncate")
+    assert cursor.copy_sql.endswith("FROM STDIN WITH (FORMAT binary)")
+    rows = decode_binary_copy(cursor.copied, ["bigint", "text", "integer"])
+    assert sorted(rows) == [(1, "NS", 2023), (2, "FT", 2023), (3, "FT", 2022)]
+
+
+def test_swap_mode_loads_staging_and_renames_it_into_place(dataset_path, monkeypatch):
+    cursor = FakeCursor(
+        TABLE_TYPES,
+        indexes=[
+            ("raw_fixtures_pkey", "CREATE UNIQUE INDEX raw_fixtures_pkey ON raw.raw_fixtures USING btree (api_fixture_id)", "raw_fixtures_pkey", "p"),
+            ("raw_fixtures_season_idx", "CREATE INDEX raw_fixtures_season_idx ON raw.raw_fixtures USING btree (season)", None, None),
+        ],
+        views=[("stg.stg_raw_fixtures", " SELECT api_fixture_id FROM raw.raw_fixtures;")],
+        sequences=[("fixture_id", "raw.raw_fixtures_fixture_id_seq", "")],
+    )
+    conn = connect(monkeypatch, cursor)
+
+    load_fixtures.load_to_db(dataset_path, mode="swap")
+
+    statements = [sql for sql in cursor.sql if not sql.startswith("SELECT")]
+    assert statements == [
+        "CREATE SCHEMA IF NOT EXISTS raw;",
+        "DROP TABLE IF EXISTS raw.raw_fixtures_staging;",
+        "CREATE TABLE raw.raw_fixtures_staging (LIKE raw.raw_fixtures INCLUDING ALL EXCLUDING INDEXES);",
+        "COPY raw.raw_fixtures_staging (api_fixture_id, fixture_status, season) FROM STDIN WITH CSV",
+        "CREATE UNIQUE INDEX raw_fixtures_pkey_staging ON raw.raw_fixtures_staging USING btree (api_fixture_id);",
+        "ALTER TABLE raw.raw_fixtures_staging ADD CONSTRAINT raw_fixtures_pkey_staging PRIMARY KEY USING INDEX raw_fixtures_pkey_staging;",
+        "CREATE INDEX raw_fixtures_season_idx_staging ON raw.raw_fixtures_staging USING btree (season);",
+        "ANALYZE raw.raw_fixtures_staging;",
+        "SET LOCAL lock_timeout = %s;",
+        "ALTER SEQUENCE raw.raw_fixtures_fixture_id_seq OWNED BY raw.raw_fixtures_staging.fixture_id;",
+        "DROP TABLE IF EXISTS raw.raw_fixtures_archive;",
+        "ALTER TABLE raw.raw_fixtures RENAME TO raw_fixtures_archive;",
+        "ALTER INDEX raw.raw_fixtures_pkey RENAME TO raw_fixtures_pkey_archive;",
+        "ALTER INDEX raw.raw_fixtures_season_idx RENAME TO raw_fixtures_season_idx_archive;",
+        "ALTER TABLE raw.raw_fixtures_staging RENAME TO raw_fixtures;",
+        "ALTER INDEX raw.raw_fixtures_pkey_staging RENAME TO raw_fixtures_pkey;",
+        "ALTER INDEX raw.raw_fixtures_season_idx_staging RENAME TO raw_fixtures_season_idx;",
+        "CREATE OR REPLACE VIEW stg.stg_raw_fixtures AS  SELECT api_fixture_id FROM raw.raw_fixtures;",
+    ]
+    # Staging build and swap commit separately, so the swap holds locks briefly
+    assert conn.commits == 2
+
+
+def test_swap_mode_continues_identity_numbering(dataset_path, monkeypatch):
+    cursor = FakeCursor(
+        TABLE_TYPES, sequences=[("fixture_id", "raw.raw_fixtures_fixture_id_seq", "d")], next_value=1001
+    )
+    connect(monkeypatch, cursor)
+    load_fixtures.load_to_db(dataset_path, mode="swap")
+    assert "ALTER TABLE raw.raw_fixtures_staging ALTER COLUMN fixture_id RESTART WITH 1001;" in cursor.sql
+    assert not any(sql.startswith("ALTER SEQUENCE") for sql in cursor.sql)
+
+
+def test_swap_mode_loads_a_new_table_directly(dataset_path, monkeypatch):
+    cursor = FakeCursor(None)
+    connect(monkeypatch, cursor)
+    load_fixtures.load_to_db(dataset_path, mode="swap")
+    assert cursor.copy_sql.startswith("COPY raw.raw_fixtures (")
+    assert not any("staging" in sql for sql in cursor.sql)
+
+
+def test_unknown_load_mode_is_rejected(dataset_path):
+    with pytest.raises(ValueError, match="load mode"):
+        load_fixtures.load_to_db(dataset_path, mode="merge")
+
+
+def test_staging_index_sql_renames_index_and_table():
+    assert staging_index_sql(
+        "CREATE INDEX idx ON ONLY raw.raw_fixtures USING btree (season, kickoff_utc)", "idx_staging", "raw_fixtures_staging"
+    ) == "CREATE INDEX idx_staging ON ONLY raw.raw_fixtures_staging USING btree (season, kickoff_utc)"
+    with pytest.raises(ValueError):
+        staging_index_sql("ALTER TABLE x", "idx", "t")
+
+
+@pytest.fixture
+def pg_cursor():
+    if not os.getenv("DB_HOST"):
+        pytest.skip("DB_HOST not set; no Postgres to test against")
+    try:
+        conn = psycopg2.connect(**config.DB_CONFIG, connect_timeout=5)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"Postgres unavailable: {e}")
+    conn.autocommit = True
+    cur = conn.cursor()
+    cur.execute("CREATE SCHEMA IF NOT EXISTS raw;")
+    yield cur
+    for suffix in ("", "_staging", "_archive"):
+        cur.execute(f"DROP TABLE IF EXISTS raw.swap_test_fixtures{suffix};")
+    conn.close()
+
+
+@pytest.mark.parametrize("surrogate", ["serial", "bigint GENERATED BY DEFAULT AS IDENTITY"])
+def test_consecutive_swaps_keep_surrogate_keys_working(pg_cursor, dataset_path, surrogate):
+    pg_cursor.execute(
+        f"CREATE TABLE raw.swap_test_fixtures (fixture_id {surrogate} PRIMARY KEY, "
+        "api_fixture_id bigint UNIQUE, season integer, fixture_status text, kickoff_utc timestamptz);"
+    )
+    previous_max = 0
+    # The second swap drops the first one's archive, which used to own the sequence
+    for _ in range(3):
+        load_fixtures.load_to_db(dataset_path, table_name="swap_test_fixtures", mode="swap")
+        pg_cursor.execute("SELECT min(fixture_id), max(fixture_id), count(*) FROM raw.swap_test_fixtures;")
+        low, high, rows = pg_cursor.fetchone()
+        assert rows == 3
+        # Ids keep increasing across loads instead of restarting at 1
+        assert low > previous_max
+        previous_max = high
+    pg_cursor.execute("INSERT INTO raw.swap_test_fixtures (api_fixture_id) VALUES (99) RETURNING fixture_id;")
+    assert pg_cursor.fetchone()[0] > previous_max
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from etl.src.load_updates import get_changed_ids
+from etl.src.transform_fixtures import parse_kickoff
+
+
+def make_status(ids, statuses, kickoffs):
+    return pd.DataFrame({"api_fixture_id": ids, "fixture_status": statuses, "kickoff_utc": kickoffs})
+
+
+def test_get_changed_ids_compares_kickoff_instants():
+    base = make_status(
+        [1, 2, 3, 4],
+        ["NS", "NS", "NS", "NS"],
+        parse_kickoff(pd.Series(["2023-08-11T19:00:00+00:00", "2023-08-12T19:00:00+00:00", None, None])),
+    )
+    # Same instant in another format, a real reschedule, and a kickoff still unknown
+    updates = make_status(
+        [1, 2, 3, 4],
+        ["NS", "NS", "NS", "FT"],
+        ["2023-08-11T21:00:00+02:00", "2023-08-13T19:00:00+00:00", None, None],
+    )
+    assert sorted(get_changed_ids(base, updates)) == [2, 4]
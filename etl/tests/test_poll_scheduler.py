@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from etl.src.poll_scheduler import select_poll_ids, record_polls, load_poll_state, save_poll_state
+
+NOW = datetime(2024, 5, 19, 18, 0, tzinfo=ZoneInfo("UTC"))
+
+
+def kicked_off(minutes_ago):
+    return NOW - timedelta(minutes=minutes_ago)
+
+
+def test_only_likely_finished_fixtures_are_due():
+    pending = [("1", kicked_off(120), "2H"), ("2", kicked_off(60), "2H"), ("3", kicked_off(110), "NS")]
+    assert select_poll_ids(pending, {}, NOW) == ["1", "3"]
+
+
+def test_unfinished_fixture_is_retried_with_backoff():
+    state = {}
+    pending = [("1", kicked_off(120), "2H")]
+    record_polls(state, ["1"], [{"api_fixture_id": 1, "fixture_status": "ET"}], NOW)
+    assert select_poll_ids(pending, state, NOW + timedelta(minutes=10)) == []
+    assert select_poll_ids(pending, state, NOW + timedelta(minutes=15)) == ["1"]
+    record_polls(state, ["1"], [{"api_fixture_id": 1, "fixture_status": "P"}], NOW + timedelta(minutes=15))
+    # Second retry waits twice as long
+    assert select_poll_ids(pending, state, NOW + timedelta(minutes=40)) == []
+    assert select_poll_ids(pending, state, NOW + timedelta(minutes=45)) == ["1"]
+
+
+def test_postponed_fixture_backs_off_exponentially_until_rescheduled():
+    state = {}
+    pending = [("7", kicked_off(3 * 24 * 60), "PST")]
+    polled_at = NOW
+    for attempt, hours in enumerate([6, 12, 24, 48], start=1):
+        record_polls(state, ["7"], [{"api_fixture_id": 7, "fixture_status": "PST"}], polled_at)
+        assert state["7"]["attempts"] == attempt
+        assert select_poll_ids(pending, state, polled_at + timedelta(hours=hours) - timedelta(minutes=1)) == []
+        polled_at += timedelta(hours=hours)
+        assert select_poll_ids(pending, state, polled_at) == ["7"]
+
+    # A new kickoff after the last poll resets the schedule to that kickoff
+    rescheduled = [("7", polled_at + timedelta(days=1), "NS")]
+    assert select_poll_ids(rescheduled, state, polled_at + timedelta(hours=12)) == []
+    assert select_poll_ids(rescheduled, state, polled_at + timedelta(days=1, minutes=110)) == ["7"]
+
+
+def test_finished_and_no_longer_pending_fixtures_leave_the_schedule(tmp_path):
+    state = {"9": {"attempts": 2, "last_polled_at": NOW.isoformat(), "status": "PST"}}
+    record_polls(state, ["1"], [{"api_fixture_id": 1, "fixture_status": "FT", "home_team_fulltime_goal": 2}], NOW)
+    assert "1" not in state
+    select_poll_ids([("1", kicked_off(200), "FT")], state, NOW)
+    assert state == {}
+
+    path = str(tmp_path / "poll_state.json")
+    save_poll_state({"3": {"attempts": 1, "last_polled_at": NOW.isoformat()}}, path)
+    assert load_poll_state(path)["3"]["attempts"] == 1
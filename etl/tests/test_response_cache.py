@@ -0,0 +1,65 @@
+import pytest
+from etl.src.response_cache import ResponseCache, cache_key
+
+PAYLOAD = [{"team": {"id": 33, "name": "Manchester United", "code": "MUN"}}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), clock=clock)
+    yield cache
+    cache.close()
+
+
+def test_cache_key_normalizes_params():
+    assert cache_key("teams", {"league": 39, "season": 2023}) == cache_key("teams", {"season": "2023", "league": "39"})
+    assert cache_key("teams", {"league": 39}) != cache_key("leagues", {"league": 39})
+
+
+def test_miss_then_hit(cache):
+    params = {"league": 39, "season": 2023}
+    assert cache.get("teams", params, ttl=None) is None
+    cache.put("teams", params, PAYLOAD)
+    assert cache.get("teams", params, ttl=None) == PAYLOAD
+    assert cache.stats() == {"hits": 1, "misses": 1, "writes": 1}
+
+
+def test_ttl_expiry(cache, clock):
+    params = {"league": 39, "season": 2024}
+    cache.put("teams", params, PAYLOAD)
+    clock.now += 3600
+    assert cache.get("teams", params, ttl=86400) == PAYLOAD
+    clock.now += 86400
+    assert cache.get("teams", params, ttl=86400) is None
+    # No TTL means the entry never expires
+    assert cache.get("teams", params, ttl=None) == PAYLOAD
+
+
+def test_refresh_skips_reads(cache):
+    params = {"country": "England", "name": "Premier League"}
+    cache.put("leagues", params, PAYLOAD)
+    cache.refresh = True
+    assert cache.get("leagues", params, ttl=None) is None
+
+
+def test_entries_persist_across_instances(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite")
+    first = ResponseCache(path, clock=clock)
+    first.put("teams", {"league": 39, "season": 2022}, PAYLOAD)
+    first.close()
+    second = ResponseCache(path, clock=clock)
+    assert second.get("teams", {"league": 39, "season": 2022}, ttl=None) == PAYLOAD
+    second.close()
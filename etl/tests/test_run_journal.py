@@ -0,0 +1,40 @@
+from etl.src.run_journal import RunJournal, DONE, SAVED
+
+
+def test_fresh_run_truncates_and_resume_reads_back(tmp_path):
+    journal = RunJournal("job", directory=str(tmp_path))
+    journal.record("England/Premier League/2023")
+    journal.record("league_season:7", SAVED, fixtures=380)
+
+    resumed = RunJournal("job", resume=True, directory=str(tmp_path))
+    assert resumed.is_done("England/Premier League/2023")
+    assert resumed.status("league_season:7") == SAVED
+    assert not resumed.is_done("England/Premier League/2024")
+    assert resumed.counts() == {DONE: 1, SAVED: 1}
+
+    fresh = RunJournal("job", directory=str(tmp_path))
+    assert fresh.status("England/Premier League/2023") is None
+
+
+def test_last_status_wins_and_torn_lines_are_ignored(tmp_path):
+    journal = RunJournal("job", directory=str(tmp_path))
+    journal.record("league_season:7", SAVED)
+    journal.record("league_season:7", DONE)
+    with open(journal.path, "a") as f:
+        f.write('{"unit": "league_season:8", "sta')
+
+    resumed = RunJournal("job", resume=True, directory=str(tmp_path))
+    assert resumed.status("league_season:7") == DONE
+    assert resumed.status("league_season:8") is None
+
+
+def test_messages_go_to_the_given_logger(tmp_path):
+    messages = []
+
+    class Logger:
+        def info(self, message):
+            messages.append(message)
+
+    RunJournal("job", directory=str(tmp_path)).record("league_season:7")
+    RunJournal("job", resume=True, directory=str(tmp_path), logger=Logger())
+    assert len(messages) == 1 and "1 units journaled" in messages[0]
@@ -0,0 +1,124 @@
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import etl.src.config as config
+import etl.src.transform_arrow as ta
+import etl.src.transform_fixtures as tf
+from etl.src.cleaned_dataset import read_cleaned_dataset, write_cleaned_dataset, write_cleaned_table
+
+# (status, home ft, away ft, home ht, away ht)
+RESULT_CASES = [
+    ("FT", 2, 0, 1, 0),
+    ("FT", 1, 1, None, None),
+    ("ft", 0, 3, 0, 2),
+    ("WO", 3, 0, None, None),
+    ("AWD", 0, 3, 0, 0),
+    ("AB", 1, 1, 0, 0),
+    ("NS", None, None, None, None),
+    ("FT", None, None, None, None),
+    ("PST", 2, 1, 1, 1),
+]
+
+
+def fixture_rows(first_id, league_id, season):
+    return [
+        {
+            "api_fixture_id": first_id + i, "api_league_id": league_id, "season": season,
+            "kickoff_utc": f"2023-08-{11 + i:02d}T19:00:00+00:00", "fixture_status": status,
+            "home_team_id": 10 + i, "home_team_name": f"Home {i % 3}",
+            "away_team_id": 20 + i, "away_team_name": f"Away {i % 2}",
+            "home_team_halftime_goal": hht, "away_team_halftime_goal": aht,
+            "home_team_fulltime_goal": hft, "away_team_fulltime_goal": aft,
+        }
+        for i, (status, hft, aft, hht, aht) in enumerate(RESULT_CASES)
+    ]
+
+
+@pytest.fixture
+def fixtures_dir(tmp_path):
+    base = tmp_path / "fixtures"
+    for country, league, season, first_id, league_id in [
+        ("England", "Premier League", 2023, 100, 39),
+        ("England", "Premier League", 2022, 200, 39),
+        ("Spain", "La Liga", 2023, 300, 140),
+    ]:
+        folder = base / country / league / str(season)
+        folder.mkdir(parents=True)
+        (folder / "fixtures.json").write_text(json.dumps(fixture_rows(first_id, league_id, season), indent=4))
+    return base
+
+
+def read_sorted(path):
+    return read_cleaned_dataset(str(path)).sort_values("api_fixture_id").reset_index(drop=True)
+
+
+def assert_same_output(pandas_path, arrow_path):
+    expected, actual = read_sorted(pandas_path), read_sorted(arrow_path)
+    assert list(actual.columns) == list(expected.columns)
+    # Category order follows first appearance on the Arrow side; values and dtypes must match
+    pd.testing.assert_frame_equal(actual, expected, check_categorical=False)
+
+
+def test_full_mode_matches_pandas(tmp_path, fixtures_dir):
+    expected = tf.clean_fixtures(tf.load_full_fixtures(str(fixtures_dir), max_workers=1))
+    write_cleaned_dataset(expected, str(tmp_path / "pandas"))
+
+    table = ta.clean_table(ta.load_fixtures(is_update=False, base_dir=str(fixtures_dir)))
+    write_cleaned_table(table, str(tmp_path / "arrow"))
+
+    assert_same_output(tmp_path / "pandas", tmp_path / "arrow")
+    assert sorted(p.name for p in (tmp_path / "arrow").iterdir()) == ["country=England", "country=Spain"]
+
+
+def test_update_mode_matches_pandas(tmp_path, monkeypatch):
+    update_json = tmp_path / "fixture_updates.json"
+    update_json.write_text(json.dumps(fixture_rows(500, 39, 2023) + fixture_rows(600, 140, 2024)))
+    monkeypatch.setattr(config, "FIXTURE_UPDATES_JSON", str(update_json))
+
+    expected = tf.clean_fixtures(tf.load_updated_fixtures(str(update_json)))
+    write_cleaned_dataset(expected, str(tmp_path / "pandas"))
+    write_cleaned_table(ta.clean_table(ta.load_fixtures(is_update=True)), str(tmp_path / "arrow"))
+
+    assert_same_output(tmp_path / "pandas", tmp_path / "arrow")
+
+
+def test_stage_functions_match_fused_plan(fixtures_dir):
+    table = ta.load_fixtures(is_update=False, base_dir=str(fixtures_dir))
+    staged = ta.compute_results(ta.cast_numeric_columns(table))
+    assert staged.equals(ta.clean_table(table))
+    assert staged.schema.field("home_team_fulltime_goal").type == "int8"
+
+
+def test_kickoff_parsing_matches_pandas():
+    kickoffs = [
+        "2023-08-11T19:00:00+00:00", "2023-08-11T21:00:00+02:00", "2023-08-11T19:00:00Z", None, "TBD",
+        "2023-08-12T14:00:00.000Z", "2023-08-12T14:00:00.250+01:00", "2023-08-12 14:00:00", "2023-08-12T14:00:00",
+    ]
+    table = ta.cast_numeric_columns(pa.table({"kickoff_utc": kickoffs}))
+    assert table.schema.field("kickoff_utc").type == ta.ARROW_KICKOFF_TYPE
+    expected = tf.parse_kickoff(pd.Series(kickoffs))
+    pd.testing.assert_series_equal(table["kickoff_utc"].to_pandas(), expected, check_names=False)
+
+
+@pytest.mark.parametrize("backend", ["pandas", "arrow"])
+def test_transform_fixtures_backend_flag(tmp_path, fixtures_dir, monkeypatch, backend):
+    out_dir = tmp_path / "cleaned"
+    monkeypatch.setattr(tf, "CLEANED_DATA_DIR", str(out_dir))
+    monkeypatch.setattr(config, "FIXTURES_PATH", str(fixtures_dir))
+    # The pandas loader binds its base_dir default at import time
+    load_full = tf.load_full_fixtures
+    monkeypatch.setattr(tf, "load_full_fixtures", lambda: load_full(str(fixtures_dir), max_workers=1))
+
+    assert tf.transform_fixtures(incremental=False, backend=backend) == 3 * len(RESULT_CASES)
+    (dataset,) = out_dir.iterdir()
+    df = read_cleaned_dataset(str(dataset))
+    # FT (3 rows with scores), WO and AWD get a fulltime result in each file
+    assert df["home_fulltime_result"].notna().sum() == 3 * 5
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        tf.transform_fixtures(backend="spark")
@@ -1,11 +1,15 @@
 
 
+import json
+
+import numpy as np
 import pandas as pd
 import pytest
 from etl.src.transform_fixtures import (
     handle_special_results,
     compute_game_results,
-    compute_results
+    compute_results,
+    load_full_fixtures
 )
 
 def make_df(status, h_ft, a_ft, h_ht=None, a_ht=None):
@@ -55,24 +59,233 @@ def test_compute_results_integration():
     # Row1: WO
     assert df2.at[1, "home_fulltime_result"] == "win"
     # Row2: AB
-    assert df2.at[2, "home_fulltime_result"] is None
+    assert pd.isna(df2.at[2, "home_fulltime_result"])
     # Row3: no scores
-    assert df2.at[3, "home_fulltime_result"] is pd.NA or df2.at[3, "home_fulltime_result"] is None
+    assert pd.isna(df2.at[3, "home_fulltime_result"])
 
     # Row1: WO should have no halftime results
     assert pd.isna(df2.at[1, "home_halftime_result"])
     assert pd.isna(df2.at[1, "away_halftime_result"])
 
-    # Row2: AB should have all results None
+    # Row2: AB should have all results missing
     for col in [
         "home_fulltime_result", "away_fulltime_result",
         "home_halftime_result", "away_halftime_result"
     ]:
-        assert df2.at[2, col] is None
+        assert pd.isna(df2.at[2, col])
 
     # Row3: FT with no scores should have NA results
     for col in [
         "home_fulltime_result", "away_fulltime_result",
         "home_halftime_result", "away_halftime_result"
     ]:
-        assert pd.isna(df2.at[3, col])
\ No newline at end of file
+        assert pd.isna(df2.at[3, col])
+
+
+def write_fixture_file(base, country, league, season, fixture_ids):
+    folder = base / country / league / season
+    folder.mkdir(parents=True)
+    rows = [
+        {
+            "api_fixture_id": fid, "api_league_id": 39, "season": 1900,
+            "kickoff_utc": "2023-08-11T19:00:00+00:00", "fixture_status": "FT",
+            "home_team_id": 1, "home_team_name": "Home", "away_team_id": 2, "away_team_name": "Away",
+            "home_team_halftime_goal": 1, "away_team_halftime_goal": None,
+            "home_team_fulltime_goal": 2, "away_team_fulltime_goal": 1,
+        }
+        for fid in fixture_ids
+    ]
+    (folder / "fixtures.json").write_text(json.dumps(rows, indent=4))
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_load_full_fixtures_keeps_path_columns(tmp_path, max_workers):
+    write_fixture_file(tmp_path, "England", "Premier League", "2023", [1, 2])
+    write_fixture_file(tmp_path, "Spain", "La Liga", "2022", [3])
+    (tmp_path / "Spain" / "La Liga" / "2021").mkdir()
+    (tmp_path / "Spain" / "La Liga" / "2021" / "fixtures.json").write_text("not json")
+
+    df = load_full_fixtures(str(tmp_path), max_workers=max_workers).sort_values("api_fixture_id")
+
+    assert df["api_fixture_id"].tolist() == [1, 2, 3]
+    # Season comes from the folder, not the payload
+    assert df["season"].tolist() == [2023, 2023, 2022]
+    assert isinstance(df["country"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["league"].dtype, pd.CategoricalDtype)
+    assert df["country"].astype(str).tolist() == ["England", "England", "Spain"]
+    assert df["league"].astype(str).tolist() == ["Premier League", "Premier League", "La Liga"]
+    assert df["away_team_halftime_goal"].isna().all()
+
+
+def test_load_full_fixtures_empty_dir(tmp_path):
+    assert load_full_fixtures(str(tmp_path)).empty
+
+
+def test_incremental_transform_only_rereads_changed_files(tmp_path, monkeypatch):
+    import etl.src.transform_fixtures as tf
+
+    fixtures_dir, cache_dir = tmp_path / "fixtures", tmp_path / "cache"
+    write_fixture_file(fixtures_dir, "England", "Premier League", "2023", [1, 2])
+    write_fixture_file(fixtures_dir, "Spain", "La Liga", "2022", [3])
+
+    read_paths = []
+    real_read = tf.read_fixture_files
+
+    def tracking_read(paths, max_workers=None):
+        read_paths.extend(paths)
+        return real_read(paths, max_workers=1)
+
+    monkeypatch.setattr(tf, "read_fixture_files", tracking_read)
+
+    first = tf.transform_full_incremental(str(fixtures_dir), str(cache_dir))
+    assert len(read_paths) == 2
+    expected = tf.clean_fixtures(tf.load_full_fixtures(str(fixtures_dir), max_workers=1))
+    pd.testing.assert_frame_equal(
+        first.sort_values("api_fixture_id").reset_index(drop=True),
+        expected.sort_values("api_fixture_id").reset_index(drop=True),
+        check_categorical=False,
+        check_dtype=False,
+    )
+
+    # Nothing changed: everything comes from the cache
+    read_paths.clear()
+    second = tf.transform_full_incremental(str(fixtures_dir), str(cache_dir))
+    assert read_paths == []
+    assert sorted(second["api_fixture_id"].tolist()) == [1, 2, 3]
+    assert second["home_fulltime_result"].tolist() == ["win"] * 3
+
+    # One league-season changes, another disappears
+    (fixtures_dir / "England" / "Premier League" / "2023" / "fixtures.json").unlink()
+    (fixtures_dir / "England" / "Premier League" / "2023").rmdir()
+    write_fixture_file(fixtures_dir, "England", "Premier League", "2024", [4])
+    spain = fixtures_dir / "Spain" / "La Liga" / "2022" / "fixtures.json"
+    spain.unlink()
+    spain.parent.rmdir()
+    write_fixture_file(fixtures_dir, "Spain", "La Liga", "2022", [3, 5])
+
+    read_paths.clear()
+    third = tf.transform_full_incremental(str(fixtures_dir), str(cache_dir))
+    assert len(read_paths) == 2
+    assert sorted(third["api_fixture_id"].tolist()) == [3, 4, 5]
+    assert not (cache_dir / "partitions" / "England" / "Premier League" / "2023" / "fixtures.parquet").exists()
+
+
+def test_clean_fixtures_uses_compact_dtypes_and_round_trips(tmp_path):
+    from etl.src.cleaned_dataset import read_cleaned_dataset, write_cleaned_dataset
+    from etl.src.transform_fixtures import RESULT_DTYPE, clean_fixtures, memory_report
+
+    write_fixture_file(tmp_path / "fixtures", "England", "Premier League", "2023", [1, 2, 3])
+    df = clean_fixtures(load_full_fixtures(str(tmp_path / "fixtures"), max_workers=1))
+
+    assert df["home_fulltime_result"].dtype == RESULT_DTYPE
+    assert df["home_fulltime_result"].tolist() == ["win"] * 3
+    assert isinstance(df["fixture_status"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["home_team_name"].dtype, pd.CategoricalDtype)
+    assert str(df["home_team_fulltime_goal"].dtype) == "Int8"
+    assert df["home_halftime_result"].isna().all()
+    assert str(df["kickoff_utc"].dtype) == "datetime64[ns, UTC]"
+
+    report = memory_report(df)
+    assert report.loc["home_fulltime_result", "dtype_before"] == "object"
+    assert report.loc["TOTAL", "bytes_after"] < report.loc["TOTAL", "bytes_before"]
+
+    # Parquet keeps the compact types: dictionary columns and int8 goals
+    path = tmp_path / "cleaned_fixtures_full_20240101_000000"
+    write_cleaned_dataset(df, str(path))
+    back = read_cleaned_dataset(str(path))
+    assert str(back["home_team_fulltime_goal"].dtype) == "Int8"
+    assert isinstance(back["home_fulltime_result"].dtype, pd.CategoricalDtype)
+    assert back["kickoff_utc"].dtype == df["kickoff_utc"].dtype
+
+
+def test_parse_kickoff_normalizes_offsets_to_utc():
+    from etl.src.transform_fixtures import KICKOFF_DTYPE, parse_kickoff
+
+    parsed = parse_kickoff(pd.Series(["2023-08-11T19:00:00+00:00", "2023-08-11T21:00:00+02:00", "2023-08-11T19:00:00Z", None, "TBD"]))
+    assert parsed.dtype == KICKOFF_DTYPE
+    assert parsed.iloc[:3].nunique() == 1
+    assert parsed.iloc[3:].isna().all()
+    assert parse_kickoff(parsed) is parsed
+
+
+def random_fixtures(seed, rows, goal_dtype="Int64", status_dtype=object):
+    """Random statuses (mixed case, missing) and goals (some missing)."""
+    rng = np.random.default_rng(seed)
+    statuses = np.array(["FT", "ft", "WO", "awd", "AWD", "AB", "NS", "PST", None], dtype=object)
+
+    def goals():
+        values = pd.array(rng.integers(0, 6, rows), dtype=goal_dtype)
+        values[rng.random(rows) < 0.15] = pd.NA
+        return values
+
+    return pd.DataFrame({
+        "fixture_status": pd.Series(statuses[rng.integers(0, len(statuses), rows)]).astype(status_dtype),
+        "home_team_fulltime_goal": goals(),
+        "away_team_fulltime_goal": goals(),
+        "home_team_halftime_goal": goals(),
+        "away_team_halftime_goal": goals(),
+    })
+
+
+def legacy_results(df):
+    """The previous compute_results: None-initialised columns, then the masked passes."""
+    for col in ["home_fulltime_result", "away_fulltime_result", "home_halftime_result", "away_halftime_result"]:
+        df[col] = None
+    return compute_game_results(handle_special_results(df))
+
+
+@pytest.mark.parametrize("seed", range(25))
+@pytest.mark.parametrize("goal_dtype, status_dtype", [("Int64", object), ("Int8", "category")])
+def test_compute_results_matches_reference(seed, goal_dtype, status_dtype):
+    df = random_fixtures(seed, rows=int(np.random.default_rng(seed).integers(1, 400)),
+                         goal_dtype=goal_dtype, status_dtype=status_dtype)
+    expected = legacy_results(random_fixtures(seed, len(df)))
+    actual = compute_results(df)
+    for col in ["home_fulltime_result", "away_fulltime_result", "home_halftime_result", "away_halftime_result"]:
+        assert [None if pd.isna(v) else v for v in actual[col]] == \
+               [None if pd.isna(v) else v for v in expected[col]], col
+
+
+def test_streaming_transform_matches_in_memory_and_cleans_one_file_at_a_time(tmp_path, monkeypatch):
+    import etl.src.transform_fixtures as tf
+    from etl.src.cleaned_dataset import read_cleaned_dataset
+
+    fixtures_dir = tmp_path / "fixtures"
+    write_fixture_file(fixtures_dir, "England", "Premier League", "2023", [1, 2, 3])
+    write_fixture_file(fixtures_dir, "England", "Premier League", "2022", [4])
+    write_fixture_file(fixtures_dir, "Spain", "La Liga", "2023", [5, 6])
+    monkeypatch.setattr(tf, "CLEANED_DATA_DIR", str(tmp_path / "streamed"))
+    monkeypatch.setattr(tf, "CLEANED_CSV_ENABLED", True)
+
+    batch_sizes = []
+    real_clean = tf.clean_fixtures
+
+    def tracking_clean(df):
+        batch_sizes.append(len(df))
+        return real_clean(df)
+
+    monkeypatch.setattr(tf, "clean_fixtures", tracking_clean)
+    assert tf.transform_full_streaming(str(fixtures_dir)) == 6
+    assert sorted(batch_sizes) == [1, 2, 3]
+
+    (csv_file,) = (tmp_path / "streamed").glob("*.csv")
+    (dataset,) = [p for p in (tmp_path / "streamed").iterdir() if p.is_dir()]
+    csv = pd.read_csv(csv_file)
+    assert sorted(csv["api_fixture_id"]) == [1, 2, 3, 4, 5, 6]
+    assert list(csv.columns).count("api_fixture_id") == 1
+
+    expected = real_clean(tf.load_full_fixtures(str(fixtures_dir), max_workers=1))
+    tf.write_cleaned_dataset(expected, str(tmp_path / "in_memory"))
+    pd.testing.assert_frame_equal(
+        read_cleaned_dataset(str(dataset)).sort_values("api_fixture_id").reset_index(drop=True),
+        read_cleaned_dataset(str(tmp_path / "in_memory")).sort_values("api_fixture_id").reset_index(drop=True),
+        check_categorical=False,
+    )
+
+
+def test_streaming_transform_without_files_writes_nothing(tmp_path, monkeypatch):
+    import etl.src.transform_fixtures as tf
+
+    monkeypatch.setattr(tf, "CLEANED_DATA_DIR", str(tmp_path / "out"))
+    assert tf.transform_full_streaming(str(tmp_path / "missing")) == 0
+    assert list((tmp_path / "out").iterdir()) == []
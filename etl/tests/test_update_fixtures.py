@@ -0,0 +1,158 @@
+import pytest
+import etl.src.http_client as http_client
+import etl.src.update_fixtures as update_fixtures_mod
+from etl.src.http_client import TokenBucketLimiter
+from etl.src.update_fixtures import update_by_ids, plan_update_strategy, MAX_IDS_PER_CALL
+
+IDS = [str(i) for i in range(1000, 1045)]
+
+
+def fixture_payload(fixture_id):
+    return {
+        "fixture": {"id": int(fixture_id), "date": "2024-05-19T15:00:00+00:00", "status": {"short": "FT"}},
+        "league": {"id": 39, "name": "Premier League", "country": "England", "season": 2023, "round": "Regular Season - 38"},
+        "teams": {"home": {"id": 33, "name": "Manchester United"}, "away": {"id": 40, "name": "Liverpool"}},
+        "goals": {"home": 1, "away": 1},
+        "score": {"halftime": {"home": 0, "away": 1}, "fulltime": {"home": 1, "away": 1}},
+    }
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(update_fixtures_mod, "get_session", lambda pool_size=None: None)
+    monkeypatch.setattr(update_fixtures_mod, "extract_fixtures_field", lambda fixtures: fixtures)
+    return calls
+
+
+def fake_fetch(calls, bad_ids=(), quota_after=None, unavailable=False):
+    def fetch(batch_ids):
+        calls.append(list(batch_ids))
+        if quota_after is not None and len(calls) > quota_after:
+            raise update_fixtures_mod.DailyQuotaExhausted("quota spent")
+        if unavailable:
+            raise update_fixtures_mod.RequestException("HTTP 503 after retries")
+        if any(fid in bad_ids for fid in batch_ids):
+            raise update_fixtures_mod.RequestRejected("bad id in batch")
+        return [fixture_payload(fid) for fid in batch_ids]
+    return fetch
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_update_by_ids_batches_to_max_ids_per_call(calls, monkeypatch, workers):
+    monkeypatch.setattr(update_fixtures_mod, "fetch_id_batch", fake_fetch(calls))
+    fixtures = update_by_ids(IDS, max_workers=workers)
+    assert len(fixtures) == len(IDS)
+    assert sorted(len(batch) for batch in calls) == [5, MAX_IDS_PER_CALL, MAX_IDS_PER_CALL]
+
+
+def test_update_by_ids_isolates_failing_id(calls, monkeypatch):
+    monkeypatch.setattr(update_fixtures_mod, "fetch_id_batch", fake_fetch(calls, bad_ids={"1003"}))
+    failed = []
+    fixtures = update_by_ids(IDS, max_workers=2, retry_budget=20, failed_ids=failed)
+    assert failed == ["1003"]
+    assert len(fixtures) == len(IDS) - 1
+
+
+def test_update_by_ids_retry_budget_is_bounded(calls, monkeypatch):
+    monkeypatch.setattr(update_fixtures_mod, "fetch_id_batch", fake_fetch(calls, bad_ids={"1003"}))
+    failed = []
+    update_by_ids(IDS, max_workers=1, retry_budget=2, failed_ids=failed)
+    # One split (two calls) and the half still holding the bad id is reported
+    assert len(calls) == 5
+    assert "1003" in failed and len(failed) == MAX_IDS_PER_CALL // 2
+
+
+def test_update_by_ids_stops_when_daily_quota_exhausted(calls, monkeypatch):
+    monkeypatch.setattr(update_fixtures_mod, "fetch_id_batch", fake_fetch(calls, quota_after=1))
+    fixtures = update_by_ids(IDS, max_workers=1)
+    assert len(fixtures) == MAX_IDS_PER_CALL
+    # Exhausted batches are deferred, never split or retried
+    assert len(calls) <= 3
+
+
+def make_group(league_season_id, size):
+    return {
+        "league_season_id": league_season_id,
+        "api_league_id": league_season_id,
+        "season": 2024,
+        "from_date": None,
+        "ids": [f"{league_season_id}{i:04d}" for i in range(size)],
+    }
+
+
+def test_plan_update_strategy_mixes_range_and_ids():
+    groups = [make_group(1, 150), make_group(2, 3), make_group(3, 4), make_group(4, 45)]
+    plan = plan_update_strategy(groups)
+    # The two big groups by range, the seven stragglers in one ids call
+    assert [g["league_season_id"] for g in plan["range_groups"]] == [1, 4]
+    assert len(plan["ids"]) == 7
+    assert plan["projected_calls"] == 3
+    assert plan["ids_only_calls"] == 11
+    assert plan["range_only_calls"] == 4
+
+
+def test_plan_update_strategy_prefers_ids_on_ties():
+    plan = plan_update_strategy([make_group(1, 20), make_group(2, 1)])
+    assert plan["range_groups"] == []
+    assert plan["projected_calls"] == 2
+
+
+
+def test_update_by_ids_does_not_split_batches_the_api_could_not_serve(calls, monkeypatch):
+    monkeypatch.setattr(update_fixtures_mod, "fetch_id_batch", fake_fetch(calls, unavailable=True))
+    failed = []
+    assert update_by_ids(IDS, max_workers=1, retry_budget=10, failed_ids=failed) == []
+    # One call per batch: nothing split, nothing reported as a bad id
+    assert len(calls) == 3
+    assert failed == []
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise http_client.HTTPError(f"HTTP {self.status_code}", response=self)
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Serve queued responses to rate_limited_get without pacing or archiving."""
+    responses = []
+    session = type("Session", (), {"get": lambda self, url, params, timeout: responses.pop(0)})()
+    monkeypatch.setattr(http_client, "get_session", lambda pool_size=None: session)
+    now = [0.0]
+    monkeypatch.setattr(http_client, "limiter", TokenBucketLimiter(
+        per_minute=6000, burst=100, clock=lambda: now[0], sleep=lambda s: now.__setitem__(0, now[0] + s)
+    ))
+    monkeypatch.setattr(http_client.time, "sleep", lambda s: None)
+    monkeypatch.setattr(update_fixtures_mod.config, "BRONZE_ENABLED", False)
+    return responses
+
+
+def test_update_by_ids_retries_429_without_splitting(calls, api):
+    ids = IDS[:3]
+    api.extend([
+        FakeResponse(429, headers={"Retry-After": "1"}),
+        FakeResponse(200, {"errors": [], "response": [fixture_payload(fid) for fid in ids]}),
+    ])
+    failed = []
+    fixtures = update_by_ids(ids, max_workers=1, retry_budget=2, failed_ids=failed)
+    assert len(fixtures) == len(ids)
+    assert failed == []
+    assert api == []
+
+
+def test_fetch_id_batch_raises_rejected_for_client_errors(api):
+    api.extend([FakeResponse(503), FakeResponse(404)])
+    with pytest.raises(update_fixtures_mod.RequestRejected):
+        update_fixtures_mod.fetch_id_batch(["1000"])
+    # The 503 was retried, the 404 was not
+    assert api == []